@@ -5,11 +5,20 @@ Created on Fri Dec 17 10:14:31 2021
 @author: Chris Bostock
 """
 
+import os
+import json
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
 from riotAPI import RiotAPI
+from timelineTensorCache import TimelineTensorCache
+from timelineGroups import TimelineGroups
+from mapAssets import MAP_SIZE, get_positions, load_map_image
+from positionHeatmap import PositionHeatmap
+from db.payloadCodecs import decode_stored_payload
+from metrics import Metrics, timed_builder
 
 #%% LeagueAnalysis
 class LeagueAnalysis(RiotAPI):
@@ -27,6 +36,14 @@ class LeagueAnalysis(RiotAPI):
         db_saving: bool = True,
         db_name: str = None,
         contsole_print_out: bool = False,
+        pool_size: int = 10,
+        db_storage: str = "tinydb",
+        db_compression: str = None,
+        db_write_cache_size: int = 1,
+        metrics: Metrics = None,
+        cache_size: int = 256 * 2 ** 20,
+        identity_ttl: float = 3600.0,
+        request_timeout: tuple = (3.05, 30),
     ):
         """ A object used to analysis league of legends data.
 
@@ -67,6 +84,47 @@ class LeagueAnalysis(RiotAPI):
              (Default value = False)
              Prints out any interation with the db to the console.
 
+         pool_size : int
+             (Default value = 10)
+             The maximum number of keep-alive connections held for each api
+             host.
+
+         db_storage : str
+             (Default value = tinydb)
+             The database storage backend: 'tinydb' or 'sqlite'.
+
+         db_compression : str
+             (Default value = None)
+             The codec used to compress stored match timelines and summaries:
+             'zlib' or 'lzma'.
+
+         db_write_cache_size : int
+             (Default value = 1)
+             The number of database writes buffered before they are written
+             to file.
+
+         metrics : Metrics
+             (Default value = None)
+             Records the api requests, the database lookups and inserts, and
+             the wall time of the dataframe builders.  If None is passed a new
+             Metrics object is used, held as self.metrics.
+
+         cache_size : int
+             (Default value = 256 MiB)
+             The maximum size in bytes of the in memory cache of match
+             payloads and dataframes, held as self.cache.  Payloads are
+             measured by the length of their JSON.  0 disables the cache.
+
+         identity_ttl : float
+             (Default value = 3600)
+             The number of seconds the id, puuid and account id of a summoner
+             are held in memory for, see self.identities.
+
+         request_timeout : float or tuple
+             (Default value = (3.05, 30))
+             The connect and read timeouts of each request in seconds.
+             Requests which time out are retried.
+
         """
 
         super().__init__(
@@ -77,36 +135,120 @@ class LeagueAnalysis(RiotAPI):
             db_saving=db_saving,
             db_name=db_name,
             contsole_print_out=contsole_print_out,
+            pool_size=pool_size,
+            db_storage=db_storage,
+            db_compression=db_compression,
+            db_write_cache_size=db_write_cache_size,
+            metrics=metrics,
+            cache_size=cache_size,
+            identity_ttl=identity_ttl,
+            request_timeout=request_timeout,
         )
 
-    #%% __plot_positions
+    #%% get_positions
     @staticmethod
-    def __plot_positions(ax, df, face_colour, index_label):
-
-        # plot position data
-        for index, row in df.iterrows():
-            position = row["position"]
-
-            if isinstance(position, dict):
-                ax.plot(
-                    int(position["x"]),
-                    int(position["y"]),
-                    "X",
-                    markeredgecolor="k",
-                    markerfacecolor=face_colour,
-                    ms=8,
+    def get_positions(df: pd.DataFrame):
+        """Extracts the x and y positions from a dataframe.
+
+        The positions are read from the position column, or from the
+        position_x and position_y columns of an exported or flattened
+        dataframe.  Rows without a position are dropped.
+
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            pd.DataFrame with a position column.
+
+        Returns
+        -------
+        x : np.ndarray
+            The x positions.
+        y : np.ndarray
+            The y positions.
+        index : pd.Index
+            The index of the rows with a position.
+
+        """
+
+        return get_positions(df)
+
+    #%% __plot_positions
+    def __plot_positions(self, ax, df, face_colour, index_label):
+
+        x, y, index = self.get_positions(df)
+
+        # plot position data, as a single collection
+        ax.scatter(
+            x, y, marker="X", s=64, c=face_colour, edgecolors="k", linewidths=1,
+        )
+
+        if index_label:
+            for x_position, y_position, label in zip(x, y, index):
+                ax.text(
+                    x_position,
+                    y_position,
+                    str(label),
+                    horizontalalignment="left",
+                    fontweight="semibold",
                 )
 
-                if index_label:
-                    ax.text(
-                        int(position["x"]),
-                        int(position["y"]),
-                        str(index),
-                        horizontalalignment="left",
-                        fontweight="semibold",
-                    )
+    #%% __create_participants_summary
+    @staticmethod
+    def __create_participants_summary(raw_data_tl: dict, raw_data_ms: dict):
+        """Creates a dataframe of the participant information for a match.
+
+
+        Parameters
+        ----------
+        raw_data_tl : dict
+            The match timeline, as returned by self.get_match_timeline().
+        raw_data_ms : dict
+            The match summary, as returned by self.get_match_summary().
+
+        Returns
+        -------
+        participants_summary : pd.DataFrame
+            The participant id, puuid, summoner name, summoner id, champion
+            name, position, team id, and the result for each participant.
+
+        """
+
+        summary_columns = [
+            "summonerName",
+            "summonerId",
+            "championName",
+            "individualPosition",
+            "teamId",
+            "win",
+        ]
+
+        participants_detailed = {
+            participant["puuid"]: participant
+            for participant in raw_data_ms["details"]["info"]["participants"]
+        }
+
+        # all participant id and participant information, joined on puuid
+        participants_summary = pd.DataFrame(
+            [
+                {
+                    "participantId": participant["participantId"],
+                    "puuid": participant["puuid"],
+                    **{
+                        column: participants_detailed[participant["puuid"]].get(column)
+                        for column in summary_columns
+                    },
+                }
+                for participant in raw_data_tl["details"]["info"]["participants"]
+                if participant["puuid"] in participants_detailed
+            ],
+            columns=["participantId", "puuid"] + summary_columns,
+        )
+
+        return participants_summary
 
     #%% create_mastery_table
+    @timed_builder
     def create_mastery_table(self, summoner_name: str = None):
         """Create's a champion mastery table in a dataframe.
 
@@ -153,15 +295,9 @@ class LeagueAnalysis(RiotAPI):
         # readable datetime
         df["lastTimePlayed-dt"] = pd.to_datetime(df["lastPlayTime"], unit="ms")
 
-        # int64 champion id
-        self.champion_list["df"]["championId"] = self.champion_list["df"].key.astype(
-            "int64"
-        )
-
-        # merge dataframes
-        df = pd.merge(
-            df, self.champion_list["df"], left_on="championId", right_on="championId"
-        )
+        # champion name from the champion id
+        df["name"] = df["championId"].map(self.champion_names)
+        df = df[df["name"].notna()].reset_index(drop=True)
 
         # readable dataframe
         clean_df = df[["name", "championLevel", "championPoints", "lastTimePlayed-dt"]]
@@ -169,6 +305,7 @@ class LeagueAnalysis(RiotAPI):
         return clean_df
 
     #%% create_event_timeline_dataframe
+    @timed_builder
     def create_event_timeline_dataframe(
         self,
         match_id: str,
@@ -224,87 +361,123 @@ class LeagueAnalysis(RiotAPI):
 
         """
 
-        # get timeline data
-        raw_data_tl = self.get_match_timeline(match_id)
+        key = (match_id, "event_timeline", (creator_id, victim_id, killer_id))
+        tl_df = self.cache.get(key)
 
-        # get match summary
-        raw_data_ms = self.get_match_summary(match_id)
+        if tl_df is None:
+            # get timeline data
+            raw_data_tl = self.get_match_timeline(match_id)
 
-        tl_df = pd.DataFrame()
+            # get match summary
+            raw_data_ms = self.get_match_summary(match_id)
 
-        for frame in raw_data_tl["details"]["info"]["frames"]:
-            df = pd.DataFrame.from_dict(frame["events"], orient="columns")
-            tl_df = tl_df.append(df)
+            tl_df = self.build_event_timeline_dataframe(
+                raw_data_tl,
+                raw_data_ms,
+                creator_id=creator_id,
+                victim_id=victim_id,
+                killer_id=killer_id,
+            )
 
-        participants = pd.DataFrame(raw_data_tl["details"]["info"]["participants"])
+            self.cache.put(key, tl_df)
 
-        participants_detailed = pd.DataFrame(
-            raw_data_ms["details"]["info"]["participants"]
-        )
+        # a copy, so the cached dataframe is not modified by the caller
+        return tl_df.copy()
 
-        participants_summary = participants_detailed[
-            [
-                "summonerName",
-                "summonerId",
-                "puuid",
-                "championName",
-                "individualPosition",
-                "teamId",
-                "win",
-            ]
+    #%% build_event_timeline_dataframe
+    @timed_builder
+    @staticmethod
+    def build_event_timeline_dataframe(
+        raw_data_tl: dict,
+        raw_data_ms: dict,
+        creator_id: bool = True,
+        victim_id: bool = True,
+        killer_id: bool = True,
+    ):
+        """Creates the event timeline dataframe from the raw api data.
+
+        The events from every frame are flattened in a single pass, and the
+        participant information is looked up for the participantId, creatorId,
+        victimId and killerId columns.  Participant columns which clash with
+        an existing column are given the suffix '_info', '_creator', '_victim'
+        or '_killer'.  The events are kept in the order they occured.
+
+
+        Parameters
+        ----------
+        raw_data_tl : dict
+            The match timeline, as returned by self.get_match_timeline().
+        raw_data_ms : dict
+            The match summary, as returned by self.get_match_summary().
+        creator_id : bool
+            If the creatorId's summoner name etc. is required. The default is True.
+        victim_id : bool
+            If the victimId's summoner name etc. is required. The default is True.
+        killer_id : bool
+            If the killerId's summoner name etc. is required. The default is True.
+
+        Returns
+        -------
+        tl_df : pd.DataFrame
+            The resulting event timeline dataframe.
+
+        """
+
+        events = [
+            event
+            for frame in raw_data_tl["details"]["info"]["frames"]
+            for event in frame["events"]
         ]
 
-        # a dataframe with all participant id and participant information
-        participants_summary = pd.merge(
-            participants, participants_summary, left_on="puuid", right_on="puuid"
-        )
+        tl_df = pd.DataFrame(events)
 
-        # obtain the participant informaion
-        tl_df = pd.merge(
-            tl_df,
-            participants_summary,
-            "outer",
-            left_on="participantId",
-            right_on="participantId",
-            suffixes=("", "_info"),
-        )
+        participants_summary = LeagueAnalysis.__create_participants_summary(
+            raw_data_tl, raw_data_ms
+        ).set_index("participantId", drop=False)
+
+        id_columns = [("participantId", "_info")]
 
         if creator_id:
-            # Obtain creator id
-            tl_df = pd.merge(
-                tl_df,
-                participants_summary,
-                "outer",
-                left_on="creatorId",
-                right_on="participantId",
-                suffixes=("", "_creator"),
-            )
+            id_columns.append(("creatorId", "_creator"))
 
         if victim_id:
-            # obtain the victims information
-            tl_df = pd.merge(
-                tl_df,
-                participants_summary,
-                "outer",
-                left_on="victimId",
-                right_on="participantId",
-                suffixes=("", "_victim"),
-            )
+            id_columns.append(("victimId", "_victim"))
 
         if killer_id:
-            # obtain the killers information
-            tl_df = pd.merge(
-                tl_df,
-                participants_summary,
-                "outer",
-                left_on="killerId",
-                right_on="participantId",
-                suffixes=("", "_killer"),
-            )
+            id_columns.append(("killerId", "_killer"))
+
+        columns = set(tl_df.columns)
+        participant_columns: dict = {}
+
+        for id_column, suffix in id_columns:
+            if id_column in tl_df:
+                ids = tl_df[id_column]
+            else:
+                ids = pd.Series(np.nan, index=tl_df.index)
+
+            # row of each participant, -1 where there is no participant
+            positions = participants_summary.index.get_indexer(ids)
+
+            for column in participants_summary.columns:
+                # the participantId column is the join key for participant info
+                if id_column == "participantId" and column == "participantId":
+                    continue
+
+                name = column if column not in columns else column + suffix
+                columns.add(name)
+
+                participant_columns[name] = pd.api.extensions.take(
+                    participants_summary[column].to_numpy(), positions, allow_fill=True
+                )
+
+        tl_df = pd.concat(
+            [tl_df, pd.DataFrame(participant_columns, index=tl_df.index)], axis=1
+        )
 
         return tl_df
 
     #%% expand_champion_stats
+    @timed_builder
     @staticmethod
     def expand_champion_stats(event_df: pd.DataFrame):
         """Expand the champion stats, and damage columns.
@@ -327,46 +500,74 @@ class LeagueAnalysis(RiotAPI):
 
         """
 
-        pd.set_option("mode.chained_assignment", None)
+        if len(event_df) == 0:
+            raise TypeError("DataFrame has a length of zero.")
 
-        expanded_df = event_df.copy()
+        stats_columns = [
+            column for column in ["championStats", "damageStats"] if column in event_df
+        ]
 
-        if len(expanded_df) == 0:
-            raise TypeError("DataFrame has a length of zero.")
+        stats_dfs = [
+            LeagueAnalysis.__expand_dict_column(event_df[column])
+            for column in stats_columns
+        ]
 
-        # Champion Stats
-        champion_stat_keys = expanded_df["championStats"][0].copy().keys()
+        # expanded stats replace any existing column with the same name
+        replaced_columns = [
+            column
+            for stats_df in stats_dfs
+            for column in stats_df.columns
+            if column in event_df
+        ]
 
-        # preallocate columns
-        for key in champion_stat_keys:
-            expanded_df[key] = np.NaN
+        expanded_df = pd.concat(
+            [event_df.drop(columns=stats_columns + replaced_columns)] + stats_dfs,
+            axis=1,
+        )
 
-        for j in range(0, len(expanded_df)):
-            row_champion_stats = expanded_df["championStats"][j].copy()
+        return expanded_df
 
-            for key in row_champion_stats:
-                expanded_df[key][j] = row_champion_stats[key]
+    #%% __expand_dict_column
+    @staticmethod
+    def __expand_dict_column(column: pd.Series):
+        """Expands a column of dictionaries into a column for each key.
 
-        expanded_df.drop(columns=["championStats"], inplace=True)
+        Keys missing from some rows are left as missing values.  Columns which
+        only hold whole numbers keep an integer dtype, using pandas' nullable
+        Int64 dtype when values are missing.
 
-        # Damage Stats
-        damage_stat_keys = expanded_df["damageStats"][0].copy().keys()
 
-        # preallocate columns
-        for key in damage_stat_keys:
-            expanded_df[key] = np.NaN
+        Parameters
+        ----------
+        column : pd.Series
+            The column of dictionaries.
 
-        for j in range(0, len(expanded_df)):
-            row_damage_stats = expanded_df["damageStats"][j].copy()
+        Returns
+        -------
+        expanded_df : pd.DataFrame
+            The expanded columns, with the same index as column.
 
-            for key in row_damage_stats:
-                expanded_df[key][j] = row_damage_stats[key]
+        """
 
-        expanded_df.drop(columns=["damageStats"], inplace=True)
+        expanded_df = pd.DataFrame(
+            [row if isinstance(row, dict) else {} for row in column],
+            index=column.index,
+        )
+
+        for key in expanded_df.columns:
+            values = expanded_df[key]
+
+            if (
+                values.dtype.kind == "f"
+                and values.hasnans
+                and values.dropna().mod(1).eq(0).all()
+            ):
+                expanded_df[key] = values.astype("Int64")
 
         return expanded_df
 
     #%% create_champion_timeline_dataframe
+    @timed_builder
     def create_champion_timeline_dataframe(self, match_id: str):
         """Create a timesries dataframe from the timeline endpoint.
 
@@ -386,40 +587,56 @@ class LeagueAnalysis(RiotAPI):
 
         """
 
-        # get timeline data
-        raw_data_tl = self.get_match_timeline(match_id)
+        key = (match_id, "champion_timeline", ())
+        ts_df = self.cache.get(key)
 
-        # get match summary
-        raw_data_ms = self.get_match_summary(match_id)
+        if ts_df is None:
+            # get timeline data
+            raw_data_tl = self.get_match_timeline(match_id)
 
-        ts_df = pd.DataFrame()
+            # get match summary
+            raw_data_ms = self.get_match_summary(match_id)
 
-        for frame in raw_data_tl["details"]["info"]["frames"]:
-            df = pd.DataFrame.from_dict(frame["participantFrames"], orient="index")
-            df["timestamp"] = frame["timestamp"]
-            ts_df = ts_df.append(df)
+            ts_df = self.build_champion_timeline_dataframe(raw_data_tl, raw_data_ms)
 
-        participants = pd.DataFrame(raw_data_tl["details"]["info"]["participants"])
+            self.cache.put(key, ts_df)
 
-        participants_detailed = pd.DataFrame(
-            raw_data_ms["details"]["info"]["participants"]
-        )
+        # a copy, so the cached dataframe is not modified by the caller
+        return ts_df.copy()
+
+    #%% build_champion_timeline_dataframe
+    @timed_builder
+    @staticmethod
+    def build_champion_timeline_dataframe(raw_data_tl: dict, raw_data_ms: dict):
+        """Creates the timeseries dataframe from the raw api data.
+
+        The participant frames from every frame are flattened in a single pass.
+
+
+        Parameters
+        ----------
+        raw_data_tl : dict
+            The match timeline, as returned by self.get_match_timeline().
+        raw_data_ms : dict
+            The match summary, as returned by self.get_match_summary().
+
+        Returns
+        -------
+        ts_df : pd.DataFrame
+            The resulting timeseries data DataFrame.
+
+        """
 
-        participants_summary = participants_detailed[
+        ts_df = pd.DataFrame(
             [
-                "summonerName",
-                "summonerId",
-                "puuid",
-                "championName",
-                "individualPosition",
-                "teamId",
-                "win",
+                {**participant_frame, "timestamp": frame["timestamp"]}
+                for frame in raw_data_tl["details"]["info"]["frames"]
+                for participant_frame in frame["participantFrames"].values()
             ]
-        ]
+        )
 
-        # a dataframe with all participant id and participant information
-        participants_summary = pd.merge(
-            participants, participants_summary, left_on="puuid", right_on="puuid"
+        participants_summary = LeagueAnalysis.__create_participants_summary(
+            raw_data_tl, raw_data_ms
         )
 
         # merge participants information
@@ -433,17 +650,22 @@ class LeagueAnalysis(RiotAPI):
         return ts_df
 
     #%% parse_champion_timeline_dataframe
+    @timed_builder
     def parse_champion_timeline_dataframe(
         self,
         tl_df: pd.DataFrame = None,
         match_id: str = None,
         parse_on: str = "championName",
+        inplace: bool = True,
     ):
         """Seperactes each champiosn data into their own dataframe within a dictionary.
 
         Aggrogates the data for a given columns such as 'championName',
         'summonerName', 'puuid'.  The default is to parse for 'championName'
 
+        The rows of each group are found with a single groupby, and a group's
+        dataframe is only created when it is accessed.
+
 
         Parameters
         ----------
@@ -454,6 +676,10 @@ class LeagueAnalysis(RiotAPI):
         parse_on: str, optional
             Chose what to arrgorate the dictionary on. For example,
             'championName', 'summonerName', etc. The default is 'championName'
+        inplace: bool, optional
+            If True, the 'time' column is added to tl_df. If False, tl_df is
+            not changed and the 'time' column is added to each group when it
+            is accessed. The default is True.
 
         Raises
         ------
@@ -462,9 +688,9 @@ class LeagueAnalysis(RiotAPI):
 
         Returns
         -------
-        parsed_df_dict : dict
-            The data for each chamption within a dictionary, where the 'keys'
-            are the champion name, and the values are dataframes
+        parsed_df_dict : TimelineGroups
+            The data for each chamption within a read only dictionary, where
+            the 'keys' are the champion name, and the values are dataframes
 
         Example
         -------
@@ -488,30 +714,27 @@ class LeagueAnalysis(RiotAPI):
 
         """
 
-        parsed_df_dict = {}
-
         if tl_df is None and match_id is not None:
             tl_df = self.create_champion_timeline_dataframe(match_id)
         elif tl_df is None and match_id is None:
             raise TypeError("DataFrame or match id required.")
 
-        tl_df["time"] = tl_df["timestamp"] / 1_000 / 60
-        parse_list = tl_df[parse_on].unique()
+        if inplace:
+            tl_df["time"] = tl_df["timestamp"] / 1_000 / 60
 
-        for item in parse_list:
-            parsed_df_dict[item] = (
-                tl_df[(tl_df[parse_on] == item)].copy().reset_index(drop=True)
-            )
+        parsed_df_dict = TimelineGroups(tl_df, parse_on, add_time=not inplace)
 
         return parsed_df_dict
 
     #%% plot_positional_data
+    @timed_builder
     def plot_positional_data(
         self,
         df: pd.DataFrame,
         df_for_comparison: pd.DataFrame = None,
         map_type: str = "summoners rift",
         index_label: bool = False,
+        ax=None,
     ):
         """Plot event data.
 
@@ -534,28 +757,28 @@ class LeagueAnalysis(RiotAPI):
             is 'summoners rift'.
         index_label : bool, optional
             Index value printed next to the marker. The default is False.
+        ax : matplotlib axes, optional
+            The axes to plot on. If None is passed a new figure is created.
+            The default is None.
 
         Returns
         -------
-        matplotlib figure.
+        fig : matplotlib figure.
 
         """
 
         colours = {"blue": "#1E90FF", "red": "#EE3B3B", "green": "#32CD32"}
 
-        # Read map png
-        if map_type == "summoners rift":
-            img = plt.imread("maps\\summoners_rift_map_11.png")
-        elif map_type == "howling abyss":
-            img = plt.imread("maps\\howling_abyss_map_12.png")
-        else:
-            raise NameError("map_type: {} not found".format(map_type))
+        # Read map png, cached after the first call
+        img = load_map_image(map_type)
 
         # show map on plot
-        fig, ax = plt.subplots()
+        if ax is None:
+            fig, ax = plt.subplots()
+        else:
+            fig = ax.figure
 
-        map_size = 14_750
-        ax.imshow(img, extent=[0, map_size, 0, map_size])
+        ax.imshow(img, extent=[0, MAP_SIZE, 0, MAP_SIZE])
         ax.set_xticks([])
         ax.set_yticks([])
 
@@ -569,57 +792,737 @@ class LeagueAnalysis(RiotAPI):
         if df_for_comparison is not None:
             self.__plot_positions(ax, df_for_comparison, colours["red"], index_label)
 
+        return fig
+
+    #%% create_position_heatmap
+    @timed_builder
+    def create_position_heatmap(
+        self,
+        match_ids: list,
+        heatmap: PositionHeatmap = None,
+        bins: int = 100,
+        event_types: list = None,
+        team_id: int = None,
+        team_column: str = "teamId_info",
+    ):
+        """Bins the event positions of many matches into a heatmap.
+
+        The events of each match are created with
+        self.create_event_timeline_dataframe().  Passing an existing heatmap
+        adds the matches to it, matches already within the heatmap are not
+        requested again.
+
+
+        Parameters
+        ----------
+        match_ids : list
+            The match ids to add.
+        heatmap : PositionHeatmap, optional
+            An existing heatmap to add the matches to. If None is passed a new
+            heatmap is created from the remaining arguments. The default is
+            None.
+        bins : int, optional
+            The number of bins along each side of the map. The default is 100.
+        event_types : list, optional
+            The event types to count, for example ['CHAMPION_KILL']. The
+            default is None, counting all events with a position.
+        team_id : int, optional
+            The team to count, for example 100. The default is None.
+        team_column : str, optional
+            The column holding the team of an event. The default is
+            'teamId_info'.
+
+        Returns
+        -------
+        heatmap : PositionHeatmap
+            Use heatmap.render() to plot it over the minimap.
+
+        Example
+        -------
+            deaths = lolA.create_position_heatmap(
+                match_ids, event_types=["CHAMPION_KILL"], team_id=100,
+                team_column="teamId_victim")
+            fig = deaths.render(sigma=1.5)
+
+        """
+
+        if heatmap is None:
+            heatmap = PositionHeatmap(
+                bins=bins,
+                event_types=event_types,
+                team_id=team_id,
+                team_column=team_column,
+            )
+
+        for match_id in match_ids:
+            if match_id in heatmap.match_ids:
+                continue
+
+            heatmap.add_events(
+                self.create_event_timeline_dataframe(match_id), match_id=match_id
+            )
+
+        return heatmap
+
+    #%% build_timelines
+    @timed_builder
+    def build_timelines(
+        self,
+        match_ids: list = None,
+        kind: str = "events",
+        workers: int = None,
+        chunk_size: int = None,
+    ):
+        """Builds the timeline dataframes of many stored matches across processes.
+
+        The stored match timelines and summaries are read from the db as JSON
+        bytes, and parsed in a process pool, so the db is not passed to the
+        workers.  Matches without a stored timeline and summary are skipped.
+
+
+        Parameters
+        ----------
+        match_ids : list, optional
+            The match ids to build. If None is passed all stored match
+            timelines are built. The default is None.
+        kind : str, optional
+            'events' for self.build_event_timeline_dataframe() or
+            'participants' for self.build_champion_timeline_dataframe(). The
+            default is 'events'.
+        workers : int, optional
+            The number of processes. If None is passed the number of cpus is
+            used. If 1 is passed the matches are built within this process.
+            The default is None.
+        chunk_size : int, optional
+            The number of matches sent to a worker at once. If None is passed
+            the matches are split into four chunks per worker. The default is
+            None.
+
+        Raises
+        ------
+        NameError
+            When the kind is not found.
+
+        Returns
+        -------
+        df : pd.DataFrame
+            The timelines of all the matches, with a match_id column, in the
+            order of match_ids.
+
+        Example
+        -------
+            events_df = lolA.build_timelines(kind="events", workers=8)
+            kills = events_df[events_df["type"] == "CHAMPION_KILL"]
+
+        """
+
+        if kind not in ["events", "participants"]:
+            raise NameError("kind: {} not found".format(kind))
+
+        if match_ids is None:
+            match_ids = self.get_list_of_stored_matches("match_timeline")
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        payloads: list = []
+
+        for match_id in dict.fromkeys(match_ids):
+            payload_tl = self.get_stored_payload("match_timeline", "match_id", match_id)
+            payload_ms = self.get_stored_payload("match_summary", "match_id", match_id)
+
+            if payload_tl is None or payload_ms is None:
+                print("{} :: not built :: match data not stored".format(match_id))
+                continue
+
+            payloads.append((match_id, payload_tl, payload_ms))
+
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(payloads) // (workers * 4)))
+
+        chunks = [
+            payloads[start : start + chunk_size]
+            for start in range(0, len(payloads), chunk_size)
+        ]
+
+        if workers == 1 or len(chunks) <= 1:
+            dfs = [build_timeline_chunk(kind, chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+                dfs = list(
+                    executor.map(build_timeline_chunk, [kind] * len(chunks), chunks)
+                )
+
+        if len(dfs) == 0:
+            return pd.DataFrame(columns=["match_id"])
+
+        return pd.concat(dfs, ignore_index=True)
+
+    #%% __flatten_for_export
+    @staticmethod
+    def __flatten_for_export(df: pd.DataFrame, match_id: str):
+        """Flattens a dataframe so it can be stored within columnar files.
+
+        The position column is split into position_x and position_y, and any
+        other column holding dictionaries or lists is stored as JSON text.
+
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The dataframe to be flattened.
+        match_id : str
+            The match id, added as the match_id column.
+
+        Returns
+        -------
+        flat_df : pd.DataFrame
+            The flattened dataframe.
+
+        """
+
+        flat_df = df.copy()
+
+        if "position" in flat_df:
+            positions = [
+                position if isinstance(position, dict) else {}
+                for position in flat_df["position"]
+            ]
+            flat_df["position_x"] = pd.array(
+                [position.get("x") for position in positions], dtype="Int64"
+            )
+            flat_df["position_y"] = pd.array(
+                [position.get("y") for position in positions], dtype="Int64"
+            )
+            flat_df = flat_df.drop(columns=["position"])
+
+        for column in flat_df.columns[flat_df.dtypes == object]:
+            if flat_df[column].map(lambda value: isinstance(value, (dict, list))).any():
+                flat_df[column] = flat_df[column].map(
+                    lambda value: json.dumps(value)
+                    if isinstance(value, (dict, list))
+                    else None
+                )
+
+        flat_df.insert(0, "match_id", match_id)
+
+        return flat_df
+
+    #%% __unify_export_schemas
+    @staticmethod
+    def __unify_export_schemas(schemas: list):
+        """Returns one schema holding the columns of all the given schemas.
+
+        A column which is null within one schema takes its type from the
+        others.  Integer and floating columns are stored as doubles, and
+        columns with any other differing types are stored as text.
+
+
+        Parameters
+        ----------
+        schemas : list
+            The pyarrow schemas, in the order their columns are kept.
+
+        Returns
+        -------
+        schema : pyarrow.Schema
+            The unified schema, without metadata.
+
+        """
+
+        import pyarrow as pa
+
+        types: dict = {}
+
+        for schema in schemas:
+            for field in schema:
+                types.setdefault(field.name, []).append(field.type)
+
+        fields: list = []
+
+        for name, column_types in types.items():
+            column_types = [
+                column_type
+                for column_type in column_types
+                if not pa.types.is_null(column_type)
+            ]
+
+            if len(column_types) == 0:
+                column_type = pa.null()
+            elif all(column_type == column_types[0] for column_type in column_types):
+                column_type = column_types[0]
+            elif all(
+                pa.types.is_integer(column_type) or pa.types.is_floating(column_type)
+                for column_type in column_types
+            ):
+                column_type = pa.float64()
+            else:
+                column_type = pa.large_string()
+
+            fields.append(pa.field(name, column_type))
+
+        return pa.schema(fields)
+
+    #%% __conform_to_schema
+    @staticmethod
+    def __conform_to_schema(table, schema):
+        """Casts a table to the given schema, adding its missing columns as nulls.
+
+
+        Parameters
+        ----------
+        table : pyarrow.Table
+            The table to be conformed.
+        schema : pyarrow.Schema
+            The schema, which holds every column of the table.
+
+        Returns
+        -------
+        table : pyarrow.Table
+            The table with the columns, order and types of the schema.
+
+        """
+
+        import pyarrow as pa
+
+        columns = [
+            table.column(field.name).cast(field.type)
+            if field.name in table.column_names
+            else pa.nulls(table.num_rows, field.type)
+            for field in schema
+        ]
+
+        return pa.Table.from_arrays(columns, schema=schema)
+
+    #%% export_match_data
+    @timed_builder
+    def export_match_data(
+        self,
+        output_dir: str,
+        match_ids: list = None,
+        file_format: str = "parquet",
+        incremental: bool = True,
+        batch_size: int = 500,
+    ):
+        """Exports stored matches into partitioned columnar files.
+
+        Three datasets are written from the data stored within the db, without
+        any api calls:
+
+            participant_frames - self.create_champion_timeline_dataframe()
+                with the champion and damage stats expanded.
+            events - self.create_event_timeline_dataframe().
+            participants - the participants from the match summary.
+
+        The matches are partitioned by the game date and queue id.  Each call
+        writes one file per partition for every batch of matches, for example:
+
+            output_dir/events/game_date=2021-12-16/queue_id=420/part-20211216T101500-0.parquet
+
+        Every file has a match_id column.  The partition folders follow the
+        hive layout, so the datasets can be read with pyarrow.dataset or
+        pd.read_parquet(output_dir + '/events', columns=[...]).  The exported
+        match ids are recorded within output_dir/_exported.json.
+
+        The files of a dataset share one schema, the union of the columns of
+        every match exported, see __unify_export_schemas().  When a batch adds
+        columns or widens a type, the files already written are rewritten to
+        the new schema.  The files hold no pandas metadata, so integer columns
+        with missing values are read as floats unless a nullable dtype backend
+        is used.
+
+
+        Parameters
+        ----------
+        output_dir : str
+            The folder the datasets are written to.
+        match_ids : list, optional
+            The match ids to export. If None is passed all stored match
+            summaries are exported. The default is None.
+        file_format : str, optional
+            'parquet' or 'feather'. Both require pyarrow. The default is
+            'parquet'.
+        incremental : bool, optional
+            If True, matches which have already been exported are skipped.
+            The default is True.
+        batch_size : int, optional
+            The number of matches held in memory before they are written. The
+            default is 500.
+
+        Raises
+        ------
+        NameError
+            When the file format is not found.
+        ImportError
+            When pyarrow is not installed.
+
+        Returns
+        -------
+        exported : list
+            The match ids exported by this call.
+
+        Example
+        -------
+            lolA.export_match_data("./export")
+            df = pd.read_parquet("./export/participant_frames", columns=["match_id", "totalGold"])
+
+        """
+
+        if file_format not in ["parquet", "feather"]:
+            raise NameError("file_format: {} not found".format(file_format))
+
+        try:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "pyarrow is required to export {} files.".format(file_format)
+            )
+
+        manifest_path = os.path.join(output_dir, "_exported.json")
+        exported_before: list = []
+
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as file:
+                exported_before = json.load(file)
+
+        if match_ids is None:
+            match_ids = self.get_list_of_stored_matches("match_summary")
+
+        if incremental:
+            already_exported = set(exported_before)
+            match_ids = [
+                match_id for match_id in match_ids if match_id not in already_exported
+            ]
+
+        exported: list = []
+
+        # (dataset, partition) -> flattened dataframes of the current batch
+        pending: dict = {}
+        pending_ids: list = []
+
+        file_prefix = "part-{}".format(pd.Timestamp.now().strftime("%Y%m%dT%H%M%S%f"))
+        batch: int = 0
+
+        # dataset -> {path: schema} of the files written
+        file_schemas: dict = {}
+
+        def read_file(path: str):
+            if file_format == "parquet":
+                return pq.read_table(path)
+            return feather.read_table(path)
+
+        def write_file(table, path: str):
+            if file_format == "parquet":
+                pq.write_table(table, path)
+            else:
+                feather.write_feather(table, path)
+
+        def find_file_schemas(dataset: str):
+            schemas: dict = {}
+
+            for root, _, names in os.walk(os.path.join(output_dir, dataset)):
+                for name in sorted(names):
+                    if name.endswith("." + file_format):
+                        path = os.path.join(root, name)
+                        schemas[path] = read_file(path).schema.remove_metadata()
+
+            return schemas
+
+        def write_batch():
+            tables: dict = {
+                key: pa.Table.from_pandas(
+                    pd.concat(dfs, ignore_index=True), preserve_index=False
+                )
+                for key, dfs in pending.items()
+            }
+
+            schemas: dict = {}
+
+            for dataset in dict.fromkeys(dataset for dataset, _ in tables):
+                if dataset not in file_schemas:
+                    file_schemas[dataset] = find_file_schemas(dataset)
+
+                schema = self.__unify_export_schemas(
+                    list(file_schemas[dataset].values())
+                    + [
+                        table.schema
+                        for (table_dataset, _), table in tables.items()
+                        if table_dataset == dataset
+                    ]
+                )
+
+                # files written with other columns or types are rewritten, so
+                # the partitions are read as one dataset
+                for path, file_schema in file_schemas[dataset].items():
+                    if file_schema != schema:
+                        table = self.__conform_to_schema(read_file(path), schema)
+                        write_file(table, path)
+                        file_schemas[dataset][path] = schema
+
+                schemas[dataset] = schema
+
+            for (dataset, partition), table in tables.items():
+                folder = os.path.join(output_dir, dataset, partition)
+                os.makedirs(folder, exist_ok=True)
+
+                path = os.path.join(
+                    folder, "{}-{}.{}".format(file_prefix, batch, file_format)
+                )
+                write_file(self.__conform_to_schema(table, schemas[dataset]), path)
+                file_schemas[dataset][path] = schemas[dataset]
+
+            exported.extend(pending_ids)
+
+            # record the exported matches
+            if len(exported) > 0:
+                os.makedirs(output_dir, exist_ok=True)
+
+                with open(manifest_path, "w") as file:
+                    json.dump(list(dict.fromkeys(exported_before + exported)), file)
+
+            pending.clear()
+            pending_ids.clear()
+
+        for match_id in match_ids:
+            raw_data_ms = self.get_stored_data("match_summary", "match_id", match_id)
+
+            if raw_data_ms is None:
+                print("{} :: not exported :: no stored match summary".format(match_id))
+                continue
+
+            raw_data_tl = self.get_stored_data("match_timeline", "match_id", match_id)
+
+            info = raw_data_ms["details"]["info"]
+            partition = os.path.join(
+                "game_date={}".format(
+                    pd.to_datetime(info["gameCreation"], unit="ms").strftime("%Y-%m-%d")
+                ),
+                "queue_id={}".format(info["queueId"]),
+            )
+
+            datasets = {"participants": pd.DataFrame(info["participants"])}
+
+            if raw_data_tl is not None:
+                datasets["participant_frames"] = self.expand_champion_stats(
+                    self.build_champion_timeline_dataframe(raw_data_tl, raw_data_ms)
+                )
+                datasets["events"] = self.build_event_timeline_dataframe(
+                    raw_data_tl, raw_data_ms
+                )
+
+            for dataset, df in datasets.items():
+                pending.setdefault((dataset, partition), []).append(
+                    self.__flatten_for_export(df, match_id)
+                )
+
+            pending_ids.append(match_id)
+
+            if len(pending_ids) >= batch_size:
+                write_batch()
+                batch += 1
+
+        if len(pending_ids) > 0:
+            write_batch()
+
+        return exported
+
+    #%% update_timeline_tensor_cache
+    @timed_builder
+    def update_timeline_tensor_cache(
+        self, path: str = None, match_ids: list = None, stats: list = None
+    ):
+        """Appends the stored match timelines to a memory-mapped stats cache.
+
+        See TimelineTensorCache for the layout of the cache.  Only matches
+        which are not already within the cache are read from the db.
+
+
+        Parameters
+        ----------
+        path : str, optional
+            The path of the cache without an extension. If None is passed the
+            db name followed by '-frames' is used. The default is None.
+        match_ids : list, optional
+            The match ids to add. If None is passed all stored match timelines
+            are added. The default is None.
+        stats : list, optional
+            The participant frame stats stored when the cache is created. The
+            default is None.
+
+        Returns
+        -------
+        cache : TimelineTensorCache
+            The updated cache.
+
+        Example
+        -------
+            cache = lolA.update_timeline_tensor_cache()
+            gold = cache.get_stat("totalGold"); print(gold.shape)
+            Out[8]: (6, 60, 10)
+
+        """
+
+        if path is None:
+            path = self.db_prefix + "-frames"
+
+        cache = TimelineTensorCache(path, stats=stats)
+        cache.populate(self, match_ids=match_ids)
+
+        return cache
+
     #%% combine_match_summaries
-    def combine_match_summaries(self, summoner_name: str, match_id_list: list):
+    @timed_builder
+    def combine_match_summaries(
+        self,
+        summoner_name: str = None,
+        match_id_list: list = None,
+        columns: list = None,
+        puuid: str = None,
+        max_workers: int = 8,
+        return_errors: bool = False,
+    ):
         """Create a pd.DataFrame of all the match summaries for a given summoner.
 
         The pd.DataFrame generated compiles all the match summaries for a given
-        summoner for a list of specified games.
+        summoner for a list of specified games.  Match summaries which are not
+        stored within the db are requested concurrently, see
+        self.get_match_summaries().  The summoner's rows are found by puuid, so
+        matches played before a name change are included.
 
 
         Parameters
         ----------
-        summoner_name : str
-            sumoner name.
-        match_id_list : list
-            DESCRIPTION.
+        summoner_name : str, optional
+            sumoner name. If None is passed the summoner name used will be from
+            the object inialisation. The default is None.
+        match_id_list : list, optional
+            The match ids to combine. If None is passed the match ids stored
+            for the summoner are used. The default is None.
+        columns : list, optional
+            The participant fields to include, for example ['championName',
+            'kills', 'deaths']. The match_id column is always included. If
+            None is passed all fields are included. The default is None.
+        puuid : str, optional
+            The puuid of the summoner, used in place of the summoner name.
+            The default is None.
+        max_workers : int, optional
+            The maximum number of concurrent requests. The default is 8.
+        return_errors : bool, optional
+            If True, a dictionary of the match ids which could not be combined
+            and the reason is also returned. The default is False.
 
         Returns
         -------
-        summoner_match_summaries : TYPE
-            DESCRIPTION.
+        summoner_match_summaries : pd.DataFrame
+            A row for each match, in the order of match_id_list.
+        errors : dict
+            Only returned when return_errors is True. The exception or message
+            for each match id which could not be combined.
+
+        Example
+        -------
+            summary_df = lolA.combine_match_summaries(
+                "Moving Object 1", games_to_compare,
+                columns=["championName", "kills", "deaths", "assists", "win"])
 
         """
 
-        summoner_match_summaries = pd.DataFrame()
+        if puuid is None:
+            puuid = self.resolve_summoner(summoner_name)["puuid"]
 
-        for match_id in match_id_list:
+        if match_id_list is None:
+            match_id_list = self.get_list_of_stored_match_ids_for_summoner_name(
+                summoner_name
+            )
 
-            try:
+        errors: dict = {}
+        match_summaries = self.get_match_summaries(
+            match_id_list, max_workers=max_workers, errors=errors
+        )
 
-                match_details = self.get_match_summary(match_id)
+        records: list = []
 
-                if "status" not in match_details:
+        for match_id in dict.fromkeys(match_id_list):
+            if match_id not in match_summaries:
+                continue
 
-                    match_details_df = pd.DataFrame(
-                        match_details["details"]["info"]["participants"]
-                    )
+            match_details = match_summaries[match_id]["details"]
 
-                    match_details_df["match_id"] = match_id
+            if "status" in match_details:
+                errors[match_id] = match_details["status"]
+                print("unable to get match summary for: {}".format(match_id))
+                continue
 
-                    summoner_match_summaries = summoner_match_summaries.append(
-                        match_details_df[
-                            (match_details_df["summonerName"] == summoner_name)
-                        ]
-                    )
+            participant = next(
+                (
+                    participant
+                    for participant in match_details["info"]["participants"]
+                    if participant.get("puuid") == puuid
+                ),
+                None,
+            )
 
-            except:
-                print("unable to get match summary for: {}".format(match_id))
+            if participant is None:
+                errors[match_id] = "summoner not found within the match"
+                print("summoner not found within the match: {}".format(match_id))
                 continue
 
+            if columns is not None:
+                participant = {column: participant.get(column) for column in columns}
+
+            records.append({**participant, "match_id": match_id})
+
+        summoner_match_summaries = pd.DataFrame(
+            records, columns=None if columns is None else list(columns) + ["match_id"],
+        )
+
+        if return_errors:
+            return summoner_match_summaries, errors
+
         return summoner_match_summaries
 
 
+#%% build_timeline_chunk
+def build_timeline_chunk(kind: str, chunk: list):
+    """Builds the timeline dataframes for a chunk of matches.
+
+    Used by LeagueAnalysis.build_timelines() within the worker processes, so it
+    is defined at module level and only receives the stored JSON bytes.
+
+
+    Parameters
+    ----------
+    kind : str
+        'events' or 'participants'.
+    chunk : list
+        (match_id, match timeline bytes, match summary bytes) for each match.
+
+    Returns
+    -------
+    df : pd.DataFrame
+        The timelines of the matches, with a match_id column.
+
+    """
+
+    if kind == "events":
+        builder = LeagueAnalysis.build_event_timeline_dataframe
+    else:
+        builder = LeagueAnalysis.build_champion_timeline_dataframe
+
+    dfs: list = []
+
+    for match_id, payload_tl, payload_ms in chunk:
+        df = builder(
+            decode_stored_payload(payload_tl), decode_stored_payload(payload_ms)
+        )
+        df.insert(0, "match_id", match_id)
+        dfs.append(df)
+
+    return pd.concat(dfs, ignore_index=True)
+
+
 #%% if __name__ == "__main__":
 if __name__ == "__main__":
     print("main")
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 18:54:30 2026
+
+@author: Chris Bostock
+"""
+
+import json
+import re
+import threading
+import time
+from urllib.parse import unquote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+#%% FakeRiotServer
+class FakeRiotServer:
+    """A local http server which serves synthetic matches in place of riot's api.
+
+    The summoner, match list, match summary and match timeline endpoints are
+    served, along with rate limit headers high enough not to be reached.  Point
+    a RiotAPI object at the server with use_fake_server().
+
+
+    Parameters
+    ----------
+    matches : dict
+        Match id -> (summary, timeline), as returned by create_matches().
+    summoners : dict
+        Summoner name -> summoner details, as returned by the summoner-by-name
+        endpoint.
+    latency : float, optional
+        The number of seconds each response is delayed by, to simulate the
+        network. The default is 0.0.
+
+    Returns
+    -------
+    None.
+
+    Example
+    -------
+        with FakeRiotServer(matches, summoners) as server:
+            use_fake_server(lolA, server.url)
+            lolA.get_match_summaries(list(matches))
+
+    """
+
+    #%% __init__
+    def __init__(self, matches: dict, summoners: dict, latency: float = 0.0):
+
+        self.latency: float = latency
+        self.request_count: int = 0
+        self.lock = threading.Lock()
+
+        # responses are encoded once, so the server is not the bottleneck
+        self.responses: dict = {}
+
+        for match_id, (summary, timeline) in matches.items():
+            self.responses["/lol/match/v5/matches/{}".format(match_id)] = json.dumps(
+                summary
+            ).encode("utf-8")
+            self.responses[
+                "/lol/match/v5/matches/{}/timeline".format(match_id)
+            ] = json.dumps(timeline).encode("utf-8")
+
+        for summoner_name, details in summoners.items():
+            self.responses[
+                "/lol/summoner/v4/summoners/by-name/{}".format(summoner_name)
+            ] = json.dumps(details).encode("utf-8")
+            self.responses[
+                "/lol/summoner/v4/summoners/by-puuid/{}".format(details["puuid"])
+            ] = json.dumps(details).encode("utf-8")
+
+        self.match_lists: dict = {}
+
+        for match_id, (summary, _) in matches.items():
+            for puuid in summary["metadata"]["participants"]:
+                self.match_lists.setdefault(puuid, []).append(match_id)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.__create_handler())
+        self.server.daemon_threads = True
+        self.thread: threading.Thread = None
+
+    #%% url
+    @property
+    def url(self):
+        """The base url of the server. For example, http://127.0.0.1:50123."""
+
+        host, port = self.server.server_address[:2]
+
+        return "http://{}:{}".format(host, port)
+
+    #%% __create_handler
+    def __create_handler(self):
+
+        fake_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+
+                with fake_server.lock:
+                    fake_server.request_count += 1
+
+                if fake_server.latency > 0:
+                    time.sleep(fake_server.latency)
+
+                path, _, query = self.path.partition("?")
+                path = unquote(path)
+                body = fake_server.responses.get(path)
+
+                match_list = re.fullmatch(
+                    r"/lol/match/v5/matches/by-puuid/(.+)/ids", path
+                )
+
+                if body is None and match_list is not None:
+                    params = dict(
+                        item.split("=", 1) for item in query.split("&") if "=" in item
+                    )
+                    start = int(params.get("start", 0))
+                    count = int(params.get("count", 20))
+                    match_ids = fake_server.match_lists.get(match_list.group(1), [])
+                    body = json.dumps(match_ids[start : start + count]).encode("utf-8")
+
+                if body is None:
+                    status = 404
+                    body = json.dumps(
+                        {"status": {"message": "Data not found", "status_code": 404}}
+                    ).encode("utf-8")
+                else:
+                    status = 200
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json;charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("X-App-Rate-Limit", "100000:1,6000000:120")
+                self.send_header("X-App-Rate-Limit-Count", "1:1,1:120")
+                self.send_header("X-Method-Rate-Limit", "100000:10")
+                self.send_header("X-Method-Rate-Limit-Count", "1:10")
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    #%% start
+    def start(self):
+        """Starts serving requests on a background thread.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    #%% stop
+    def stop(self):
+        """Stops the server.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.server.shutdown()
+        self.server.server_close()
+
+        if self.thread is not None:
+            self.thread.join()
+
+    #%% __enter__
+    def __enter__(self):
+
+        self.start()
+        return self
+
+    #%% __exit__
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.stop()
+
+
+#%% use_fake_server
+def use_fake_server(riot_api, url: str):
+    """Sends the requests of a RiotAPI object to a fake server.
+
+
+    Parameters
+    ----------
+    riot_api : RiotAPI
+        For example, a LeagueAnalysis object.
+    url : str
+        The base url of the server, FakeRiotServer.url.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    riot_api.api_details["url"] = url
+    riot_api.api_details["regionalRouting"] = url
@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 19:20:47 2026
+
+@author: Chris Bostock
+
+Times the main data paths against synthetic matches, without an api key.
+
+    python benchmarks/runBenchmarks.py --matches 200 --output results.json
+
+The results are written as JSON, so runs can be compared over time.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# the package modules are imported from the folder above
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from LeagueAnalysis import LeagueAnalysis  # noqa: E402
+from db.LeagueDB import LeagueDB  # noqa: E402
+from benchmarks.syntheticPayloads import create_matches  # noqa: E402
+from benchmarks.fakeRiotServer import FakeRiotServer, use_fake_server  # noqa: E402
+
+SUMMONER_NAME: str = "Benchmark Summoner"
+
+#%% time_call
+def time_call(function, repeat: int = 3, items: int = 1):
+    """Times a function, returning the timings in a dictionary.
+
+
+    Parameters
+    ----------
+    function : callable
+        The function to time, called with no arguments.
+    repeat : int, optional
+        The number of times the function is called. The default is 3.
+    items : int, optional
+        The number of items processed by each call, used for the throughput.
+        The default is 1.
+
+    Returns
+    -------
+    timings : dict
+        The fastest, mean and slowest time in seconds, and the items per
+        second of the fastest call.
+
+    """
+
+    seconds: list = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - start)
+
+    return {
+        "repeat": repeat,
+        "items": items,
+        "seconds_min": min(seconds),
+        "seconds_mean": statistics.mean(seconds),
+        "seconds_max": max(seconds),
+        "items_per_second": items / min(seconds) if min(seconds) > 0 else None,
+    }
+
+
+#%% create_analysis
+def create_analysis(db_name: str, storage: str, cache_size: int = 0):
+    """Creates a LeagueAnalysis object which needs no api key or network.
+
+    The cache is disabled by default, so repeated runs time the builders
+    rather than cache hits.
+    """
+
+    return LeagueAnalysis(
+        "benchmark-key",
+        summoner_name=SUMMONER_NAME,
+        db_name=db_name,
+        db_storage=storage,
+        cache_size=cache_size,
+    )
+
+
+#%% run_benchmarks
+def run_benchmarks(
+    matches: int = 100,
+    minutes: int = 30,
+    events_per_minute: int = 25,
+    storage: str = "tinydb",
+    repeat: int = 3,
+    max_workers: int = 8,
+    latency: float = 0.0,
+    seed: int = 0,
+):
+    """Runs the benchmarks, returning the results in a dictionary.
+
+
+    Parameters
+    ----------
+    matches : int, optional
+        The number of synthetic matches. The default is 100.
+    minutes : int, optional
+        The length of each match. The default is 30.
+    events_per_minute : int, optional
+        The average number of events within each frame. The default is 25.
+    storage : str, optional
+        The database storage backend: 'tinydb' or 'sqlite'. The default is
+        'tinydb'.
+    repeat : int, optional
+        The number of times each benchmark is run. The default is 3.
+    max_workers : int, optional
+        The number of concurrent requests for the bulk fetch. The default is 8.
+    latency : float, optional
+        The delay of each fake server response in seconds. The default is 0.0.
+    seed : int, optional
+        The random seed. The default is 0.
+
+    Returns
+    -------
+    results : dict
+
+    """
+
+    match_data, puuids = create_matches(
+        matches, minutes=minutes, events_per_minute=events_per_minute, seed=seed
+    )
+    match_ids = list(match_data)
+    summaries = {match_id: summary for match_id, (summary, _) in match_data.items()}
+    timelines = {match_id: timeline for match_id, (_, timeline) in match_data.items()}
+
+    summoner = {
+        "accountId": "benchmark-account",
+        "id": "benchmark-id",
+        "name": SUMMONER_NAME,
+        "puuid": puuids[0],
+    }
+
+    benchmarks: dict = {}
+
+    with tempfile.TemporaryDirectory() as folder:
+
+        # db inserts, into a new database each time
+        runs = iter(range(repeat))
+
+        def insert():
+            league_db = LeagueDB(
+                db_name=os.path.join(folder, "insert{}".format(next(runs))),
+                storage=storage,
+            )
+            league_db.insert_data_batch("match_summary", "match_id", summaries)
+            league_db.insert_data_batch("match_timeline", "match_id", timelines)
+            league_db.close()
+
+        benchmarks["db_insert_batch"] = time_call(insert, repeat, matches * 2)
+
+        # the seeded database used by the remaining benchmarks
+        db_name = os.path.join(folder, "loldb")
+        league_db = LeagueDB(db_name=db_name, storage=storage)
+        league_db.insert_data_batch("match_summary", "match_id", summaries)
+        league_db.insert_data_batch("match_timeline", "match_id", timelines)
+        league_db.insert_data("summoner_names", "account_name", SUMMONER_NAME, summoner)
+        league_db.close()
+
+        lol_analysis = create_analysis(db_name, storage)
+
+        def lookup():
+            for match_id in match_ids:
+                lol_analysis.get_stored_data("match_timeline", "match_id", match_id)
+                lol_analysis.get_stored_data("match_summary", "match_id", match_id)
+
+        benchmarks["db_lookup"] = time_call(lookup, repeat, matches * 2)
+
+        benchmarks["create_event_timeline_dataframe"] = time_call(
+            lambda: [
+                lol_analysis.create_event_timeline_dataframe(match_id)
+                for match_id in match_ids
+            ],
+            repeat,
+            matches,
+        )
+
+        benchmarks["create_champion_timeline_dataframe"] = time_call(
+            lambda: [
+                lol_analysis.create_champion_timeline_dataframe(match_id)
+                for match_id in match_ids
+            ],
+            repeat,
+            matches,
+        )
+
+        champion_timelines = pd.concat(
+            [
+                lol_analysis.create_champion_timeline_dataframe(match_id)
+                for match_id in match_ids
+            ],
+            ignore_index=True,
+        )
+
+        benchmarks["expand_champion_stats"] = time_call(
+            lambda: lol_analysis.expand_champion_stats(champion_timelines),
+            repeat,
+            len(champion_timelines),
+        )
+
+        benchmarks["combine_match_summaries"] = time_call(
+            lambda: lol_analysis.combine_match_summaries(SUMMONER_NAME, match_ids),
+            repeat,
+            matches,
+        )
+
+        lol_analysis.close()
+
+        # the builders once their results are held within the cache
+        cached_analysis = create_analysis(db_name, storage, cache_size=2 ** 30)
+
+        def create_cached_dataframes():
+            for match_id in match_ids:
+                cached_analysis.create_event_timeline_dataframe(match_id)
+                cached_analysis.create_champion_timeline_dataframe(match_id)
+
+        create_cached_dataframes()
+        benchmarks["cached_timeline_dataframes"] = time_call(
+            create_cached_dataframes, repeat, matches * 2
+        )
+        benchmarks["cached_timeline_dataframes"][
+            "cache"
+        ] = cached_analysis.cache.stats()
+
+        cached_analysis.close()
+
+        # bulk fetch from the fake server, into a new database each time
+        with FakeRiotServer(
+            match_data, {SUMMONER_NAME: summoner}, latency=latency
+        ) as server:
+            runs = iter(range(repeat))
+
+            def bulk_fetch():
+                fetch_analysis = create_analysis(
+                    os.path.join(folder, "fetch{}".format(next(runs))), storage
+                )
+                use_fake_server(fetch_analysis, server.url)
+
+                fetched = fetch_analysis.get_match_summaries(
+                    match_ids, max_workers=max_workers
+                )
+                fetched.update(
+                    fetch_analysis.get_match_timelines(
+                        match_ids, max_workers=max_workers
+                    )
+                )
+                fetch_analysis.close()
+
+            benchmarks["bulk_fetch"] = time_call(bulk_fetch, repeat, matches * 2)
+            benchmarks["bulk_fetch"]["requests"] = server.request_count
+
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+        },
+        "config": {
+            "matches": matches,
+            "minutes": minutes,
+            "events_per_minute": events_per_minute,
+            "storage": storage,
+            "repeat": repeat,
+            "max_workers": max_workers,
+            "latency": latency,
+            "seed": seed,
+        },
+        "benchmarks": benchmarks,
+    }
+
+    return results
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[-2])
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--minutes", type=int, default=30)
+    parser.add_argument("--events-per-minute", type=int, default=25)
+    parser.add_argument("--storage", choices=["tinydb", "sqlite"], default="tinydb")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        matches=args.matches,
+        minutes=args.minutes,
+        events_per_minute=args.events_per_minute,
+        storage=args.storage,
+        repeat=args.repeat,
+        max_workers=args.max_workers,
+        latency=args.latency,
+        seed=args.seed,
+    )
+
+    output = json.dumps(results, indent=2)
+
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, "w") as file:
+            file.write(output)
+
+        for name, timings in results["benchmarks"].items():
+            print(
+                "{:<36} {:>10.4f}s {:>12.1f} items/s".format(
+                    name, timings["seconds_min"], timings["items_per_second"]
+                )
+            )
@@ -0,0 +1,452 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 18:21:09 2026
+
+@author: Chris Bostock
+"""
+
+import random
+
+from mapAssets import MAP_SIZE
+
+CHAMPIONS: list = [
+    "Aatrox",
+    "Ahri",
+    "Akali",
+    "Brand",
+    "Camille",
+    "Jhin",
+    "Karma",
+    "Kennen",
+    "LeeSin",
+    "Lux",
+    "MonkeyKing",
+    "Nidalee",
+    "Soraka",
+    "Talon",
+    "Twitch",
+    "Yasuo",
+]
+
+POSITIONS: list = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+
+CHAMPION_STATS: list = [
+    "abilityHaste",
+    "abilityPower",
+    "armor",
+    "armorPen",
+    "armorPenPercent",
+    "attackDamage",
+    "attackSpeed",
+    "bonusArmorPenPercent",
+    "bonusMagicPenPercent",
+    "ccReduction",
+    "cooldownReduction",
+    "health",
+    "healthMax",
+    "healthRegen",
+    "lifesteal",
+    "magicPen",
+    "magicPenPercent",
+    "magicResist",
+    "movementSpeed",
+    "omnivamp",
+    "physicalVamp",
+    "power",
+    "powerMax",
+    "powerRegen",
+    "spellVamp",
+]
+
+DAMAGE_STATS: list = [
+    "magicDamageDone",
+    "magicDamageDoneToChampions",
+    "magicDamageTaken",
+    "physicalDamageDone",
+    "physicalDamageDoneToChampions",
+    "physicalDamageTaken",
+    "totalDamageDone",
+    "totalDamageDoneToChampions",
+    "totalDamageTaken",
+    "trueDamageDone",
+    "trueDamageDoneToChampions",
+    "trueDamageTaken",
+]
+
+# event type -> relative frequency
+EVENT_WEIGHTS: dict = {
+    "ITEM_PURCHASED": 30,
+    "WARD_PLACED": 24,
+    "ITEM_DESTROYED": 21,
+    "SKILL_LEVEL_UP": 19,
+    "LEVEL_UP": 18,
+    "CHAMPION_KILL": 8,
+    "WARD_KILL": 5,
+    "TURRET_PLATE_DESTROYED": 2,
+    "BUILDING_KILL": 2,
+    "ELITE_MONSTER_KILL": 1,
+}
+
+# match summary participant stats, filling out the ~120 columns riot returns
+SUMMARY_STATS: list = [
+    "assists",
+    "baronKills",
+    "champExperience",
+    "champLevel",
+    "damageDealtToBuildings",
+    "damageDealtToObjectives",
+    "damageDealtToTurrets",
+    "damageSelfMitigated",
+    "deaths",
+    "detectorWardsPlaced",
+    "doubleKills",
+    "dragonKills",
+    "goldEarned",
+    "goldSpent",
+    "inhibitorKills",
+    "kills",
+    "largestKillingSpree",
+    "largestMultiKill",
+    "magicDamageDealt",
+    "magicDamageDealtToChampions",
+    "neutralMinionsKilled",
+    "physicalDamageDealt",
+    "physicalDamageDealtToChampions",
+    "timePlayed",
+    "totalDamageDealt",
+    "totalDamageDealtToChampions",
+    "totalDamageTaken",
+    "totalHeal",
+    "totalMinionsKilled",
+    "trueDamageDealt",
+    "turretKills",
+    "visionScore",
+    "wardsKilled",
+    "wardsPlaced",
+] + ["stat{}".format(number) for number in range(80)]
+
+#%% create_puuids
+def create_puuids(count: int, seed: int = 0):
+    """Returns a list of fake puuids.
+
+
+    Parameters
+    ----------
+    count : int
+        The number of puuids.
+    seed : int, optional
+        The random seed. The default is 0.
+
+    Returns
+    -------
+    puuids : list
+
+    """
+
+    rng = random.Random(seed)
+
+    return ["".join(rng.choices("0123456789abcdef", k=78)) for _ in range(count)]
+
+
+#%% _position
+def _position(rng: random.Random):
+
+    return {"x": rng.randint(0, MAP_SIZE), "y": rng.randint(0, MAP_SIZE)}
+
+
+#%% _create_event
+def _create_event(rng: random.Random, event_type: str, timestamp: int):
+
+    event = {"timestamp": timestamp, "type": event_type}
+    participant_id = rng.randint(1, 10)
+
+    if event_type in ["ITEM_PURCHASED", "ITEM_DESTROYED"]:
+        event.update(
+            {"itemId": rng.randint(1001, 6700), "participantId": participant_id}
+        )
+    elif event_type == "SKILL_LEVEL_UP":
+        event.update(
+            {
+                "levelUpType": "NORMAL",
+                "participantId": participant_id,
+                "skillSlot": rng.randint(1, 4),
+            }
+        )
+    elif event_type == "LEVEL_UP":
+        event.update({"level": rng.randint(2, 18), "participantId": participant_id})
+    elif event_type == "WARD_PLACED":
+        event.update({"creatorId": participant_id, "wardType": "YELLOW_TRINKET"})
+    elif event_type == "WARD_KILL":
+        event.update({"killerId": participant_id, "wardType": "CONTROL_WARD"})
+    elif event_type == "CHAMPION_KILL":
+        victim_id = rng.choice([pid for pid in range(1, 11) if pid != participant_id])
+        damage = [
+            {
+                "basic": False,
+                "magicDamage": rng.randint(0, 900),
+                "name": rng.choice(CHAMPIONS),
+                "participantId": rng.randint(1, 10),
+                "physicalDamage": rng.randint(0, 900),
+                "spellName": "spell",
+                "spellSlot": rng.randint(0, 3),
+                "trueDamage": rng.randint(0, 100),
+                "type": "OTHER",
+            }
+            for _ in range(rng.randint(1, 4))
+        ]
+        event.update(
+            {
+                "assistingParticipantIds": rng.sample(range(1, 11), rng.randint(0, 4)),
+                "bounty": 300,
+                "killStreakLength": rng.randint(0, 5),
+                "killerId": participant_id,
+                "position": _position(rng),
+                "victimDamageDealt": damage,
+                "victimDamageReceived": damage,
+                "victimId": victim_id,
+            }
+        )
+    elif event_type == "TURRET_PLATE_DESTROYED":
+        event.update(
+            {
+                "killerId": participant_id,
+                "laneType": rng.choice(["TOP_LANE", "MID_LANE", "BOT_LANE"]),
+                "position": _position(rng),
+                "teamId": rng.choice([100, 200]),
+            }
+        )
+    elif event_type == "BUILDING_KILL":
+        event.update(
+            {
+                "assistingParticipantIds": rng.sample(range(1, 11), rng.randint(0, 4)),
+                "bounty": 0,
+                "buildingType": "TOWER_BUILDING",
+                "killerId": participant_id,
+                "laneType": rng.choice(["TOP_LANE", "MID_LANE", "BOT_LANE"]),
+                "position": _position(rng),
+                "teamId": rng.choice([100, 200]),
+                "towerType": "OUTER_TURRET",
+            }
+        )
+    elif event_type == "ELITE_MONSTER_KILL":
+        event.update(
+            {
+                "killerId": participant_id,
+                "killerTeamId": 100 if participant_id <= 5 else 200,
+                "monsterSubType": "FIRE_DRAGON",
+                "monsterType": "DRAGON",
+                "position": _position(rng),
+            }
+        )
+
+    return event
+
+
+#%% create_match
+def create_match(
+    match_id: str,
+    puuids: list,
+    minutes: int = 30,
+    events_per_minute: int = 25,
+    seed: int = None,
+):
+    """Creates a synthetic match summary and timeline in riot's v5 format.
+
+    Only the structure and the value types follow riot's payloads, the values
+    themselves are random.
+
+
+    Parameters
+    ----------
+    match_id : str
+        The match id. For example, 'EUW1_5612017679'.
+    puuids : list
+        The puuids of the 10 participants.
+    minutes : int, optional
+        The length of the match. A frame is created for each minute. The
+        default is 30.
+    events_per_minute : int, optional
+        The average number of events within each frame. The default is 25.
+    seed : int, optional
+        The random seed. If None is passed the match id is used. The default
+        is None.
+
+    Returns
+    -------
+    summary : dict
+        The match summary, as returned by the match_summary endpoint.
+    timeline : dict
+        The match timeline, as returned by the match_timeline endpoint.
+
+    """
+
+    rng = random.Random(match_id if seed is None else seed)
+
+    game_id = int(match_id.split("_")[-1])
+    game_creation = 1_639_000_000_000 + game_id % 10_000_000 * 1_000
+    winning_team = rng.choice([100, 200])
+    champions = rng.sample(CHAMPIONS, 10)
+
+    participants = []
+
+    for index, puuid in enumerate(puuids):
+        team_id = 100 if index < 5 else 200
+        participant = {
+            "participantId": index + 1,
+            "puuid": puuid,
+            "summonerName": "Summoner {}".format(puuid[:6]),
+            "summonerId": puuid[:40],
+            "championName": champions[index],
+            "championId": CHAMPIONS.index(champions[index]) + 1,
+            "individualPosition": POSITIONS[index % 5],
+            "teamId": team_id,
+            "win": team_id == winning_team,
+            "perks": {"statPerks": {"defense": 5002, "flex": 5008, "offense": 5005}},
+        }
+        participant.update({stat: rng.randint(0, 50_000) for stat in SUMMARY_STATS})
+        participants.append(participant)
+
+    summary = {
+        "metadata": {"dataVersion": "2", "matchId": match_id, "participants": puuids},
+        "info": {
+            "gameCreation": game_creation,
+            "gameDuration": minutes * 60,
+            "gameId": game_id,
+            "gameMode": "CLASSIC",
+            "gameType": "MATCHED_GAME",
+            "gameVersion": "11.24.415.6106",
+            "mapId": 11,
+            "participants": participants,
+            "platformId": match_id.split("_")[0],
+            "queueId": 420,
+        },
+    }
+
+    event_types = list(EVENT_WEIGHTS)
+    weights = list(EVENT_WEIGHTS.values())
+    frames = []
+
+    for minute in range(minutes + 1):
+        timestamp = minute * 60_000
+
+        participant_frames = {
+            str(participant_id): {
+                "championStats": {
+                    stat: rng.randint(0, 2_000) for stat in CHAMPION_STATS
+                },
+                "currentGold": rng.randint(0, 3_000),
+                "damageStats": {stat: rng.randint(0, 50_000) for stat in DAMAGE_STATS},
+                "goldPerSecond": 0,
+                "jungleMinionsKilled": rng.randint(0, 8) * minute,
+                "level": min(18, 1 + minute // 2),
+                "minionsKilled": rng.randint(5, 9) * minute,
+                "participantId": participant_id,
+                "position": _position(rng),
+                "timeEnemySpentControlled": rng.randint(0, 20_000),
+                "totalGold": 500 + rng.randint(300, 500) * minute,
+                "xp": rng.randint(300, 700) * minute,
+            }
+            for participant_id in range(1, 11)
+        }
+
+        if minute == 0:
+            events = [
+                {"realTimestamp": game_creation, "timestamp": 0, "type": "PAUSE_END"}
+            ]
+        else:
+            count = rng.randint(events_per_minute // 2, events_per_minute * 3 // 2)
+            events = [
+                _create_event(
+                    rng, event_type, timestamp - 60_000 + rng.randint(0, 59_999)
+                )
+                for event_type in rng.choices(event_types, weights, k=count)
+            ]
+            events.sort(key=lambda event: event["timestamp"])
+
+        if minute == minutes:
+            events.append(
+                {
+                    "gameId": game_id,
+                    "realTimestamp": game_creation + timestamp,
+                    "timestamp": timestamp,
+                    "type": "GAME_END",
+                    "winningTeam": winning_team,
+                }
+            )
+
+        frames.append(
+            {
+                "events": events,
+                "participantFrames": participant_frames,
+                "timestamp": timestamp,
+            }
+        )
+
+    timeline = {
+        "metadata": {"dataVersion": "2", "matchId": match_id, "participants": puuids},
+        "info": {
+            "frameInterval": 60_000,
+            "frames": frames,
+            "gameId": game_id,
+            "participants": [
+                {"participantId": index + 1, "puuid": puuid}
+                for index, puuid in enumerate(puuids)
+            ],
+        },
+    }
+
+    return summary, timeline
+
+
+#%% create_matches
+def create_matches(
+    count: int,
+    minutes: int = 30,
+    events_per_minute: int = 25,
+    seed: int = 0,
+    platform: str = "EUW1",
+):
+    """Creates synthetic matches, all including the first puuid.
+
+
+    Parameters
+    ----------
+    count : int
+        The number of matches.
+    minutes : int, optional
+        The length of each match. The default is 30.
+    events_per_minute : int, optional
+        The average number of events within each frame. The default is 25.
+    seed : int, optional
+        The random seed. The default is 0.
+    platform : str, optional
+        The match id prefix. The default is 'EUW1'.
+
+    Returns
+    -------
+    matches : dict
+        Match id -> (summary, timeline), newest match first.
+    puuids : list
+        The puuids which are drawn from, the first of which plays every match.
+
+    """
+
+    rng = random.Random(seed)
+    puuids = create_puuids(50, seed=seed)
+
+    matches: dict = {}
+
+    for number in range(count):
+        match_id = "{}_{}".format(platform, 5_700_000_000 - number)
+        participants = [puuids[0]] + rng.sample(puuids[1:], 9)
+        rng.shuffle(participants)
+
+        matches[match_id] = create_match(
+            match_id,
+            participants,
+            minutes=minutes,
+            events_per_minute=events_per_minute,
+            seed=seed * 1_000_003 + number,
+        )
+
+    return matches, puuids
@@ -5,12 +5,58 @@ Created on Sat Dec 11 11:55:55 2021
 @author: Chris Bostock
 """
 
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager, ExitStack
 import tinydb as tdb
+from tinydb.middlewares import CachingMiddleware, Middleware
+from tinydb.storages import JSONStorage
+from db.SQLiteDB import SQLiteDB
+from db.payloadCodecs import CODECS, encode_payload, decode_payload
+from metrics import Metrics
+
+#%% LockingMiddleware
+class LockingMiddleware(Middleware):
+    """Serialises the reads and writes of a TinyDB storage shared by threads.
+
+    JSONStorage reads and writes through a single file handle, so a read
+    made while another thread writes can return a partially written file.
+
+    """
+
+    def __init__(self, storage_cls):
+
+        super().__init__(storage_cls)
+        self.lock = threading.RLock()
+
+    def read(self):
+
+        with self.lock:
+            return self.storage.read()
+
+    def write(self, data):
+
+        with self.lock:
+            self.storage.write(data)
+
+    def close(self):
+
+        with self.lock:
+            self.storage.close()
+
 
 #%% LeagueDB
 class LeagueDB:
     """ LeagueDB is a object which interacts with a NoSQL database TinyDB.
 
+         The tables can also be stored within SQLite, where each table is
+         indexed on its key.  This is better suited to large databases, as
+         TinyDB reads and rewrites the whole file.
+
 
          Parameters
          ----------
@@ -19,6 +65,22 @@ class LeagueDB:
              corresponding databases having a prefix.
          contsole_print_out : bool, optional
             Prints out to the console when data is retreieved or written. The default is False.
+         storage : str, optional
+            The storage backend: 'tinydb' or 'sqlite'. The default is 'tinydb'.
+         compression : str, optional
+            The codec used to compress the match timeline and match summary
+            payloads, for example 'zlib' or 'lzma'. Compressed payloads are
+            decoded by self.get_stored_data().  If None is passed payloads are
+            stored as they are. The default is None.
+         write_cache_size : int, optional
+            The number of TinyDB writes buffered in memory before the files are
+            written.  Reads include the buffered writes.  The buffers are
+            written by self.flush(), self.close(), and when the interpreter
+            exits. The default is 1, where every write is written to file.
+         metrics : Metrics, optional
+            Records the lookup hits and misses, and the lookup and insert times
+            of each table. If None is passed a new Metrics object is used,
+            held as self.metrics. The default is None.
 
          Returns
          -------
@@ -28,24 +90,59 @@ class LeagueDB:
     """
 
     #%% __init__
-    def __init__(self, db_name: str = None, contsole_print_out: bool = False):
+    def __init__(
+        self,
+        db_name: str = None,
+        contsole_print_out: bool = False,
+        storage: str = "tinydb",
+        compression: str = None,
+        write_cache_size: int = 1,
+        metrics: Metrics = None,
+    ):
+
+        # instrumentation
+        self.metrics: Metrics = Metrics() if metrics is None else metrics
+
+        # held while checking for and writing data, so threads do not store
+        # the same key twice
+        self.__write_lock = threading.RLock()
 
         # database name -- this could include a path
 
         if db_name is None:
             db_name = "./db/loldb"
 
+        if storage == "tinydb":
+            extension = "json"
+            database = self.__open_tinydb
+        elif storage == "sqlite":
+            extension = "sqlite"
+            database = SQLiteDB
+        else:
+            raise NameError("storage: {} not found".format(storage))
+
+        if compression is not None and compression not in CODECS:
+            raise NameError("compression: {} not found".format(compression))
+
+        self.storage: str = storage
+        self.db_prefix: str = db_name
+        self.write_cache_size: int = write_cache_size
+
+        # payload compression
+        self.compression: str = compression
+        self.compressed_tables: tuple = ("match_timeline", "match_summary")
+
         # database files
-        self.db_name = "{}.json".format(db_name)
-        self.timeline_db_name = "{}-tl.json".format(db_name)
-        self.champlist_db_name = "{}-cl.json".format(db_name)
-        self.match_summary_db_name = "{}-ms.json".format(db_name)
+        self.db_name = "{}.{}".format(db_name, extension)
+        self.timeline_db_name = "{}-tl.{}".format(db_name, extension)
+        self.champlist_db_name = "{}-cl.{}".format(db_name, extension)
+        self.match_summary_db_name = "{}-ms.{}".format(db_name, extension)
 
         # database object
-        self.db = tdb.TinyDB(self.db_name)
-        self.db_cl = tdb.TinyDB(self.champlist_db_name)  # champ list
-        self.db_tl = tdb.TinyDB(self.timeline_db_name)  # time line
-        self.db_ms = tdb.TinyDB(self.match_summary_db_name)  # match summary
+        self.db = database(self.db_name)
+        self.db_cl = database(self.champlist_db_name)  # champ list
+        self.db_tl = database(self.timeline_db_name)  # time line
+        self.db_ms = database(self.match_summary_db_name)  # match summary
 
         # User
         self.user = tdb.Query()
@@ -54,6 +151,7 @@ class LeagueDB:
         self.tables = {}
         self.tables["summoner_names"] = self.db.table("summoner_name")
         self.tables["match_ids"] = self.db.table("match_ids")
+        self.tables["sync_state"] = self.db.table("sync_state")
         self.tables["champ_list"] = self.db_cl.table("champ_list")
         self.tables["match_timeline"] = self.db_tl.table("match_timeline")
         self.tables["match_summary"] = self.db_ms.table("match_summary")
@@ -61,6 +159,315 @@ class LeagueDB:
         # consoleprintout
         self.contsole_print_out = contsole_print_out
 
+        # (table name, key) -> {key value: doc id}, built on first lookup
+        self.__key_index: dict = {}
+
+        # account id -> set of match ids, built on first use
+        self.__match_ids: dict = None
+
+        # account id -> match ids ordered newest first
+        self.__sorted_match_ids: dict = {}
+
+        # buffered writes are not lost when the object is not closed
+        if storage == "tinydb" and write_cache_size > 1:
+            atexit.register(LeagueDB.__flush_reference, weakref.ref(self))
+
+    #%% __open_tinydb
+    def __open_tinydb(self, path: str):
+        """Opens a TinyDB file, behind a write cache if write_cache_size > 1.
+
+        Without a write cache every read and write goes to the file, so other
+        LeagueDB objects using the same files see the writes.
+
+
+        Parameters
+        ----------
+        path : str
+            The path of the database file.
+
+        Returns
+        -------
+        db : tdb.TinyDB
+
+        """
+
+        if self.write_cache_size <= 1:
+            return tdb.TinyDB(path, storage=LockingMiddleware(JSONStorage))
+
+        db = tdb.TinyDB(path, storage=CachingMiddleware(LockingMiddleware(JSONStorage)))
+        db.storage.WRITE_CACHE_SIZE = self.write_cache_size
+
+        return db
+
+    #%% __swap_storage
+    def __swap_storage(self, database: tdb.TinyDB, storage):
+        """Replaces the storage of a TinyDB object and its tables.
+
+
+        Parameters
+        ----------
+        database : tdb.TinyDB
+            The database.
+        storage : tinydb.storages.Storage
+            The new storage.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        previous = database.storage
+        database._storage = storage
+
+        for table in list(database._tables.values()) + list(self.tables.values()):
+            if table.storage is previous:
+                table._storage = storage
+
+    #%% __flush_reference
+    @staticmethod
+    def __flush_reference(reference: weakref.ref):
+
+        league_db = reference()
+
+        if league_db is not None:
+            league_db.flush()
+
+    #%% batch
+    @contextmanager
+    def batch(self):
+        """Buffers all the writes within the context into a single write.
+
+        Reads within the context include the buffered writes.  The buffers are
+        written when the context exits, including when an exception is raised.
+        When using SQLite the writes are grouped into a transaction instead,
+        which is also committed when an exception is raised.
+
+
+        Returns
+        -------
+        None.
+
+        Example
+        -------
+            with lolA.batch():
+                for match_id in match_ids:
+                    lolA.get_match_summary(match_id)
+
+        """
+
+        databases = [self.db, self.db_cl, self.db_tl, self.db_ms]
+
+        if self.storage == "sqlite":
+            with ExitStack() as stack:
+                for database in databases:
+                    stack.enter_context(database.transaction(commit_on_error=True))
+                yield
+            return
+
+        # write cache size, or None when the cache is only used for the batch
+        write_cache_sizes: list = []
+
+        for database in databases:
+            if isinstance(database.storage, CachingMiddleware):
+                write_cache_sizes.append(database.storage.WRITE_CACHE_SIZE)
+            else:
+                cached_storage = CachingMiddleware(LockingMiddleware(JSONStorage))
+                cached_storage.storage = database.storage
+                self.__swap_storage(database, cached_storage)
+                write_cache_sizes.append(None)
+
+            database.storage.WRITE_CACHE_SIZE = float("inf")
+
+        try:
+            yield
+        finally:
+            self.flush()
+
+            for database, write_cache_size in zip(databases, write_cache_sizes):
+                if write_cache_size is None:
+                    self.__swap_storage(database, database.storage.storage)
+                else:
+                    database.storage.WRITE_CACHE_SIZE = write_cache_size
+
+    #%% flush
+    def flush(self):
+        """Writes any buffered writes to the database files.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.storage == "tinydb":
+            for database in [self.db, self.db_cl, self.db_tl, self.db_ms]:
+                if isinstance(database.storage, CachingMiddleware):
+                    database.storage.flush()
+
+    #%% close
+    def close(self):
+        """Writes any buffered writes and closes the database files.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        for database in [self.db, self.db_cl, self.db_tl, self.db_ms]:
+            database.close()
+
+    #%% __get_key_index
+    def __get_key_index(self, tbl_name: str, key: str):
+        """Returns the key value to doc id index, building it if required.
+
+
+        Parameters
+        ----------
+        tbl_name : str
+            The corresponding table name.
+        key : str
+            The key name for the given table. For example, 'match_id'.
+
+        Returns
+        -------
+        index : dict
+            The doc id of the first document for each key value.
+
+        """
+
+        index = self.__key_index.get((tbl_name, key))
+
+        if index is not None:
+            return index
+
+        # writers iterate over the indexes while holding the lock
+        with self.__write_lock:
+            index = self.__key_index.get((tbl_name, key))
+
+            if index is None:
+                index = {}
+
+                for document in self.tables[tbl_name]:
+                    index.setdefault(document.get(key), document.doc_id)
+
+                self.__key_index[(tbl_name, key)] = index
+
+        return index
+
+    #%% __add_to_key_index
+    def __add_to_key_index(self, tbl_name: str, documents: list, doc_ids: list):
+        """Adds inserted documents to the indexes built for the table.
+
+
+        Parameters
+        ----------
+        tbl_name : str
+            The table the documents were inserted into.
+        documents : list
+            The inserted documents.
+        doc_ids : list
+            The doc ids of the inserted documents.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        with self.__write_lock:
+            for (index_tbl_name, key), index in self.__key_index.items():
+                if index_tbl_name == tbl_name:
+                    for document, doc_id in zip(documents, doc_ids):
+                        index.setdefault(document.get(key), doc_id)
+
+    #%% __encode_document
+    def __encode_document(self, tbl_name: str, key: str, key_value: str, data: dict):
+        """Creates the document to be stored, compressing the payload if enabled.
+
+
+        Parameters
+        ----------
+        tbl_name : str
+            Table in which the data is being stored.
+        key : str
+            The key name for the given table. For example, 'match_id'.
+        key_value : str
+            The the value of the key which is being stored.
+        data : dict
+            The data associated with the key.
+
+        Returns
+        -------
+        document : dict
+            The document to be stored.
+
+        """
+
+        if self.compression is None or tbl_name not in self.compressed_tables:
+            return {key: key_value, "details": data}
+
+        return {
+            key: key_value,
+            "details": encode_payload(data, self.compression),
+            "codec": self.compression,
+        }
+
+    #%% __decode_document
+    @staticmethod
+    def __decode_document(document: tdb.table.Document):
+        """Returns the document with its payload decompressed.
+
+
+        Parameters
+        ----------
+        document : tdb.table.Document
+            The stored document.
+
+        Returns
+        -------
+        document : tdb.table.Document
+            A copy of the document with the original payload, or the document
+            itself when the payload is not compressed.
+
+        """
+
+        if document is None or "codec" not in document:
+            return document
+
+        decoded = {
+            item: value
+            for item, value in document.items()
+            if item not in ["details", "codec"]
+        }
+        decoded["details"] = decode_payload(document["details"], document["codec"])
+
+        return tdb.table.Document(decoded, document.doc_id)
+
+    #%% __drop_key_index
+    def __drop_key_index(self, *tbl_names: str):
+        """Removes the indexes built for the given tables.
+
+
+        Parameters
+        ----------
+        *tbl_names : str
+            The table names.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        with self.__write_lock:
+            for index_key in list(self.__key_index):
+                if index_key[0] in tbl_names:
+                    del self.__key_index[index_key]
+
     #%% __console_get_printout
     def __console_get_printout(self, result: str, method_name: str, key: str):
 
@@ -114,10 +521,120 @@ class LeagueDB:
 
         return list_of_summoners
 
+    #%% get_list_of_stored_matches
+    def get_list_of_stored_matches(self, tbl_name: str = "match_summary"):
+        """Returns the list of match id's stored within a match table.
+
+
+        Parameters
+        ----------
+        tbl_name : str, optional
+            'match_summary' or 'match_timeline'. The default is 'match_summary'.
+
+        Returns
+        -------
+        list_of_matches : list
+            The match id's stored within the table.
+
+        """
+
+        list_of_matches: list = []
+
+        for item in self.tables[tbl_name]:
+            list_of_matches.append(item["match_id"])
+
+        return list_of_matches
+
+    #%% __get_match_id_set
+    def __get_match_id_set(self, account_id: str):
+        """Returns the set of stored match id's for a given account id.
+
+        The match_ids table holds one document for each update of an account,
+        containing only the match id's which were added.  On first use the
+        table is read once and the documents are merged into a set for each
+        account.
+
+
+        Parameters
+        ----------
+        account_id : str
+            Account id for the requested set of match id's.
+
+        Returns
+        -------
+        match_ids : set
+            The stored match id's.
+
+        """
+
+        with self.__write_lock:
+            if self.__match_ids is None:
+                match_ids: dict = {}
+
+                for document in self.tables["match_ids"]:
+                    match_ids.setdefault(document["account_id"], set()).update(
+                        document["matches"]
+                    )
+
+                self.__match_ids = match_ids
+
+            return self.__match_ids.setdefault(account_id, set())
+
+    #%% match_id_sort_key
+    @staticmethod
+    def match_id_sort_key(match_id: str):
+        """Sort key ordering match id's by game creation.
+
+        Riot assigns match id's in increasing order within each platform, for
+        example 'EUW1_5612017679', so the numeric part orders the games by
+        when they were created.
+
+
+        Parameters
+        ----------
+        match_id : str
+            The match id.
+
+        Returns
+        -------
+        key : tuple
+
+        """
+
+        platform, _, number = match_id.rpartition("_")
+
+        if number.isdigit():
+            return (int(number), platform)
+
+        return (-1, match_id)
+
+    #%% has_stored_match_id
+    def has_stored_match_id(self, account_id: str, match_id: str):
+        """Returns True if the match id is stored for the given account id.
+
+
+        Parameters
+        ----------
+        account_id : str
+            Account id the match is associated with.
+        match_id : str
+            The match id. For example, 'EUW1_5612017679'.
+
+        Returns
+        -------
+        bool
+
+        """
+
+        return match_id in self.__get_match_id_set(account_id)
+
     #%% get_list_of_stored_match_ids_for_account_id
     def get_list_of_stored_match_ids_for_account_id(self, account_id: str):
         """Return a list of stored match id's for a given account id.
 
+        The match id's are ordered by game creation, newest first, as returned
+        by riot's match list endpoint.
+
 
         Parameters
         ----------
@@ -126,18 +643,63 @@ class LeagueDB:
 
         Returns
         -------
-        None.
+        match_list : list
+            List of matches stored within the database.
 
         """
 
-        match_list = self.get_stored_data("match_ids", "account_id", account_id)
+        match_list = self.__sorted_match_ids.get(account_id)
 
-        if match_list is not None:
-            match_list = match_list["matches"]
-        else:
-            match_list = []
+        if match_list is None:
+            match_list = sorted(
+                self.__get_match_id_set(account_id),
+                key=self.match_id_sort_key,
+                reverse=True,
+            )
+            self.__sorted_match_ids[account_id] = match_list
+
+        return list(match_list)
+
+    #%% __get_document
+    def __get_document(self, tbl_name: str, key: str, key_value: str):
+        """Returns the stored document with the key and value required.
+
+        The document is not decoded, and the lookup is not recorded within
+        self.metrics, so it is used to check for existing entries before they
+        are stored.
+
+
+        Parameters
+        ----------
+        tbl_name : str
+            The corresponding table name.
+        key : str
+            The key name for the given table. For example, 'match_id'.
+        key_value : str
+            The the value of the key which is required.  For example, 'EUW1_5612017679'.
+
+        Returns
+        -------
+        document : Document
+            None if no document is found.
+
+        """
 
-        return match_list
+        if self.storage == "sqlite":
+            return self.tables[tbl_name].get_by_key(key, key_value)
+
+        index = self.__get_key_index(tbl_name, key)
+        doc_id = index.get(key_value)
+
+        if doc_id is None:
+            return None
+
+        document = self.tables[tbl_name].get(doc_id=doc_id)
+
+        if document is None:
+            del index[key_value]
+
+        return document
 
     #%% get_stored_data
     def get_stored_data(self, tbl_name: str, key: str, key_value: str):
@@ -160,11 +722,61 @@ class LeagueDB:
 
         """
 
-        result = self.tables[tbl_name].get(self.user[key] == key_value)
+        start = time.perf_counter()
+
+        result = self.__decode_document(self.__get_document(tbl_name, key, key_value))
         self.__console_get_printout(result, tbl_name, key_value)
 
+        self.metrics.record_db(
+            tbl_name, "lookup", time.perf_counter() - start, hit=result is not None
+        )
+
         return result
 
+    #%% get_stored_payload
+    def get_stored_payload(self, tbl_name: str, key: str, key_value: str):
+        """Returns the stored document as JSON bytes, without decoding it.
+
+        Compressed payloads are left compressed.  The bytes can be restored
+        with payloadCodecs.decode_stored_payload().
+
+
+        Parameters
+        ----------
+        tbl_name : str
+            The corresponding table name.
+        key : str
+            The key name for the given table. For example, 'match_id'.
+        key_value : str
+            The the value of the key which is required.  For example, 'EUW1_5612017679'.
+
+        Returns
+        -------
+        payload : bytes
+            None if no data is found.
+
+        """
+
+        table = self.tables[tbl_name]
+
+        if self.storage == "sqlite" and key == table.key:
+            payload = table.get_text_by_key(key_value)
+        else:
+            if self.storage == "sqlite":
+                document = table.get_by_key(key, key_value)
+            else:
+                doc_id = self.__get_key_index(tbl_name, key).get(key_value)
+                document = None if doc_id is None else table.get(doc_id=doc_id)
+
+            payload = None if document is None else json.dumps(document)
+
+        self.__console_get_printout(payload, tbl_name, key_value)
+
+        if payload is None:
+            return None
+
+        return payload.encode("utf-8")
+
     #%% drop_all_tables
     def drop_all_tables(self):
         """ Drops all tables
@@ -206,6 +818,7 @@ class LeagueDB:
 
         try:
             self.db_cl.drop_tables()
+            self.__drop_key_index("champ_list")
             print(
                 "{} - dropChampListTable :: match_timeline table dropped".format(
                     self.champlist_db_name
@@ -237,6 +850,7 @@ class LeagueDB:
 
         try:
             self.db_ms.drop_tables()
+            self.__drop_key_index("match_summary")
             print(
                 "{} - dropMatchSummaryTable :: match_timeline table dropped".format(
                     self.match_summary_db_name
@@ -268,6 +882,9 @@ class LeagueDB:
 
         try:
             self.db.drop_tables()
+            self.__drop_key_index("summoner_names", "match_ids", "sync_state")
+            self.__match_ids = None
+            self.__sorted_match_ids = {}
             print(
                 "{} - dropSummaryInfoTable :: match_timeline table dropped".format(
                     self.db_name
@@ -297,6 +914,7 @@ class LeagueDB:
 
         try:
             self.db_tl.drop_tables()
+            self.__drop_key_index("match_timeline")
             print(
                 "{} - dropTimelineTable :: match_timeline table dropped".format(
                     self.db_name
@@ -329,33 +947,307 @@ class LeagueDB:
             If successful method returns True.
 
         """
-        successful = False
+        with self.__write_lock:
+            successful = False
 
-        # check to see if we already have that data:
-        result = self.get_stored_data(tbl_name, key, key_value)
+            # check to see if we already have that data:
+            result = self.__get_document(tbl_name, key, key_value)
+            start = time.perf_counter()
 
-        # if we dont, result == None
-        if result is None:
+            # if we dont, result == None
+            if result is None:
 
-            try:
-                value2insert = {key: key_value, "details": data}
-                self.tables[tbl_name].insert(value2insert)
+                try:
+                    value2insert = self.__encode_document(
+                        tbl_name, key, key_value, data
+                    )
+                    doc_id = self.tables[tbl_name].insert(value2insert)
+                    self.__add_to_key_index(tbl_name, [value2insert], [doc_id])
 
+                    successful = True
+
+                except Exception as e:
+                    print("{} :: failed :: {}".format(tbl_name, e))
+            else:
                 successful = True
 
+            self.__console_insert_printout(successful, tbl_name, key_value)
+            self.metrics.record_db(tbl_name, "insert", time.perf_counter() - start)
+
+            return successful
+
+    #%% update_stored_data
+    def update_stored_data(self, tbl_name: str, key: str, key_value: str, data: dict):
+        """Replaces the data stored with the key, or stores it if not found.
+
+
+        Parameters
+        ----------
+        tbl_name : str
+            Table in which the data is being stored.
+        key : str
+            The key name for the given table. For example, 'sync_key'.
+        key_value : str
+            The the value of the key which is being stored.
+        data : dict
+            The data associated with the key.
+
+        Returns
+        -------
+        successful : bool
+            If successful method returns True.
+
+        """
+
+        with self.__write_lock:
+            result = self.__get_document(tbl_name, key, key_value)
+
+            if result is None:
+                return self.insert_data(tbl_name, key, key_value, data)
+
+            start = time.perf_counter()
+            value2update = self.__encode_document(tbl_name, key, key_value, data)
+
+            def replace(document):
+                document.clear()
+                document.update(value2update)
+
+            try:
+                self.tables[tbl_name].update(replace, doc_ids=[result.doc_id])
             except Exception as e:
                 print("{} :: failed :: {}".format(tbl_name, e))
-        else:
-            successful = True
+                return False
+
+            self.__console_insert_printout(True, tbl_name, key_value)
+            self.metrics.record_db(tbl_name, "insert", time.perf_counter() - start)
+
+            return True
+
+    #%% insert_data_batch
+    def insert_data_batch(self, tbl_name: str, key: str, data: dict):
+        """Stores many entries within the given table in a single write.
+
+        Entries which are already stored within the table are skipped.
+
+
+        Parameters
+        ----------
+        tbl_name : str
+            Table in which the data is being stored.
+        key : str
+            The key name for the given table. For example, 'match_id'.
+        data : dict
+            The data to be stored, where the keys are the key values.
+            For example, {'EUW1_5612017679': {...}, 'EUW1_5612017680': {...}}.
+
+        Returns
+        -------
+        inserted : list
+            The key values of the entries added to the db.
+
+        """
+
+        with self.__write_lock:
+            inserted: list = [
+                key_value
+                for key_value in data
+                if self.__get_document(tbl_name, key, key_value) is None
+            ]
+            start = time.perf_counter()
+
+            values2insert: list = [
+                self.__encode_document(tbl_name, key, key_value, data[key_value])
+                for key_value in inserted
+            ]
+
+            if len(values2insert) > 0:
+                try:
+                    doc_ids = self.tables[tbl_name].insert_multiple(values2insert)
+                    self.__add_to_key_index(tbl_name, values2insert, doc_ids)
+                except Exception as e:
+                    print("{} :: failed :: {}".format(tbl_name, e))
+                    inserted = []
+
+            for key_value in inserted:
+                self.__console_insert_printout(True, tbl_name, key_value)
+
+            self.metrics.record_db(tbl_name, "insert", time.perf_counter() - start)
+
+            return inserted
+
+    #%% compact_tables
+    def compact_tables(self, tbl_names: list = None):
+        """Rewrites the stored payloads using the current compression setting.
+
+        Entries stored before compression was enabled are compressed, entries
+        stored with a different codec are re-encoded, and when compression is
+        disabled the entries are decompressed.  Each table is rewritten in a
+        single write.
+
+
+        Parameters
+        ----------
+        tbl_names : list, optional
+            The tables to be compacted. If None is passed the match timeline
+            and match summary tables are compacted. The default is None.
+
+        Returns
+        -------
+        compacted : dict
+            The number of entries rewritten for each table.
+
+        Example
+        -------
+            lolDB = LeagueDB(compression="zlib")
+            lolDB.compact_tables()
+            Out[1]: {'match_timeline': 6, 'match_summary': 6}
 
-        self.__console_insert_printout(successful, tbl_name, key_value)
+        """
+
+        if tbl_names is None:
+            tbl_names = list(self.compressed_tables)
+
+        compacted: dict = {}
+
+        for tbl_name in tbl_names:
+            table = self.tables[tbl_name]
+
+            if self.compression is not None and tbl_name in self.compressed_tables:
+                codec = self.compression
+            else:
+                codec = None
+
+            doc_ids = [
+                document.doc_id for document in table if document.get("codec") != codec
+            ]
+
+            def recode(document):
+                if "codec" in document:
+                    document["details"] = decode_payload(
+                        document["details"], document.pop("codec")
+                    )
+
+                if codec is not None:
+                    document["details"] = encode_payload(document["details"], codec)
+                    document["codec"] = codec
+
+            if len(doc_ids) > 0:
+                table.update(recode, doc_ids=doc_ids)
+
+            compacted[tbl_name] = len(doc_ids)
+
+        if self.storage == "sqlite":
+            self.db_tl.vacuum()
+            self.db_ms.vacuum()
 
-        return successful
+        return compacted
+
+    #%% migrate_from_tinydb
+    def migrate_from_tinydb(self, db_name: str = None):
+        """Copies the data stored within TinyDB files into the SQLite database.
+
+        Entries which are already stored are skipped, so the migration can be
+        rerun safely.  The TinyDB files are not modified.
+
+
+        Parameters
+        ----------
+        db_name : str, optional
+            The name of the TinyDB database. If None is passed the name of this
+            database is used, for example ./db/loldb. The default is None.
+
+        Raises
+        ------
+        TypeError
+            When this database is not using SQLite storage.
+
+        Returns
+        -------
+        migrated : dict
+            The number of entries copied for each table.
+
+        Example
+        -------
+            lolDB = LeagueDB(storage="sqlite")
+            lolDB.migrate_from_tinydb()
+            Out[1]:
+                {'summoner_names': 2, 'match_ids': 2, 'sync_state': 2,
+                 'champ_list': 1, 'match_timeline': 5, 'match_summary': 5}
+
+        """
+
+        if self.storage != "sqlite":
+            raise TypeError("migrate_from_tinydb requires sqlite storage.")
+
+        if db_name is None:
+            db_name = self.db_prefix
+
+        # tinydb files and the key for each table
+        sources = {
+            "summoner_names": ("{}.json", "summoner_name", "account_name"),
+            "match_ids": ("{}.json", "match_ids", "account_id"),
+            "sync_state": ("{}.json", "sync_state", "sync_key"),
+            "champ_list": ("{}-cl.json", "champ_list", "ddragon"),
+            "match_timeline": ("{}-tl.json", "match_timeline", "match_id"),
+            "match_summary": ("{}-ms.json", "match_summary", "match_id"),
+        }
+
+        migrated: dict = {}
+
+        for tbl_name, (file_name, source_table, key) in sources.items():
+            file_name = file_name.format(db_name)
+            migrated[tbl_name] = 0
+
+            if not os.path.exists(file_name):
+                continue
+
+            source = tdb.TinyDB(file_name, access_mode="r")
+
+            try:
+                documents = [dict(document) for document in source.table(source_table)]
+            finally:
+                source.close()
+
+            if tbl_name == "match_ids":
+                # match ids are merged with the match ids already stored
+                for document in documents:
+                    added = self.update_stored_summoner_match_ids(
+                        document["account_id"], document["matches"]
+                    )
+                    migrated[tbl_name] += int(len(added) > 0)
+                continue
+
+            documents = [
+                document
+                for document in documents
+                if self.__get_document(tbl_name, key, document.get(key)) is None
+            ]
+
+            if tbl_name in self.compressed_tables:
+                documents = [
+                    self.__encode_document(
+                        tbl_name, key, document[key], document["details"]
+                    )
+                    if "codec" not in document
+                    else document
+                    for document in documents
+                ]
+
+            if len(documents) > 0:
+                doc_ids = self.tables[tbl_name].insert_multiple(documents)
+                self.__add_to_key_index(tbl_name, documents, doc_ids)
+
+            migrated[tbl_name] = len(documents)
+
+        return migrated
 
     #%% update_stored_summoner_match_ids
     def update_stored_summoner_match_ids(self, account_id: str, new_matches: list):
         """Add new match id's to the existing match id list
 
+        Only the match id's which are not already stored are written, as a new
+        document for the account, so the stored list is never rewritten.
+
 
         Parameters
         ----------
@@ -374,29 +1266,23 @@ class LeagueDB:
 
         """
 
-        match_list = self.get_stored_data("match_ids", "account_id", account_id)
-        new_summoner = False
-
-        if match_list is not None:
+        with self.__write_lock:
+            match_ids = self.__get_match_id_set(account_id)
 
-            match_list = match_list["matches"]
+            match_list = [
+                match for match in dict.fromkeys(new_matches) if match not in match_ids
+            ]
 
-            for match in new_matches:
-                if match not in match_list:
-                    match_list.append(match)
+            if len(match_list) > 0:
+                value2insert = {"account_id": account_id, "matches": match_list}
 
-        else:
-            match_list = new_matches
-            new_summoner = True
-
-        value2update = {"account_id": account_id, "matches": match_list}
+                doc_id = self.tables["match_ids"].insert(value2insert)
+                self.__add_to_key_index("match_ids", [value2insert], [doc_id])
 
-        if new_summoner:
-            self.tables["match_ids"].insert(value2update)
-        else:
-            self.tables["match_ids"].update(value2update)
+                match_ids.update(match_list)
+                self.__sorted_match_ids.pop(account_id, None)
 
-        return match_list
+            return match_list
 
 
 #%% if __name__ == "__main__"
@@ -0,0 +1,474 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 11:20:05 2026
+
+@author: Chris Bostock
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from tinydb.table import Document
+
+# table name -> (key column, unique)
+TABLE_KEYS: dict = {
+    "summoner_name": ("account_name", True),
+    "match_ids": ("account_id", False),
+    "champ_list": ("ddragon", True),
+    "match_timeline": ("match_id", True),
+    "match_summary": ("match_id", True),
+    "sync_state": ("sync_key", True),
+}
+
+#%% SQLiteDB
+class SQLiteDB:
+    """A SQLite database file which can be used in place of a TinyDB object.
+
+    Only the parts of the TinyDB interface used by LeagueDB are provided.  The
+    database is opened in WAL mode so reads are not blocked by writes.
+
+
+    Parameters
+    ----------
+    path : str
+        The path of the database file.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    #%% __init__
+    def __init__(self, path: str):
+
+        self.path: str = path
+        self.lock = threading.RLock()
+
+        self.connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        self.__tables: dict = {}
+        self.__transaction_depth: int = 0
+        self.__commit_on_error: bool = False
+
+    #%% transaction
+    @contextmanager
+    def transaction(self, commit_on_error: bool = False):
+        """Groups the writes within the context into a single transaction.
+
+        Transactions can be nested, in which case the outermost transaction
+        commits, or rolls back if an exception is raised.
+
+
+        Parameters
+        ----------
+        commit_on_error : bool, optional
+            If True the outermost transaction commits the writes made before
+            an exception is raised, rather than rolling back. The default is
+            False.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        with self.lock:
+            if self.__transaction_depth == 0:
+                self.connection.execute("BEGIN")
+
+            if self.__transaction_depth == 0:
+                self.__commit_on_error = commit_on_error
+
+            self.__transaction_depth += 1
+
+            try:
+                yield
+            except BaseException:
+                self.__transaction_depth -= 1
+
+                if self.__transaction_depth == 0:
+                    if self.__commit_on_error:
+                        self.connection.execute("COMMIT")
+                    else:
+                        self.connection.execute("ROLLBACK")
+                raise
+            else:
+                self.__transaction_depth -= 1
+
+                if self.__transaction_depth == 0:
+                    self.connection.execute("COMMIT")
+
+    #%% table
+    def table(self, name: str):
+        """Returns the table with the given name, creating it if required.
+
+
+        Parameters
+        ----------
+        name : str
+            The table name.
+
+        Returns
+        -------
+        table : SQLiteTable
+
+        """
+
+        if name not in self.__tables:
+            self.__tables[name] = SQLiteTable(self, name)
+
+        return self.__tables[name]
+
+    #%% drop_tables
+    def drop_tables(self):
+        """Removes all the documents from the tables within this database.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        for table in self.__tables.values():
+            table.truncate()
+
+    #%% vacuum
+    def vacuum(self):
+        """Rebuilds the database file, releasing the space of removed data.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        with self.lock:
+            self.connection.execute("VACUUM")
+
+    #%% close
+    def close(self):
+        """Closes the database connection.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        with self.lock:
+            self.connection.close()
+
+
+#%% SQLiteTable
+class SQLiteTable:
+    """A table of JSON documents with an indexed key column.
+
+    The key column for each LeagueDB table is defined within TABLE_KEYS.
+    Documents are stored as JSON text alongside their key value, so lookups on
+    the key use the index rather than scanning the table.
+
+
+    Parameters
+    ----------
+    db : SQLiteDB
+        The database the table belongs to.
+    name : str
+        The table name.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    #%% __init__
+    def __init__(self, db: SQLiteDB, name: str):
+
+        self.db: SQLiteDB = db
+        self.name: str = name
+        self.key, unique = TABLE_KEYS.get(name, (None, False))
+
+        with self.db.lock:
+            if self.key is None:
+                self.db.connection.execute(
+                    'CREATE TABLE IF NOT EXISTS "{}" ('
+                    "doc_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "document TEXT NOT NULL)".format(name)
+                )
+            else:
+                self.db.connection.execute(
+                    'CREATE TABLE IF NOT EXISTS "{}" ('
+                    "doc_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    '"{}" TEXT, '
+                    "document TEXT NOT NULL)".format(name, self.key)
+                )
+                self.db.connection.execute(
+                    'CREATE {}INDEX IF NOT EXISTS "{}_{}" ON "{}" ("{}")'.format(
+                        "UNIQUE " if unique else "", name, self.key, name, self.key
+                    )
+                )
+
+    #%% __iter__
+    def __iter__(self):
+
+        with self.db.lock:
+            rows = self.db.connection.execute(
+                'SELECT doc_id, document FROM "{}" ORDER BY doc_id'.format(self.name)
+            ).fetchall()
+
+        for doc_id, document in rows:
+            yield Document(json.loads(document), doc_id)
+
+    #%% __len__
+    def __len__(self):
+
+        with self.db.lock:
+            return self.db.connection.execute(
+                'SELECT COUNT(*) FROM "{}"'.format(self.name)
+            ).fetchone()[0]
+
+    #%% __insert_rows
+    def __insert_rows(self, documents: list):
+
+        doc_ids: list = []
+
+        for document in documents:
+            if self.key is None:
+                cursor = self.db.connection.execute(
+                    'INSERT INTO "{}" (document) VALUES (?)'.format(self.name),
+                    (json.dumps(document),),
+                )
+            else:
+                cursor = self.db.connection.execute(
+                    'INSERT INTO "{}" ("{}", document) VALUES (?, ?)'.format(
+                        self.name, self.key
+                    ),
+                    (document.get(self.key), json.dumps(document)),
+                )
+
+            doc_ids.append(cursor.lastrowid)
+
+        return doc_ids
+
+    #%% insert
+    def insert(self, document: dict):
+        """Inserts a document.
+
+
+        Parameters
+        ----------
+        document : dict
+            The document to be stored.
+
+        Returns
+        -------
+        doc_id : int
+            The id of the inserted document.
+
+        """
+
+        with self.db.lock:
+            return self.__insert_rows([document])[0]
+
+    #%% insert_multiple
+    def insert_multiple(self, documents: list):
+        """Inserts many documents within a single transaction.
+
+
+        Parameters
+        ----------
+        documents : list
+            The documents to be stored.
+
+        Returns
+        -------
+        doc_ids : list
+            The ids of the inserted documents.
+
+        """
+
+        with self.db.transaction():
+            return self.__insert_rows(documents)
+
+    #%% get
+    def get(self, doc_id: int = None):
+        """Returns the document with the given id.
+
+
+        Parameters
+        ----------
+        doc_id : int
+            The document id.
+
+        Returns
+        -------
+        document : Document
+            None if the document is not found.
+
+        """
+
+        with self.db.lock:
+            row = self.db.connection.execute(
+                'SELECT document FROM "{}" WHERE doc_id = ?'.format(self.name),
+                (doc_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return Document(json.loads(row[0]), doc_id)
+
+    #%% get_by_key
+    def get_by_key(self, key: str, key_value: str):
+        """Returns the first document where the key has the given value.
+
+        The index is used when the key is the table's key column, otherwise
+        the table is scanned.
+
+
+        Parameters
+        ----------
+        key : str
+            The key name. For example, 'match_id'.
+        key_value : str
+            The value of the key. For example, 'EUW1_5612017679'.
+
+        Returns
+        -------
+        document : Document
+            None if no document is found.
+
+        """
+
+        if key != self.key:
+            for document in self:
+                if document.get(key) == key_value:
+                    return document
+            return None
+
+        with self.db.lock:
+            row = self.db.connection.execute(
+                'SELECT doc_id, document FROM "{}" WHERE "{}" = ? '
+                "ORDER BY doc_id LIMIT 1".format(self.name, self.key),
+                (key_value,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return Document(json.loads(row[1]), row[0])
+
+    #%% get_text_by_key
+    def get_text_by_key(self, key_value: str):
+        """Returns the JSON text of the first document with the key value.
+
+
+        Parameters
+        ----------
+        key_value : str
+            The value of the table's key column.
+
+        Returns
+        -------
+        document : str
+            None if no document is found.
+
+        """
+
+        with self.db.lock:
+            row = self.db.connection.execute(
+                'SELECT document FROM "{}" WHERE "{}" = ? '
+                "ORDER BY doc_id LIMIT 1".format(self.name, self.key),
+                (key_value,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return row[0]
+
+    #%% update
+    def update(self, fields: dict, doc_ids: list = None):
+        """Updates the fields of documents.
+
+
+        Parameters
+        ----------
+        fields : dict or callable
+            The fields to be updated, or a function which updates a document
+            in place, as with TinyDB.
+        doc_ids : list, optional
+            The ids of the documents to update. If None is passed all documents
+            are updated, as with TinyDB. The default is None.
+
+        Returns
+        -------
+        doc_ids : list
+            The ids of the updated documents.
+
+        """
+
+        with self.db.transaction():
+            if doc_ids is None:
+                documents = list(self)
+            else:
+                documents = [self.get(doc_id) for doc_id in doc_ids]
+
+            updated: list = []
+
+            for document in documents:
+                if document is None:
+                    continue
+
+                if callable(fields):
+                    fields(document)
+                else:
+                    document.update(fields)
+
+                if self.key is None:
+                    self.db.connection.execute(
+                        'UPDATE "{}" SET document = ? WHERE doc_id = ?'.format(
+                            self.name
+                        ),
+                        (json.dumps(document), document.doc_id),
+                    )
+                else:
+                    self.db.connection.execute(
+                        'UPDATE "{}" SET "{}" = ?, document = ? WHERE doc_id = ?'.format(
+                            self.name, self.key
+                        ),
+                        (document.get(self.key), json.dumps(document), document.doc_id),
+                    )
+
+                updated.append(document.doc_id)
+
+        return updated
+
+    #%% truncate
+    def truncate(self):
+        """Removes all documents from the table.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        with self.db.lock:
+            self.db.connection.execute('DELETE FROM "{}"'.format(self.name))
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+
+    print("")
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 13:41:52 2026
+
+@author: Chris Bostock
+"""
+
+import base64
+import json
+import lzma
+import zlib
+
+# codec name -> (compress, decompress)
+CODECS: dict = {
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+#%% register_codec
+def register_codec(name: str, compress, decompress):
+    """Adds a codec which can be used to compress stored payloads.
+
+
+    Parameters
+    ----------
+    name : str
+        The codec name, which is stored alongside each compressed payload.
+    compress : callable
+        Function taking bytes and returning the compressed bytes.
+    decompress : callable
+        Function taking the compressed bytes and returning the original bytes.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    CODECS[name] = (compress, decompress)
+
+
+#%% encode_payload
+def encode_payload(data, codec: str):
+    """Compresses a payload into a string which can be stored as JSON.
+
+
+    Parameters
+    ----------
+    data : dict
+        The payload, for example a match timeline.
+    codec : str
+        The codec name. For example, 'zlib'.
+
+    Raises
+    ------
+    NameError
+        When the codec has not been registered.
+
+    Returns
+    -------
+    payload : str
+        The base64 encoded compressed payload.
+
+    """
+
+    if codec not in CODECS:
+        raise NameError("codec: {} not found".format(codec))
+
+    compressed = CODECS[codec][0](json.dumps(data).encode("utf-8"))
+
+    return base64.b64encode(compressed).decode("ascii")
+
+
+#%% decode_payload
+def decode_payload(payload: str, codec: str):
+    """Restores a payload compressed by encode_payload().
+
+
+    Parameters
+    ----------
+    payload : str
+        The base64 encoded compressed payload.
+    codec : str
+        The codec name. For example, 'zlib'.
+
+    Raises
+    ------
+    NameError
+        When the codec has not been registered.
+
+    Returns
+    -------
+    data : dict
+        The original payload.
+
+    """
+
+    if codec not in CODECS:
+        raise NameError("codec: {} not found".format(codec))
+
+    return json.loads(CODECS[codec][1](base64.b64decode(payload)))
+
+
+#%% decode_stored_payload
+def decode_stored_payload(payload: bytes):
+    """Restores a stored document from its JSON bytes.
+
+    The bytes are those returned by LeagueDB.get_stored_payload(), so the
+    decompression can be done away from the database, for example within a
+    worker process.
+
+
+    Parameters
+    ----------
+    payload : bytes
+        The JSON encoded document.
+
+    Returns
+    -------
+    document : dict
+        The document with its original payload under 'details'.
+
+    """
+
+    document = json.loads(payload)
+
+    if "codec" in document:
+        document["details"] = decode_payload(document["details"], document.pop("codec"))
+
+    return document
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+
+    print("")
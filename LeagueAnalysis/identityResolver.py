@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:40:18 2026
+
+@author: Chris Bostock
+"""
+
+import threading
+import time
+
+# the summoner details used to build the api urls
+IDENTITY_KEYS: tuple = ("id", "puuid", "accountId", "name")
+
+#%% IdentityResolver
+class IdentityResolver:
+    """An in memory cache of summoner identities, which expire after a ttl.
+
+    Identities are held by summoner name and by puuid, so the summoner-scoped
+    endpoints can be called for many summoners without reading the
+    summoner_names table, or requesting the summoner, for each request.
+    Identities expire after ttl seconds, so renamed summoners are eventually
+    resolved again.  The object is thread safe.
+
+
+    Parameters
+    ----------
+    ttl : float, optional
+        The number of seconds an identity is held for. The default is 3600.
+
+    Returns
+    -------
+    None.
+
+    Example
+    -------
+        identities = IdentityResolver(ttl=600)
+        identities.put(lolA.get_summoner_by_name("Summoner Name")["details"])
+        puuid = identities.get("Summoner Name")["puuid"]
+
+    """
+
+    #%% __init__
+    def __init__(self, ttl: float = 3600.0):
+
+        self.ttl: float = ttl
+
+        self.__lock = threading.Lock()
+
+        # summoner name -> (identity, expiry time)
+        self.__names: dict = {}
+
+        # puuid -> (identity, expiry time)
+        self.__puuids: dict = {}
+
+    #%% __len__
+    def __len__(self):
+
+        with self.__lock:
+            return len(self.__puuids)
+
+    #%% __get
+    def __get(self, identities: dict, key: str):
+
+        with self.__lock:
+            entry = identities.get(key)
+
+            if entry is None:
+                return None
+
+            if entry[1] <= time.monotonic():
+                del identities[key]
+                return None
+
+            return entry[0]
+
+    #%% get
+    def get(self, summoner_name: str):
+        """Returns the identity of a summoner name, or None if not held.
+
+
+        Parameters
+        ----------
+        summoner_name : str
+            The summoner name.
+
+        Returns
+        -------
+        identity : dict
+            The summoner's id, puuid, accountId and name.
+
+        """
+
+        return self.__get(self.__names, summoner_name)
+
+    #%% get_by_puuid
+    def get_by_puuid(self, puuid: str):
+        """Returns the identity of a puuid, or None if not held.
+
+
+        Parameters
+        ----------
+        puuid : str
+            The summoner's puuid.
+
+        Returns
+        -------
+        identity : dict
+            The summoner's id, puuid, accountId and name.
+
+        """
+
+        return self.__get(self.__puuids, puuid)
+
+    #%% put
+    def put(self, summoner_details: dict, summoner_name: str = None):
+        """Adds the identity of a summoner.
+
+
+        Parameters
+        ----------
+        summoner_details : dict
+            The summoner, as returned by the summoner endpoints.
+        summoner_name : str, optional
+            The name the summoner was requested by. If None is passed the
+            name within the summoner details is used. The default is None.
+
+        Returns
+        -------
+        identity : dict
+            The summoner's id, puuid, accountId and name.
+
+        """
+
+        identity = {key: summoner_details.get(key) for key in IDENTITY_KEYS}
+
+        if summoner_name is None:
+            summoner_name = identity["name"]
+
+        entry = (identity, time.monotonic() + self.ttl)
+
+        with self.__lock:
+            if summoner_name is not None:
+                self.__names[summoner_name] = entry
+
+            self.__puuids[identity["puuid"]] = entry
+
+        return identity
+
+    #%% invalidate
+    def invalidate(self, summoner_name: str = None, puuid: str = None):
+        """Removes held identities.
+
+
+        Parameters
+        ----------
+        summoner_name : str, optional
+            The summoner name to remove. The default is None.
+        puuid : str, optional
+            The puuid to remove. If neither a summoner name or puuid are
+            passed all identities are removed. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        with self.__lock:
+            if summoner_name is None and puuid is None:
+                self.__names = {}
+                self.__puuids = {}
+
+            if summoner_name is not None:
+                self.__names.pop(summoner_name, None)
+
+            if puuid is not None:
+                self.__puuids.pop(puuid, None)
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+
+    print("")
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:12:40 2026
+
+@author: Chris Bostock
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+#%% estimate_size
+def estimate_size(value):
+    """Estimates the memory held by a value in bytes.
+
+    DataFrames and Series are measured with memory_usage(deep=True), and
+    bytes and strings by their length.  Other values are measured with
+    sys.getsizeof(), which does not include the values they contain, so the
+    size of a nested value such as a raw api payload should be passed to
+    LRUCache.put() instead.
+
+
+    Parameters
+    ----------
+    value :
+        The value to measure.
+
+    Returns
+    -------
+    size : int
+        The estimated size in bytes.
+
+    """
+
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+
+    return sys.getsizeof(value)
+
+
+#%% LRUCache
+class LRUCache:
+    """A thread safe least recently used cache, bounded by size in bytes.
+
+    Each entry is measured with estimate_size() when it is added.  Once the
+    entries exceed max_bytes the least recently used entries are evicted.  A
+    value larger than max_bytes is not cached.  Values are returned as they
+    were added, so they should not be modified by the caller.
+
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        The maximum size of the cached values in bytes. 0 disables the cache.
+        The default is 256 MiB.
+
+    Returns
+    -------
+    None.
+
+    Example
+    -------
+        cache = LRUCache(64 * 2 ** 20)
+        cache.put(("EUW1_5612017679", "champion_timeline", ()), ts_df)
+        ts_df = cache.get(("EUW1_5612017679", "champion_timeline", ()))
+        cache.invalidate(predicate=lambda key: key[0] == "EUW1_5612017679")
+
+    """
+
+    #%% __init__
+    def __init__(self, max_bytes: int = 256 * 2 ** 20):
+
+        self.max_bytes: int = max_bytes
+
+        self.__lock = threading.Lock()
+
+        # key -> (value, size), ordered from least to most recently used
+        self.__entries: OrderedDict = OrderedDict()
+        self.__bytes: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    #%% __len__
+    def __len__(self):
+
+        with self.__lock:
+            return len(self.__entries)
+
+    #%% __contains__
+    def __contains__(self, key):
+
+        with self.__lock:
+            return key in self.__entries
+
+    #%% get
+    def get(self, key, default=None):
+        """Returns a cached value, marking it as the most recently used.
+
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the value. For example, (match_id, builder, options).
+        default : optional
+            Returned when the key is not cached. The default is None.
+
+        Returns
+        -------
+        value :
+            The cached value, or default.
+
+        """
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[0]
+
+    #%% put
+    def put(self, key, value, size: int = None):
+        """Adds a value, evicting the least recently used values if required.
+
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the value. For example, (match_id, builder, options).
+        value :
+            The value to cache.
+        size : int, optional
+            The size of the value in bytes. If None is passed the size is
+            estimated with estimate_size(). The default is None.
+
+        Returns
+        -------
+        cached : bool
+            False if the value is larger than the cache.
+
+        """
+
+        if self.max_bytes <= 0:
+            return False
+
+        if size is None:
+            size = estimate_size(value)
+
+        with self.__lock:
+            self.__remove(key)
+
+            if size > self.max_bytes:
+                return False
+
+            self.__entries[key] = (value, size)
+            self.__bytes += size
+
+            while self.__bytes > self.max_bytes:
+                _, (_, evicted_size) = self.__entries.popitem(last=False)
+                self.__bytes -= evicted_size
+                self.evictions += 1
+
+        return True
+
+    #%% __remove
+    def __remove(self, key):
+
+        entry = self.__entries.pop(key, None)
+
+        if entry is not None:
+            self.__bytes -= entry[1]
+
+    #%% invalidate
+    def invalidate(self, key=None, predicate=None):
+        """Removes cached values.
+
+
+        Parameters
+        ----------
+        key : hashable, optional
+            The key to remove. The default is None.
+        predicate : callable, optional
+            Called with each key, the keys for which it returns True are
+            removed. For example, lambda key: key[0] == match_id. If neither
+            a key or predicate are passed all values are removed. The default
+            is None.
+
+        Returns
+        -------
+        removed : int
+            The number of values removed.
+
+        """
+
+        with self.__lock:
+            if key is not None:
+                keys = [key] if key in self.__entries else []
+            elif predicate is not None:
+                keys = [key for key in self.__entries if predicate(key)]
+            else:
+                keys = list(self.__entries)
+
+            for key in keys:
+                self.__remove(key)
+
+        return len(keys)
+
+    #%% stats
+    def stats(self):
+        """Returns the cache statistics.
+
+
+        Returns
+        -------
+        stats : dict
+            The number of hits, misses and evictions, the hit ratio, and the
+            number and size of the cached values.
+
+        """
+
+        with self.__lock:
+            lookups = self.hits + self.misses
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups > 0 else None,
+                "evictions": self.evictions,
+                "entries": len(self.__entries),
+                "bytes": self.__bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    #%% reset_stats
+    def reset_stats(self):
+        """Sets the hit, miss and eviction counts to zero.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        with self.__lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+
+    print("")
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 16:40:12 2026
+
+@author: Chris Bostock
+"""
+
+import os
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+# the width and height of the maps in game units
+MAP_SIZE: int = 14_750
+
+MAPS_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "maps")
+
+# map type -> minimap image
+MAPS: dict = {
+    "summoners rift": "summoners_rift_map_11.png",
+    "howling abyss": "howling_abyss_map_12.png",
+}
+
+#%% load_map_image
+@lru_cache(maxsize=None)
+def load_map_image(map_type: str = "summoners rift"):
+    """Returns the minimap image of a map.
+
+    The images are read from the maps folder within the package, so they are
+    found regardless of the working directory, and are only read once.
+
+
+    Parameters
+    ----------
+    map_type : str, optional
+        Minimap style: 'summoners rift' or 'howling abyss'. The default is
+        'summoners rift'.
+
+    Raises
+    ------
+    NameError
+        When the map type is not found.
+
+    Returns
+    -------
+    img : np.ndarray
+        The image, as returned by plt.imread(). The array is read only as it
+        is shared between calls.
+
+    """
+
+    if map_type not in MAPS:
+        raise NameError("map_type: {} not found".format(map_type))
+
+    img = plt.imread(os.path.join(MAPS_DIR, MAPS[map_type]))
+    img.setflags(write=False)
+
+    return img
+
+
+#%% get_positions
+def get_positions(df: pd.DataFrame):
+    """Extracts the x and y positions from a dataframe.
+
+    The positions are read from the position column, or from the position_x
+    and position_y columns of an exported or flattened dataframe.  Rows
+    without a position are dropped.
+
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        pd.DataFrame with a position column.
+
+    Returns
+    -------
+    x : np.ndarray
+        The x positions.
+    y : np.ndarray
+        The y positions.
+    index : pd.Index
+        The index of the rows with a position.
+
+    """
+
+    if "position_x" in df and "position_y" in df:
+        x = pd.to_numeric(df["position_x"]).to_numpy(dtype=float, na_value=np.nan)
+        y = pd.to_numeric(df["position_y"]).to_numpy(dtype=float, na_value=np.nan)
+    else:
+        positions = [
+            (position["x"], position["y"])
+            if isinstance(position, dict)
+            else (np.nan, np.nan)
+            for position in df["position"]
+        ]
+        xy = np.array(positions, dtype=float).reshape(-1, 2)
+        x, y = xy[:, 0], xy[:, 1]
+
+    mask = ~(np.isnan(x) | np.isnan(y))
+
+    return x[mask], y[mask], df.index[mask]
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+
+    print("")
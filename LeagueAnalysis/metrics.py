@@ -0,0 +1,531 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 20:03:15 2026
+
+@author: Chris Bostock
+"""
+
+import bisect
+import functools
+import logging
+import threading
+import time
+
+# upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS: tuple = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# metric name -> (type, help text)
+METRICS: dict = {
+    "riot_api_requests_total": (
+        "counter",
+        "Requests sent to riot's api, by endpoint and status code.",
+    ),
+    "riot_api_request_seconds": (
+        "histogram",
+        "Latency of requests sent to riot's api, by endpoint.",
+    ),
+    "riot_api_shared_requests_total": (
+        "counter",
+        "Requests which shared the response of an identical request in flight.",
+    ),
+    "league_db_lookups_total": (
+        "counter",
+        "Database lookups, by table and result (hit or miss).",
+    ),
+    "league_db_seconds": (
+        "histogram",
+        "Time spent within database lookups and inserts, by table and operation.",
+    ),
+    "league_analysis_builder_seconds": (
+        "histogram",
+        "Wall time of the LeagueAnalysis dataframe builders, by method and the "
+        "builder calling it.",
+    ),
+}
+
+#%% Metrics
+class Metrics:
+    """Counters and latency histograms for the api, the database and the builders.
+
+    RiotAPI, LeagueDB and LeagueAnalysis record into the Metrics object passed
+    to them, or one of their own, held as self.metrics.  Every observation is
+    also passed to the hooks which have been added, so the metrics can be
+    exported as they are recorded, for example with logging_hook().  The
+    object is thread safe.
+
+
+    Returns
+    -------
+    None.
+
+    Example
+    -------
+        lolA = LeagueAnalysis(api_key)
+        lolA.metrics.add_hook(logging_hook())
+        ...
+        print(lolA.metrics.to_prometheus())
+
+    """
+
+    #%% __init__
+    def __init__(self):
+
+        self.__lock = threading.Lock()
+
+        # (name, labels) -> value, where labels is a tuple of (label, value)
+        self.counters: dict = {}
+
+        # (name, labels) -> {"buckets": [count...], "sum": float, "count": int}
+        self.histograms: dict = {}
+
+        self.hooks: list = []
+
+    #%% add_hook
+    def add_hook(self, hook):
+        """Adds a function which is called with each observation.
+
+
+        Parameters
+        ----------
+        hook : callable
+            Called as hook(name, labels, value), where labels is a dictionary.
+            Exceptions raised by the hook are not caught.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.hooks.append(hook)
+
+    #%% remove_hook
+    def remove_hook(self, hook):
+        """Removes a hook added with self.add_hook().
+
+
+        Parameters
+        ----------
+        hook : callable
+            The hook to remove.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.hooks.remove(hook)
+
+    #%% __call_hooks
+    def __call_hooks(self, name: str, labels: dict, value: float):
+
+        for hook in self.hooks:
+            hook(name, labels, value)
+
+    #%% increment
+    def increment(self, name: str, value: float = 1, **labels):
+        """Adds to a counter.
+
+
+        Parameters
+        ----------
+        name : str
+            The metric name. For example, 'riot_api_requests_total'.
+        value : float, optional
+            The amount to add. The default is 1.
+        **labels :
+            The labels of the counter. For example, endpoint='match_summary'.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        key = (name, tuple(sorted(labels.items())))
+
+        with self.__lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+        self.__call_hooks(name, labels, value)
+
+    #%% observe
+    def observe(self, name: str, seconds: float, **labels):
+        """Adds a duration to a histogram.
+
+
+        Parameters
+        ----------
+        name : str
+            The metric name. For example, 'riot_api_request_seconds'.
+        seconds : float
+            The duration.
+        **labels :
+            The labels of the histogram. For example, endpoint='match_summary'.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        key = (name, tuple(sorted(labels.items())))
+
+        with self.__lock:
+            histogram = self.histograms.get(key)
+
+            if histogram is None:
+                histogram = {
+                    "buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+                self.histograms[key] = histogram
+
+            histogram["buckets"][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+
+        self.__call_hooks(name, labels, seconds)
+
+    #%% record_request
+    def record_request(self, endpoint: str, seconds: float, status_code: int):
+        """Records a request sent to riot's api.
+
+
+        Parameters
+        ----------
+        endpoint : str
+            The endpoint key which is stored within self.api_endpoints.
+        seconds : float
+            The time taken for the response.
+        status_code : int
+            The status code of the response, None for connection failures.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        status = "error" if status_code is None else str(status_code)
+
+        self.increment("riot_api_requests_total", endpoint=endpoint, status=status)
+        self.observe("riot_api_request_seconds", seconds, endpoint=endpoint)
+
+    #%% record_db
+    def record_db(self, table: str, operation: str, seconds: float, hit: bool = None):
+        """Records a database lookup or insert.
+
+
+        Parameters
+        ----------
+        table : str
+            The table name. For example, 'match_timeline'.
+        operation : str
+            'lookup' or 'insert'.
+        seconds : float
+            The time taken.
+        hit : bool, optional
+            For lookups, if the data was found. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if hit is not None:
+            self.increment(
+                "league_db_lookups_total", table=table, result="hit" if hit else "miss"
+            )
+
+        self.observe("league_db_seconds", seconds, table=table, operation=operation)
+
+    #%% record_builder
+    def record_builder(self, method: str, seconds: float, caller: str = ""):
+        """Records the wall time of a LeagueAnalysis builder.
+
+
+        Parameters
+        ----------
+        method : str
+            The method name. For example, 'create_event_timeline_dataframe'.
+        seconds : float
+            The wall time.
+        caller : str, optional
+            The name of the timed builder which called the method, or '' for
+            a top level call. Summing the top level calls does not count the
+            time of nested calls twice. The default is ''.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.observe(
+            "league_analysis_builder_seconds", seconds, method=method, caller=caller
+        )
+
+    #%% snapshot
+    def snapshot(self):
+        """Returns a copy of the metrics recorded so far.
+
+
+        Returns
+        -------
+        snapshot : dict
+            {'counters': [...], 'histograms': [...]}, where each item holds
+            the metric name, its labels and its values.
+
+        """
+
+        with self.__lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in self.counters.items()
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "buckets": dict(
+                        zip(LATENCY_BUCKETS + (float("inf"),), histogram["buckets"])
+                    ),
+                    "sum": histogram["sum"],
+                    "count": histogram["count"],
+                }
+                for (name, labels), histogram in self.histograms.items()
+            ]
+
+        return {"counters": counters, "histograms": histograms}
+
+    #%% reset
+    def reset(self):
+        """Removes all the metrics recorded so far.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        with self.__lock:
+            self.counters = {}
+            self.histograms = {}
+
+    #%% __format_labels
+    @staticmethod
+    def __format_labels(labels: dict):
+
+        if len(labels) == 0:
+            return ""
+
+        return "{{{}}}".format(
+            ",".join(
+                '{}="{}"'.format(
+                    label, str(value).replace("\\", "\\\\").replace('"', '\\"')
+                )
+                for label, value in labels.items()
+            )
+        )
+
+    #%% to_prometheus
+    def to_prometheus(self):
+        """Returns the metrics in the prometheus text exposition format.
+
+
+        Returns
+        -------
+        text : str
+
+        """
+
+        snapshot = self.snapshot()
+        lines: list = []
+
+        for name, (metric_type, help_text) in METRICS.items():
+            counters = [item for item in snapshot["counters"] if item["name"] == name]
+            histograms = [
+                item for item in snapshot["histograms"] if item["name"] == name
+            ]
+
+            if len(counters) + len(histograms) == 0:
+                continue
+
+            lines.append("# HELP {} {}".format(name, help_text))
+            lines.append("# TYPE {} {}".format(name, metric_type))
+
+            for item in counters:
+                lines.append(
+                    "{}{} {}".format(
+                        name, self.__format_labels(item["labels"]), item["value"]
+                    )
+                )
+
+            for item in histograms:
+                cumulative = 0
+
+                for bucket, count in item["buckets"].items():
+                    cumulative += count
+                    labels = {
+                        **item["labels"],
+                        "le": "+Inf" if bucket == float("inf") else repr(bucket),
+                    }
+                    lines.append(
+                        "{}_bucket{} {}".format(
+                            name, self.__format_labels(labels), cumulative
+                        )
+                    )
+
+                labels = self.__format_labels(item["labels"])
+                lines.append("{}_sum{} {}".format(name, labels, item["sum"]))
+                lines.append("{}_count{} {}".format(name, labels, item["count"]))
+
+        return "\n".join(lines) + "\n"
+
+
+#%% logging_hook
+def logging_hook(logger: logging.Logger = None, level: int = logging.DEBUG):
+    """Returns a hook which logs each observation.
+
+
+    Parameters
+    ----------
+    logger : logging.Logger, optional
+        The logger. If None is passed the 'LeagueAnalysis' logger is used.
+        The default is None.
+    level : int, optional
+        The logging level. The default is logging.DEBUG.
+
+    Returns
+    -------
+    hook : callable
+        To be passed to Metrics.add_hook().
+
+    """
+
+    if logger is None:
+        logger = logging.getLogger("LeagueAnalysis")
+
+    def hook(name: str, labels: dict, value: float):
+        logger.log(level, "%s %s %s", name, labels, value)
+
+    return hook
+
+
+# the timed builders running on each thread, as (metrics, method name)
+_builder_calls = threading.local()
+
+#%% _call_timed
+def _call_timed(metrics: Metrics, method, *args, **kwargs):
+    """Calls a builder, recording its wall time.
+
+    Builders called by another timed builder are recorded under their own
+    name, with the caller label set to the calling builder.  When metrics is
+    None the metrics of the calling builder are used, and the call is not
+    recorded if there is none.
+
+    """
+
+    calls = getattr(_builder_calls, "stack", None)
+
+    if calls is None:
+        calls = []
+        _builder_calls.stack = calls
+
+    if metrics is None:
+        if len(calls) == 0:
+            return method(*args, **kwargs)
+
+        metrics = calls[-1][0]
+
+    caller = calls[-1][1] if len(calls) > 0 else ""
+    calls.append((metrics, method.__name__))
+    start = time.perf_counter()
+
+    try:
+        return method(*args, **kwargs)
+    finally:
+        seconds = time.perf_counter() - start
+        calls.pop()
+        metrics.record_builder(method.__name__, seconds, caller=caller)
+
+
+#%% _TimedStaticMethod
+class _TimedStaticMethod:
+    """A static builder, timed within the metrics of the object it is called on.
+
+    When called on the class, for example within a worker process, the
+    metrics of the calling builder are used, if there is one.
+
+    """
+
+    def __init__(self, function):
+
+        self.function = function
+        functools.update_wrapper(self, function)
+
+    def __get__(self, instance, owner=None):
+
+        function = self.function
+        metrics = None if instance is None else instance.metrics
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            return _call_timed(metrics, function, *args, **kwargs)
+
+        return wrapper
+
+
+#%% timed_builder
+def timed_builder(method):
+    """Decorator recording the wall time of a builder within self.metrics.
+
+    Builders called by another timed builder are recorded under their own
+    name, with the caller label set to the calling builder, so the top level
+    calls can be summed without counting nested calls twice.  For static
+    builders place the decorator above @staticmethod.
+
+
+    Parameters
+    ----------
+    method : callable or staticmethod
+        The method to time.
+
+    Returns
+    -------
+    wrapper : callable
+
+    """
+
+    if isinstance(method, staticmethod):
+        return _TimedStaticMethod(method.__func__)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return _call_timed(self.metrics, method, self, *args, **kwargs)
+
+    return wrapper
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+
+    print("")
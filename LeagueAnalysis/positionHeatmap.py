@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 17:18:44 2026
+
+@author: Chris Bostock
+"""
+
+import json
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from mapAssets import MAP_SIZE, get_positions, load_map_image
+
+#%% PositionHeatmap
+class PositionHeatmap:
+    """The density of event positions over the map, accumulated across matches.
+
+    Positions are binned into a bins x bins grid covering the map with
+    np.histogram2d.  Events from new matches can be added to the grid at any
+    time, and a match is only counted once.
+
+
+    Parameters
+    ----------
+    bins : int, optional
+        The number of bins along each side of the map. The default is 100.
+    event_types : list, optional
+        The event types to count, for example ['CHAMPION_KILL']. If None is
+        passed all events with a position are counted. The default is None.
+    team_id : int, optional
+        The team to count, for example 100. If None is passed both teams are
+        counted. The default is None.
+    team_column : str, optional
+        The column holding the team of an event. For example, 'teamId_victim'
+        for deaths or 'teamId_killer' for kills. The default is 'teamId_info',
+        which is only filled for the events of a participant. A ValueError
+        is raised when the column is missing or holds no team for the events.
+
+    Returns
+    -------
+    None.
+
+    Example
+    -------
+        deaths = PositionHeatmap(event_types=["CHAMPION_KILL"], team_id=100,
+                                 team_column="teamId_victim")
+        deaths.add_events(events_df, match_id="EUW1_5612017679")
+        fig = deaths.render(sigma=1.5)
+
+    """
+
+    #%% __init__
+    def __init__(
+        self,
+        bins: int = 100,
+        event_types: list = None,
+        team_id: int = None,
+        team_column: str = "teamId_info",
+    ):
+
+        self.bins: int = bins
+        self.event_types: list = None if event_types is None else list(event_types)
+        self.team_id: int = team_id
+        self.team_column: str = team_column
+
+        self.edges: np.ndarray = np.linspace(0, MAP_SIZE, bins + 1)
+        self.grid: np.ndarray = np.zeros((bins, bins), dtype=np.float64)
+        self.match_ids: set = set()
+
+    #%% __filter_events
+    def __filter_events(self, df: pd.DataFrame):
+
+        mask = np.ones(len(df), dtype=bool)
+
+        if self.event_types is not None:
+            mask &= df["type"].isin(self.event_types).to_numpy()
+
+        if self.team_id is not None:
+            if self.team_column not in df:
+                raise ValueError(
+                    "team_column: {} not found, the team columns are: {}".format(
+                        self.team_column,
+                        [column for column in df.columns if "team" in column.lower()],
+                    )
+                )
+
+            teams = df[self.team_column]
+
+            if mask.any() and teams[mask].isna().all():
+                raise ValueError(
+                    "team_column: {} holds no team for the events, for kills use "
+                    "'teamId_killer' or 'teamId_victim'".format(self.team_column)
+                )
+
+            mask &= (teams == self.team_id).to_numpy()
+
+        return df[mask]
+
+    #%% __get_filters
+    def __get_filters(self):
+
+        return {
+            "event_types": None
+            if self.event_types is None
+            else sorted(self.event_types),
+            "team_id": self.team_id,
+            "team_column": None if self.team_id is None else self.team_column,
+        }
+
+    #%% add_positions
+    def add_positions(self, x: np.ndarray, y: np.ndarray):
+        """Adds positions to the grid.
+
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The x positions in game units.
+        y : np.ndarray
+            The y positions in game units.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        counts, _, _ = np.histogram2d(x, y, bins=[self.edges, self.edges])
+        self.grid += counts
+
+    #%% add_events
+    def add_events(self, df: pd.DataFrame, match_id: str = None):
+        """Adds the positions of the events within a dataframe to the grid.
+
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Events with a position column, for example from
+            create_event_timeline_dataframe(), or position_x and position_y
+            columns.
+        match_id : str, optional
+            The match the events belong to. Events for a match which has
+            already been added are skipped. The default is None.
+
+        Returns
+        -------
+        added : bool
+            False if the match had already been added.
+
+        """
+
+        if match_id is not None and match_id in self.match_ids:
+            return False
+
+        # the match is only recorded once its events have been binned, so a
+        # match whose events can not be filtered can be added again
+        x, y, _ = get_positions(self.__filter_events(df))
+        self.add_positions(x, y)
+
+        if match_id is not None:
+            self.match_ids.add(match_id)
+
+        return True
+
+    #%% merge
+    def merge(self, other):
+        """Adds the grid of another heatmap with the same bins to this grid.
+
+
+        Parameters
+        ----------
+        other : PositionHeatmap
+            The heatmap to be added.
+
+        Raises
+        ------
+        ValueError
+            When the number of bins or the filters differ, or a match has been
+            added to both.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if other.bins != self.bins:
+            raise ValueError("bins differ: {} and {}".format(self.bins, other.bins))
+
+        filters = self.__get_filters()
+        other_filters = other.__get_filters()
+
+        if filters != other_filters:
+            raise ValueError("filters differ: {} and {}".format(filters, other_filters))
+
+        if not other.match_ids.isdisjoint(self.match_ids):
+            raise ValueError("matches have been added to both heatmaps")
+
+        self.grid += other.grid
+        self.match_ids |= other.match_ids
+
+    #%% smoothed
+    def smoothed(self, sigma: float = None):
+        """Returns the grid with a gaussian blur applied.
+
+
+        Parameters
+        ----------
+        sigma : float, optional
+            The standard deviation of the gaussian in bins. If None or 0 is
+            passed the grid is returned unchanged. The default is None.
+
+        Returns
+        -------
+        grid : np.ndarray
+            The grid indexed [x bin, y bin].
+
+        """
+
+        if not sigma:
+            return self.grid.copy()
+
+        # bins further than bins - 1 away never overlap the grid
+        radius = min(int(np.ceil(3 * sigma)), self.bins - 1)
+        kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / sigma) ** 2)
+        kernel /= kernel.sum()
+
+        # the full convolution is trimmed to the grid, as mode='same' returns
+        # the length of the kernel when it is longer than the grid
+        def blur(values):
+            return np.convolve(values, kernel, mode="full")[radius : radius + self.bins]
+
+        # the gaussian is seperable, so the rows then the columns are blurred
+        grid = np.apply_along_axis(blur, 0, self.grid)
+        grid = np.apply_along_axis(blur, 1, grid)
+
+        return grid
+
+    #%% render
+    def render(
+        self,
+        sigma: float = None,
+        map_type: str = "summoners rift",
+        cmap: str = "inferno",
+        alpha: float = 0.7,
+        threshold: float = 0.05,
+        ax=None,
+    ):
+        """Plots the heatmap over the minimap.
+
+        Bins below the threshold are transparent, so the map shows through.
+
+
+        Parameters
+        ----------
+        sigma : float, optional
+            The gaussian blur in bins, see self.smoothed(). The default is None.
+        map_type : str, optional
+            Minimap style: 'summoners rift' or 'howling abyss'. The default
+            is 'summoners rift'.
+        cmap : str, optional
+            The matplotlib colour map. The default is 'inferno'.
+        alpha : float, optional
+            The opacity of the heatmap. The default is 0.7.
+        threshold : float, optional
+            Bins below this fraction of the highest bin are not drawn. The
+            default is 0.05.
+        ax : matplotlib axes, optional
+            The axes to plot on. If None is passed a new figure is created.
+            The default is None.
+
+        Returns
+        -------
+        fig : matplotlib figure.
+
+        """
+
+        if ax is None:
+            fig, ax = plt.subplots()
+        else:
+            fig = ax.figure
+
+        ax.imshow(load_map_image(map_type), extent=[0, MAP_SIZE, 0, MAP_SIZE])
+
+        grid = self.smoothed(sigma)
+
+        # the grid is indexed [x, y], images are drawn [row, column]
+        ax.imshow(
+            np.ma.masked_where(
+                (grid.T <= 0) | (grid.T < grid.max() * threshold), grid.T
+            ),
+            extent=[0, MAP_SIZE, 0, MAP_SIZE],
+            origin="lower",
+            cmap=cmap,
+            alpha=alpha,
+            interpolation="bilinear",
+        )
+        ax.set_xticks([])
+        ax.set_yticks([])
+
+        return fig
+
+    #%% save
+    def save(self, path: str):
+        """Saves the heatmap to a .npz file, so it can be added to later.
+
+
+        Parameters
+        ----------
+        path : str
+            The file path.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        np.savez_compressed(
+            path,
+            grid=self.grid,
+            match_ids=np.array(sorted(self.match_ids), dtype=str),
+            filters=np.array(
+                json.dumps(
+                    {
+                        "event_types": self.event_types,
+                        "team_id": self.team_id,
+                        "team_column": self.team_column,
+                    }
+                )
+            ),
+        )
+
+    #%% load
+    @classmethod
+    def load(cls, path: str):
+        """Loads a heatmap saved with self.save().
+
+
+        Parameters
+        ----------
+        path : str
+            The file path.
+
+        Returns
+        -------
+        heatmap : PositionHeatmap
+
+        """
+
+        with np.load(path) as data:
+            heatmap = cls(
+                bins=data["grid"].shape[0], **json.loads(str(data["filters"]))
+            )
+            heatmap.grid = data["grid"].copy()
+            heatmap.match_ids = set(data["match_ids"].tolist())
+
+        return heatmap
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+
+    print("")
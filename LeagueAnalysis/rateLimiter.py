@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 09:12:40 2026
+
+@author: Chris Bostock
+"""
+
+import threading
+import time
+
+#%% TokenBucket
+class TokenBucket:
+    """A bucket of requests which can be made within a rate limit window.
+
+    Riot's rate limits are fixed windows, which start with the first request
+    made within the window.  The bucket is therefore refilled in full once the
+    window has elapsed, rather than at a constant rate.
+
+
+    Parameters
+    ----------
+    limit : int
+        The number of requests allowed within the window.
+    window : float
+        The length of the window in seconds.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    #%% __init__
+    def __init__(self, limit: int, window: float):
+
+        self.limit: int = limit
+        self.window: float = window
+        self.tokens: int = limit
+
+        # monotonic time when the current window ends
+        self.reset_time: float = None
+
+    #%% __refill
+    def __refill(self, now: float):
+
+        if self.reset_time is not None and now >= self.reset_time:
+            self.tokens = self.limit
+            self.reset_time = None
+
+    #%% wait_time
+    def wait_time(self, now: float):
+        """Returns the number of seconds until a request can be made.
+
+
+        Parameters
+        ----------
+        now : float
+            The current monotonic time.
+
+        Returns
+        -------
+        wait : float
+            Zero if a token is available.
+
+        """
+
+        self.__refill(now)
+
+        if self.tokens > 0:
+            return 0.0
+
+        return self.reset_time - now
+
+    #%% consume
+    def consume(self, now: float):
+        """Takes a token from the bucket, starting the window if required.
+
+
+        Parameters
+        ----------
+        now : float
+            The current monotonic time.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.__refill(now)
+
+        if self.reset_time is None:
+            self.reset_time = now + self.window
+
+        self.tokens -= 1
+
+    #%% sync
+    def sync(self, count: int, now: float):
+        """Aligns the bucket with the count reported by riot.
+
+        The lower of the local and reported remaining requests is kept, so
+        requests which are still in flight and requests made elsewhere with the
+        same api key are both accounted for.
+
+
+        Parameters
+        ----------
+        count : int
+            The number of requests riot has counted within the window.
+        now : float
+            The current monotonic time.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        self.__refill(now)
+
+        if self.reset_time is None:
+            self.reset_time = now + self.window
+
+        self.tokens = min(self.tokens, self.limit - count)
+
+
+#%% RateLimiter
+class RateLimiter:
+    """Schedules requests to stay within riot's application and method rate limits.
+
+    The limits are read from the X-App-Rate-Limit and X-Method-Rate-Limit
+    headers, and the current usage from their -Count companions.  Application
+    limits are held per routing host, and method limits per routing host and
+    endpoint key.  Until a response has been received for a host or endpoint
+    no limit is applied.
+
+    The object is thread safe, so a single RateLimiter can be shared between
+    threads and RiotAPI objects using the same api key.
+
+
+    Returns
+    -------
+    None.
+
+    """
+
+    #%% __init__
+    def __init__(self):
+
+        self.__lock = threading.Lock()
+
+        # host -> {window: TokenBucket}
+        self.app_buckets: dict = {}
+
+        # (host, endpoint) -> {window: TokenBucket}
+        self.method_buckets: dict = {}
+
+    #%% __parse_header
+    @staticmethod
+    def __parse_header(header: str):
+        """Parses a rate limit header, such as '20:1,100:120'.
+
+
+        Parameters
+        ----------
+        header : str
+            The header value, made up of comma seperated value:window pairs.
+
+        Returns
+        -------
+        parsed : dict
+            The values keyed by the window in seconds.
+
+        """
+
+        parsed: dict = {}
+
+        if header is None:
+            return parsed
+
+        for item in header.split(","):
+            value, window = item.strip().split(":")
+            parsed[int(window)] = int(value)
+
+        return parsed
+
+    #%% __update_buckets
+    def __update_buckets(
+        self, buckets: dict, limit_header: str, count_header: str, now: float
+    ):
+        """Updates a set of buckets from a limit header and its count header.
+
+
+        Parameters
+        ----------
+        buckets : dict
+            The existing buckets, keyed by window.
+        limit_header : str
+            The rate limit header value.
+        count_header : str
+            The rate limit count header value.
+        now : float
+            The current monotonic time.
+
+        Returns
+        -------
+        buckets : dict
+            The updated buckets.
+
+        """
+
+        limits = self.__parse_header(limit_header)
+        counts = self.__parse_header(count_header)
+
+        if len(limits) == 0:
+            return buckets
+
+        updated: dict = {}
+
+        for window, limit in limits.items():
+            bucket = buckets.get(window)
+
+            if bucket is None or bucket.limit != limit:
+                bucket = TokenBucket(limit, window)
+
+            if window in counts:
+                bucket.sync(counts[window], now)
+
+            updated[window] = bucket
+
+        return updated
+
+    #%% acquire
+    def acquire(self, host: str, endpoint: str):
+        """Blocks until a request can be made to the host and endpoint.
+
+
+        Parameters
+        ----------
+        host : str
+            The routing host, for example self.api_details['regionalRouting'].
+        endpoint : str
+            The endpoint key which is stored within self.api_endpoints.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+
+                buckets = list(self.app_buckets.get(host, {}).values())
+                buckets += list(self.method_buckets.get((host, endpoint), {}).values())
+
+                wait = max([bucket.wait_time(now) for bucket in buckets], default=0.0)
+
+                if wait <= 0:
+                    for bucket in buckets:
+                        bucket.consume(now)
+                    return
+
+            time.sleep(wait)
+
+    #%% update
+    def update(self, host: str, endpoint: str, headers: dict):
+        """Updates the limits and usage from the headers of a response.
+
+
+        Parameters
+        ----------
+        host : str
+            The routing host the request was sent to.
+        endpoint : str
+            The endpoint key which is stored within self.api_endpoints.
+        headers : dict
+            The response headers.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        with self.__lock:
+            now = time.monotonic()
+
+            self.app_buckets[host] = self.__update_buckets(
+                self.app_buckets.get(host, {}),
+                headers.get("X-App-Rate-Limit"),
+                headers.get("X-App-Rate-Limit-Count"),
+                now,
+            )
+
+            self.method_buckets[(host, endpoint)] = self.__update_buckets(
+                self.method_buckets.get((host, endpoint), {}),
+                headers.get("X-Method-Rate-Limit"),
+                headers.get("X-Method-Rate-Limit-Count"),
+                now,
+            )
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+    print("main")
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 10:02:17 2026
+
+@author: Chris Bostock
+"""
+
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+#%% RetryPolicy
+class RetryPolicy:
+    """Decides if and when a failed request should be retried.
+
+    Rate limited (429) and server side (5xx) failures are treated as transient
+    and retried with a jittered exponential backoff, or after the Retry-After
+    header when riot provides one.  All other failures, such as an incorrect
+    api key or missing data, are permanent and are not retried.
+
+
+    Parameters
+    ----------
+    max_retries : int, optional
+        The maximum number of retries for a single request. The default is 5.
+    backoff_base : float, optional
+        The backoff in seconds before the first retry. The backoff is doubled
+        for each following retry. The default is 1.0.
+    backoff_max : float, optional
+        The upper limit of a single backoff in seconds. The default is 60.0.
+    retry_budget : float, optional
+        The total number of seconds a single request may spend waiting to be
+        retried. The default is 300.0.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    retryable_status_codes: set = {429, 500, 502, 503, 504}
+
+    #%% __init__
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        retry_budget: float = 300.0,
+    ):
+
+        self.max_retries: int = max_retries
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.retry_budget: float = retry_budget
+
+    #%% __parse_retry_after
+    @staticmethod
+    def __parse_retry_after(retry_after: str):
+        """Converts a Retry-After header into seconds.
+
+
+        Parameters
+        ----------
+        retry_after : str
+            The header value, either a number of seconds or a http date.
+
+        Returns
+        -------
+        seconds : float
+            The number of seconds to wait, or None if it can not be read.
+
+        """
+
+        if retry_after is None:
+            return None
+
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+
+        try:
+            retry_date = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+
+        return max((retry_date - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    #%% is_retryable
+    def is_retryable(self, status_code: int):
+        """Returns True when the status code is a transient failure.
+
+
+        Parameters
+        ----------
+        status_code : int
+            The status code of the response. None is used for connection
+            failures, which are also retried.
+
+        Returns
+        -------
+        bool
+
+        """
+
+        return status_code is None or status_code in self.retryable_status_codes
+
+    #%% get_delay
+    def get_delay(self, attempt: int, retry_after: str = None):
+        """Returns the number of seconds to wait before the next attempt.
+
+
+        Parameters
+        ----------
+        attempt : int
+            The number of retries already made for the request.
+        retry_after : str, optional
+            The Retry-After header of the response. The default is None.
+
+        Returns
+        -------
+        delay : float
+            The number of seconds to wait.
+
+        """
+
+        delay = self.__parse_retry_after(retry_after)
+
+        if delay is None:
+            # full jitter, spreading retries from concurrent requests apart
+            ceiling = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+            delay = random.uniform(0, ceiling)
+
+        return delay
+
+    #%% should_retry
+    def should_retry(self, status_code: int, attempt: int, waited: float, delay: float):
+        """Returns True if the request should be retried after the delay.
+
+
+        Parameters
+        ----------
+        status_code : int
+            The status code of the response, None for connection failures.
+        attempt : int
+            The number of retries already made for the request.
+        waited : float
+            The number of seconds already spent waiting for retries.
+        delay : float
+            The number of seconds until the next attempt.
+
+        Returns
+        -------
+        bool
+
+        """
+
+        return (
+            self.is_retryable(status_code)
+            and attempt < self.max_retries
+            and waited + delay <= self.retry_budget
+        )
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+    print("main")
@@ -5,9 +5,45 @@ Created on Tue Dec 14 10:15:32 2021
 @author: Chris Bostock
 """
 
+import os
+import threading
+import time
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from db.LeagueDB import LeagueDB
+from rateLimiter import RateLimiter
+from retryPolicy import RetryPolicy
+from metrics import Metrics
+from singleFlight import SingleFlight
+from lruCache import LRUCache
+from identityResolver import IdentityResolver
+
+#%% RiotAPIError
+class RiotAPIError(Exception):
+    """Raised when riot's api returns an unsuccessful response.
+
+
+    Parameters
+    ----------
+    message : str
+        Description of the failure.
+    status_code : int, optional
+        The status code of the response. None when no response was received.
+        The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    def __init__(self, message: str, status_code: int = None):
+
+        super().__init__(message)
+        self.status_code: int = status_code
+
 
 #%% riotAPI Class
 
@@ -40,6 +76,32 @@ class RiotAPI(LeagueDB):
         of loldb will be used.. The default is None.
     contsolePrintOut : bool, optional
         Prints out any interation with the db to the console. The default is False.
+    pool_size : int, optional
+        The maximum number of keep-alive connections held for each api host.
+        The default is 10.
+    db_storage : str, optional
+        The database storage backend: 'tinydb' or 'sqlite'. The default is 'tinydb'.
+    db_compression : str, optional
+        The codec used to compress stored match timelines and summaries:
+        'zlib' or 'lzma'. The default is None.
+    db_write_cache_size : int, optional
+        The number of database writes buffered before they are written to
+        file. The default is 1.
+    metrics : Metrics, optional
+        Records the requests, latency and status codes of each endpoint, and
+        the database lookups and inserts. If None is passed a new Metrics
+        object is used, held as self.metrics. The default is None.
+    cache_size : int, optional
+        The maximum size in bytes of the in memory cache of match payloads
+        and dataframes, held as self.cache. Payloads are measured by the
+        length of their JSON. 0 disables the cache. The default is 256 MiB.
+    identity_ttl : float, optional
+        The number of seconds the id, puuid and account id of a summoner are
+        held in memory for, see self.identities. The default is 3600.
+    request_timeout : float or tuple, optional
+        The connect and read timeouts of each request in seconds. Requests
+        which time out are retried according to self.retry_policy. The
+        default is (3.05, 30).
 
 
     Returns
@@ -58,11 +120,29 @@ class RiotAPI(LeagueDB):
         db_saving: bool = True,
         db_name: str = None,
         contsole_print_out: bool = False,
+        pool_size: int = 10,
+        db_storage: str = "tinydb",
+        db_compression: str = None,
+        db_write_cache_size: int = 1,
+        metrics: Metrics = None,
+        cache_size: int = 256 * 2 ** 20,
+        identity_ttl: float = 3600.0,
+        request_timeout: tuple = (3.05, 30),
     ):
 
+        # instrumentation
+        self.metrics: Metrics = Metrics() if metrics is None else metrics
+
         # cachine database
         if db_saving:
-            super().__init__(db_name=db_name, contsole_print_out=contsole_print_out)
+            super().__init__(
+                db_name=db_name,
+                contsole_print_out=contsole_print_out,
+                storage=db_storage,
+                compression=db_compression,
+                write_cache_size=db_write_cache_size,
+                metrics=self.metrics,
+            )
             self.db_savingActive = True
         else:
             self.db_savingActive = False
@@ -79,19 +159,71 @@ class RiotAPI(LeagueDB):
         # headers
         self.header: dict = {"X-Riot-Token": api_key}
 
+        # rate limit scheduler
+        self.rate_limiter = RateLimiter()
+
+        # retries for transient failures
+        self.retry_policy = RetryPolicy()
+
+        # concurrent identical requests share a single request
+        self.single_flight = SingleFlight()
+
+        # pooled http sessions, one per api host
+        self.pool_size: int = pool_size
+        self.request_timeout: tuple = request_timeout
+        self.sessions: dict = {}
+        self.__sessions_lock = threading.Lock()
+
         # endpoints
         self.api_endpoints: dict = {}
         self.__setup_endpoints()
 
-        # responses:
-        self.response: dict = {}
+        # match payloads and dataframes, keyed by (match_id, builder, options)
+        self.cache = LRUCache(cache_size)
+
+        # summoner name / puuid -> id, puuid and account id
+        self.identities = IdentityResolver(identity_ttl)
 
-        # champ list
+        # champ list, loaded on first use
         self.ddragon_version: str = ddragon
-        self.champion_list: dict = {}
+        self.__champion_df: pd.DataFrame = None
+        self.__champion_names: dict = None
 
-        # get champ list
-        self.get_champ_details()
+    #%% __enter__
+    def __enter__(self):
+        return self
+
+    #%% __exit__
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    #%% close
+    def close(self):
+        """Closes the pooled http sessions, and the database if enabled.
+
+        The object can also be used as a context manager, in which case the
+        sessions and database are closed on exit.
+
+
+        Returns
+        -------
+        None.
+
+        Example
+        -------
+            with LeagueAnalysis(api_key) as lolA:
+                df = lolA.create_mastery_table()
+
+        """
+
+        with self.__sessions_lock:
+            for session in self.sessions.values():
+                session.close()
+
+            self.sessions = {}
+
+        if self.db_savingActive:
+            super().close()
 
     #%% __validate_summoner_name
     def __validate_summoner_name(self, summoner_name: str):
@@ -122,15 +254,61 @@ class RiotAPI(LeagueDB):
 
         return summoner_name
 
-    #%% __initalise_cache
-    def __initalise_cache(self, summoner_name: str):
-        """Initalise a key within the response property for the given summoner name
+    #%% invalidate_cache
+    def invalidate_cache(self, match_id: str = None):
+        """Removes cached match payloads and dataframes from self.cache.
 
 
         Parameters
         ----------
-        summoner_name : str
-            Summoner Name to initalise
+        match_id : str, optional
+            The match id to remove. If None is passed the whole cache is
+            cleared. The default is None.
+
+        Returns
+        -------
+        removed : int
+            The number of cached values removed.
+
+        """
+
+        if match_id is None:
+            return self.cache.invalidate()
+
+        return self.cache.invalidate(predicate=lambda key: key[0] == match_id)
+
+    #%% __invalidate_stored
+    def __invalidate_stored(self, tbl_name: str, key_values):
+        """Removes the cached payloads and dataframes of stored match data.
+
+
+        Parameters
+        ----------
+        tbl_name : str
+            The table the data was stored within.
+        key_values : iterable
+            The match ids which were stored.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if tbl_name not in ("match_summary", "match_timeline"):
+            return
+
+        match_ids = set(key_values)
+
+        if len(match_ids) > 0:
+            self.cache.invalidate(predicate=lambda key: key[0] in match_ids)
+
+    #%% drop_champ_list_table
+    def drop_champ_list_table(self):
+        """Drops the champ list table and clears self.cache.
+
+        See LeagueDB.drop_champ_list_table.
+
 
         Returns
         -------
@@ -138,9 +316,113 @@ class RiotAPI(LeagueDB):
 
         """
 
-        # create caching area
-        if summoner_name not in self.response:
-            self.response[summoner_name] = {}
+        super().drop_champ_list_table()
+        self.cache.invalidate()
+
+    #%% drop_match_summary_table
+    def drop_match_summary_table(self):
+        """Drops the match summary table and clears self.cache.
+
+        See LeagueDB.drop_match_summary_table.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        super().drop_match_summary_table()
+        self.cache.invalidate()
+
+    #%% drop_summoner_info_table
+    def drop_summoner_info_table(self):
+        """Drops the summoner tables and clears self.identities.
+
+        See LeagueDB.drop_summoner_info_table.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        super().drop_summoner_info_table()
+        self.identities.invalidate()
+
+    #%% drop_timeline_table
+    def drop_timeline_table(self):
+        """Drops the match timeline table and clears self.cache.
+
+        See LeagueDB.drop_timeline_table.
+
+
+        Returns
+        -------
+        None.
+
+        """
+
+        super().drop_timeline_table()
+        self.cache.invalidate()
+
+    #%% insert_data
+    def insert_data(self, tbl_name: str, key: str, key_value: str, data: dict):
+        """Stores data, removing the cached data of the match.
+
+        See LeagueDB.insert_data.
+
+
+        Returns
+        -------
+        successful : bool
+            If successful method returns True.
+
+        """
+
+        successful = super().insert_data(tbl_name, key, key_value, data)
+        self.__invalidate_stored(tbl_name, [key_value])
+
+        return successful
+
+    #%% update_stored_data
+    def update_stored_data(self, tbl_name: str, key: str, key_value: str, data: dict):
+        """Replaces stored data, removing the cached data of the match.
+
+        See LeagueDB.update_stored_data.
+
+
+        Returns
+        -------
+        successful : bool
+            If successful method returns True.
+
+        """
+
+        successful = super().update_stored_data(tbl_name, key, key_value, data)
+        self.__invalidate_stored(tbl_name, [key_value])
+
+        return successful
+
+    #%% insert_data_batch
+    def insert_data_batch(self, tbl_name: str, key: str, data: dict):
+        """Stores many entries, removing the cached data of the matches.
+
+        See LeagueDB.insert_data_batch.
+
+
+        Returns
+        -------
+        inserted : list
+            The key values of the entries added to the db.
+
+        """
+
+        inserted = super().insert_data_batch(tbl_name, key, data)
+        self.__invalidate_stored(tbl_name, inserted)
+
+        return inserted
 
     #%% __setup_api_details
     def __setup_api_details(self):
@@ -215,6 +497,12 @@ class RiotAPI(LeagueDB):
         ]: str = "/lol/summoner/v4/summoners/by-name/{}"
         self.api_endpoints["summoner-by-name"]["parameter"]: str = "Summoner Name"
 
+        self.api_endpoints["summoner-by-puuid"]: dict = {}
+        self.api_endpoints["summoner-by-puuid"][
+            "url"
+        ]: str = "/lol/summoner/v4/summoners/by-puuid/{}"
+        self.api_endpoints["summoner-by-puuid"]["parameter"]: str = "puid"
+
         self.api_endpoints["champ-mast-by-name"]: dict = {}
         self.api_endpoints["champ-mast-by-name"][
             "url"
@@ -243,7 +531,7 @@ class RiotAPI(LeagueDB):
 
     #%% __make_url
     def __make_url(
-        self, endpoint_key: str, summoner_name: str, regional_routing: bool = False
+        self, endpoint_key: str, identity: dict, regional_routing: bool = False
     ):
         """Generates the appropriate url
 
@@ -252,8 +540,9 @@ class RiotAPI(LeagueDB):
         ----------
         endpoint_key : str
             endpoint key which is stored within self.api_endpoints.
-        summoner_name : str
-            Summoner name for the api endpoint.
+        identity : dict
+            The summoner's id, puuid, accountId and name, as returned by
+            self.resolve_summoner().
         regional_routing : bool, optional
             If the regional url is required. The default is False.
 
@@ -264,15 +553,6 @@ class RiotAPI(LeagueDB):
 
         """
 
-        # check to make sure we have summoner details
-        summoner_datails = self.get_stored_data(
-            "summoner_names", "account_name", summoner_name
-        )
-
-        # if we don't go and get it
-        if summoner_datails is None:
-            summoner_datails = self.get_summoner_by_name(summoner_name)
-
         # regional routing..
         if regional_routing:
             url: str = "{}{}".format(
@@ -286,13 +566,13 @@ class RiotAPI(LeagueDB):
 
         # endpoint selection
         if self.api_endpoints[endpoint_key]["parameter"] == "Summoner Name":
-            url: str = url.format(summoner_name)
+            url: str = url.format(identity["name"])
 
         elif self.api_endpoints[endpoint_key]["parameter"] == "id":
-            url: str = url.format(summoner_datails["details"]["id"])
+            url: str = url.format(identity["id"])
 
         elif self.api_endpoints[endpoint_key]["parameter"] == "puid":
-            url: str = url.format(summoner_datails["details"]["puuid"])
+            url: str = url.format(identity["puuid"])
 
         return url
 
@@ -345,18 +625,150 @@ class RiotAPI(LeagueDB):
         """
 
         if "status" in response and "status_code" in response["status"]:
-            raise Exception(
-                "Error: {} API key incorrect or expired.".format(
-                    response["status"]["status_code"]
-                )
+            raise RiotAPIError(
+                "Error: {} {}".format(
+                    response["status"]["status_code"],
+                    response["status"].get("message", ""),
+                ),
+                response["status"]["status_code"],
             )
 
+    #%% __get_session
+    def __get_session(self, host: str):
+        """Returns the pooled session for a host, creating it if required.
+
+        The riot token header is attached to the session when it is created.
+
+
+        Parameters
+        ----------
+        host : str
+            The api host, for example self.api_details['url'].
+
+        Returns
+        -------
+        session : requests.Session
+            The session for the host.
+
+        """
+
+        with self.__sessions_lock:
+            session = self.sessions.get(host)
+
+            if session is None:
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+
+                session = requests.Session()
+                session.headers.update(self.header)
+                session.mount(host, adapter)
+
+                self.sessions[host] = session
+
+        return session
+
+    #%% __send_request
+    def __send_request(
+        self, endpoint: str, url: str, regional_routing: bool, params: dict = None
+    ):
+        """Sends a request once the rate limits allow it.
+
+        All requests to riot's api endpoints go through this method so the
+        rate limiter sees every request and response.  Transient failures
+        (429, 5xx and connection errors) are retried according to
+        self.retry_policy.
+
+
+        Parameters
+        ----------
+        endpoint : str
+            Endpoint key which the request is targeting.
+        url : str
+            The generated url.
+        regional_routing : bool
+            If the url is for the regional routing host.
+        params : dict, optional
+            Query string parameters. The default is None.
+
+        Raises
+        ------
+        RiotAPIError
+            A permanent failure, or a transient failure which has used up the
+            retries allowed by self.retry_policy.
+
+        Returns
+        -------
+        response : requests.Response
+            The response from the api.
+
+        """
+
+        if regional_routing:
+            host: str = self.api_details["regionalRouting"]
+        else:
+            host: str = self.api_details["url"]
+
+        attempt: int = 0
+        waited: float = 0.0
+
+        while True:
+            self.rate_limiter.acquire(host, endpoint)
+
+            retry_after = None
+            start = time.perf_counter()
+
+            try:
+                response = self.__get_session(host).get(
+                    url, params=params, timeout=self.request_timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                status_code = None
+                reason = str(e)
+                self.metrics.record_request(
+                    endpoint, time.perf_counter() - start, status_code
+                )
+            else:
+                self.metrics.record_request(
+                    endpoint, time.perf_counter() - start, response.status_code
+                )
+                self.rate_limiter.update(host, endpoint, response.headers)
+
+                if response.ok:
+                    return response
+
+                status_code = response.status_code
+                reason = response.reason
+                retry_after = response.headers.get("Retry-After")
+
+            delay = self.retry_policy.get_delay(attempt, retry_after)
+
+            if not self.retry_policy.should_retry(status_code, attempt, waited, delay):
+                raise RiotAPIError(
+                    "{} :: failed :: Error: {} {}".format(
+                        endpoint, status_code, reason
+                    ),
+                    status_code,
+                )
+
+            time.sleep(delay)
+
+            waited += delay
+            attempt += 1
+
     #%% __get_summmoner_data
     def __get_summmoner_data(
-        self, endpoint: str, summoner_name: str, regional_routing: bool = False
+        self,
+        endpoint: str,
+        summoner_name: str,
+        regional_routing: bool = False,
+        params: dict = None,
+        puuid: str = None,
     ):
         """Obtain Summoner Data.
 
+        If the endpoint responds with a 404 the summoner's identity is
+        resolved again, in case it is out of date, and the request is retried
+        if the identity has changed.
+
 
         Parameters
         ----------
@@ -366,6 +778,11 @@ class RiotAPI(LeagueDB):
             Summoner Name.
         regional_routing : bool, optional
             If regional routing is required. The default is False.
+        params : dict, optional
+            Query string parameters. The default is None.
+        puuid : str, optional
+            The summoner's puuid, used in place of the summoner name. The
+            default is None.
 
         Raises
         ------
@@ -379,22 +796,51 @@ class RiotAPI(LeagueDB):
 
         """
 
-        if endpoint == "summoner-by-name":
+        params_key = tuple(sorted((params or {}).items()))
+
+        if endpoint in ("summoner-by-name", "summoner-by-puuid"):
+            summoner_key = summoner_name if puuid is None else puuid
             url: str = "{}{}".format(
-                self.api_details["url"], self.api_endpoints["summoner-by-name"]["url"]
+                self.api_details["url"], self.api_endpoints[endpoint]["url"]
+            )
+            url: str = url.format(summoner_key)
+
+            return self.__request_once(
+                (endpoint, summoner_key, params_key),
+                endpoint,
+                url,
+                regional_routing,
+                params,
             )
-            url: str = url.format(summoner_name)
-        else:
-            url: str = self.__make_url(endpoint, summoner_name, regional_routing)
 
-        try:
-            response = requests.get(url, headers=self.header)
-            result = response.json()
-            self.__response_checker(result)
-        except Exception as e:
-            raise Exception("{} :: failed :: {}".format(endpoint, e))
+        identity = self.resolve_summoner(summoner_name, puuid=puuid)
 
-        return result
+        try:
+            return self.__request_once(
+                (endpoint, identity["puuid"], params_key),
+                endpoint,
+                self.__make_url(endpoint, identity, regional_routing),
+                regional_routing,
+                params,
+            )
+        except RiotAPIError as e:
+            # a 404 from the live game endpoint means no game is in progress
+            if e.status_code != 404 or endpoint == "curr-game-by-summoner":
+                raise
+
+            # the identity may be out of date, for example after a rename
+            refreshed = self.resolve_summoner(summoner_name, puuid=puuid, refresh=True)
+
+            if refreshed == identity:
+                raise
+
+        return self.__request_once(
+            (endpoint, refreshed["puuid"], params_key),
+            endpoint,
+            self.__make_url(endpoint, refreshed, regional_routing),
+            regional_routing,
+            params,
+        )
 
     #%% __get_match_id_data
     def __get_match_id_data(self, endpoint: str, match_id: str):
@@ -417,27 +863,138 @@ class RiotAPI(LeagueDB):
         -------
         result : dict
             The response within in a dictionary.
+        size : int
+            The length of the response body in bytes.
 
         """
 
         url: str = self.__make_match_url(endpoint, match_id)
 
-        try:
-            response = requests.get(url, headers=self.header)
-            result = response.json()
-            self.__response_checker(result)
-        except Exception as e:
-            raise Exception("{} :: failed :: {}".format(endpoint, e))
+        return self.__request_once(
+            (endpoint, match_id), endpoint, url, True, with_size=True
+        )
+
+    #%% __request_once
+    def __request_once(
+        self,
+        key: tuple,
+        endpoint: str,
+        url: str,
+        regional_routing: bool,
+        params: dict = None,
+        with_size: bool = False,
+    ):
+        """Requests a url, sharing the request with other threads using the key.
+
+        Threads requesting the same key at the same time, for example the same
+        match id, wait for a single request and share its result, see
+        self.single_flight.
+
+
+        Parameters
+        ----------
+        key : tuple
+            The request key, for example (endpoint, match_id).
+        endpoint : str
+            Endpoint key which the method is targeting.
+        url : str
+            The generated url.
+        regional_routing : bool
+            If the url is for the regional routing host.
+        params : dict, optional
+            Query string parameters. The default is None.
+        with_size : bool, optional
+            If the length of the response body is also returned, as
+            (result, size). The default is False.
+
+        Raises
+        ------
+        Exception
+            API failure.
+
+        Returns
+        -------
+        result : dict
+            The response within in a dictionary.
+
+        """
+
+        def request():
+            try:
+                response = self.__send_request(endpoint, url, regional_routing, params)
+                result = response.json()
+                self.__response_checker(result)
+            except RiotAPIError:
+                raise
+            except Exception as e:
+                raise Exception("{} :: failed :: {}".format(endpoint, e))
+
+            if with_size:
+                return result, len(response.content)
+
+            return result
+
+        result, shared = self.single_flight.do(key, request)
+
+        if shared:
+            self.metrics.increment("riot_api_shared_requests_total", endpoint=endpoint)
 
         return result
 
+    #%% champion_list
+    @property
+    def champion_list(self):
+        """The data dragon champion data, {'df': self.champion_df}."""
+
+        return {"df": self.champion_df}
+
+    #%% champion_df
+    @property
+    def champion_df(self):
+        """The data dragon champion data, loaded on first use."""
+
+        if self.__champion_df is None:
+            self.get_champ_details()
+
+        return self.__champion_df
+
+    #%% champion_names
+    @property
+    def champion_names(self):
+        """The champion name for each champion id. For example, {157: 'Yasuo'}."""
+
+        if self.__champion_names is None:
+            self.get_champ_details()
+
+        return self.__champion_names
+
+    #%% __champ_cache_path
+    def __champ_cache_path(self):
+        """Returns the path of the champion file for the data dragon version.
+
+        The file is stored next to the database. None is returned when the
+        database is not being used.
+
+        """
+
+        if not self.db_savingActive:
+            return None
+
+        return "{}-ddragon-{}.pkl".format(self.db_prefix, self.ddragon_version)
+
     #%% get_champ_details
     def get_champ_details(self):
         """Retreives the data dragon data via riot's api.
 
-        The information is also cached within a dictionary as an object
-        property: self.champion_list.  A DataFrame object is also created within
-        this property (self.champion_list['df']) for later use.
+        The champion data is loaded on first use, from the first of:
+
+            - the per version champion file, ***-ddragon-<version>.pkl
+            - the champ_list table within the db
+            - data dragon, after which it is stored within the db
+
+        and the champion file is written if it did not exist.  The DataFrame is
+        held as self.champion_df, and self.champion_names maps each champion
+        id to its name.
 
 
         Raises
@@ -451,59 +1008,73 @@ class RiotAPI(LeagueDB):
             Champion.json from data dragon formatted to be a pd.DataFrame.
 
         """
-        champ_list = None
 
-        if self.db_savingActive:
-            champ_list = self.get_stored_data(
-                "champ_list", "ddragon", self.ddragon_version
-            )
+        if self.__champion_df is not None:
+            return self.__champion_df
 
-        # if we have stored data:
-        if champ_list is not None:
-            self.champion_list["df"] = pd.DataFrame.from_dict(
-                champ_list["details"], orient="index"
-            )
+        cache_path = self.__champ_cache_path()
+        champ_df = None
 
-        # if we don't go and get it
-        else:
-            url: str = "https://ddragon.leagueoflegends.com/cdn/{}/data/en_GB/champion.json".format(
-                self.ddragon_version
-            )
+        if cache_path is not None and os.path.exists(cache_path):
+            try:
+                champ_df = pd.read_pickle(cache_path)
+            except Exception as e:
+                print("{} :: unable to read :: {}".format(cache_path, e))
+
+        if champ_df is None:
+            champ_list = None
+
+            if self.db_savingActive:
+                champ_list = self.get_stored_data(
+                    "champ_list", "ddragon", self.ddragon_version
+                )
+
+            # if we have stored data:
+            if champ_list is not None:
+                champ_data = champ_list["details"]
+
+            # if we don't go and get it
+            else:
+                url: str = "https://ddragon.leagueoflegends.com/cdn/{}/data/en_GB/champion.json".format(
+                    self.ddragon_version
+                )
 
-            # check to see if the champ list dict is empty
-            if len(self.champion_list) == 0:
                 try:
-                    response = requests.get(url)
-                    self.champion_list = response.json()
-                    self.__response_checker(self.champion_list)
+                    response = requests.get(url, timeout=self.request_timeout)
+                    response_json = response.json()
+                    self.__response_checker(response_json)
+                    champ_data = response_json["data"]
                 except Exception as e:
                     raise Exception("get_champ_details :: failed :: {}".format(e))
 
-            if self.champion_list is not None:
-                self.champion_list["df"] = pd.DataFrame.from_dict(
-                    self.champion_list["data"], orient="index"
-                )
-            else:
-                self.champion_list["df"] = None
+                # update lolbd
+                if self.db_savingActive:
+                    self.insert_data(
+                        "champ_list", "ddragon", self.ddragon_version, champ_data
+                    )
 
-            # update lolbd
-            if self.db_savingActive:
-                self.insert_data(
-                    "champ_list",
-                    "ddragon",
-                    self.ddragon_version,
-                    self.champion_list["data"],
-                )
+            champ_df = pd.DataFrame.from_dict(champ_data, orient="index")
 
-        return self.champion_list["df"]
+            # compact per version file, written then renamed so it is never partial
+            if cache_path is not None:
+                champ_df.to_pickle(cache_path + ".tmp")
+                os.replace(cache_path + ".tmp", cache_path)
+
+        self.__champion_names = dict(
+            zip(champ_df["key"].astype("int64"), champ_df["name"])
+        )
+        self.__champion_df = champ_df
+
+        return self.__champion_df
 
     #%% get_summoner_by_name
-    def get_summoner_by_name(self, summoner_name: str = None):
+    def get_summoner_by_name(self, summoner_name: str = None, refresh: bool = False):
         """Retreieves Summoner information using the summoner name.
 
         To utalise other endpoints information is required from this endpoint.
         Such as id, and puuid.  If dbCahcing has been enabled this information
-        will be stored within the appropriate database.
+        will be stored within the appropriate database.  The summoner's
+        identity is also added to self.identities.
 
 
         Parameters
@@ -511,6 +1082,9 @@ class RiotAPI(LeagueDB):
         summoner_name : str, optional
             If None is passed the summoner name used will be from the object
             inialisation. The default is None.
+        refresh : bool, optional
+            If True the summoner is requested from the api, and the stored
+            summoner is replaced. The default is False.
 
         Returns
         -------
@@ -525,22 +1099,81 @@ class RiotAPI(LeagueDB):
         table_key = "account_name"
         endpoint = "summoner-by-name"
 
-        if self.db_savingActive:
+        if self.db_savingActive and not refresh:
             result = self.get_stored_data(table, table_key, summoner_name)
         else:
             result = None
 
         if result is None:
             result_returned = self.__get_summmoner_data(endpoint, summoner_name)
+            self.__response_checker(result_returned)
 
             result = {}
             result["details"] = result_returned
 
-            if self.db_savingActive and "status" not in result:
-                self.insert_data(table, table_key, summoner_name, result_returned)
+            if self.db_savingActive:
+                self.update_stored_data(
+                    table, table_key, summoner_name, result_returned
+                )
+
+        self.identities.put(result["details"], summoner_name)
 
         return result
 
+    #%% resolve_summoner
+    def resolve_summoner(
+        self, summoner_name: str = None, puuid: str = None, refresh: bool = False
+    ):
+        """Returns the identity of a summoner, used to build the api urls.
+
+        Identities are held within self.identities for identity_ttl seconds.
+        Otherwise the summoner is read from the db, or requested from the api.
+
+
+        Parameters
+        ----------
+        summoner_name : str, optional
+            If None is passed the summoner name used will be from the object
+            inialisation. The default is None.
+        puuid : str, optional
+            The summoner's puuid, used in place of the summoner name. The
+            default is None.
+        refresh : bool, optional
+            If True the summoner is requested from the api. The default is
+            False.
+
+        Returns
+        -------
+        identity : dict
+            The summoner's id, puuid, accountId and name.
+
+        Example
+        -------
+            puuid = lolA.resolve_summoner("Summoner Name")["puuid"]
+
+        """
+
+        if puuid is not None:
+            identity = None if refresh else self.identities.get_by_puuid(puuid)
+
+            if identity is None:
+                result = self.__get_summmoner_data(
+                    "summoner-by-puuid", None, puuid=puuid
+                )
+                self.__response_checker(result)
+                identity = self.identities.put(result)
+
+            return identity
+
+        summoner_name = self.__validate_summoner_name(summoner_name)
+        identity = None if refresh else self.identities.get(summoner_name)
+
+        if identity is None:
+            self.get_summoner_by_name(summoner_name, refresh=refresh)
+            identity = self.identities.get(summoner_name)
+
+        return identity
+
     #%% get_summoner_account_id
     def get_summoner_account_id(self, summoner_name: str = None):
         """Returns the account id for a summoner name.
@@ -558,11 +1191,7 @@ class RiotAPI(LeagueDB):
 
         """
 
-        summoner_name = self.__validate_summoner_name(summoner_name)
-        summoner_details = self.get_summoner_by_name(summoner_name)
-
-        if summoner_details is not None:
-            summoner_id = summoner_details["details"]["accountId"]
+        summoner_id = self.resolve_summoner(summoner_name)["accountId"]
 
         return summoner_id
 
@@ -588,7 +1217,6 @@ class RiotAPI(LeagueDB):
         """
 
         summoner_name = self.__validate_summoner_name(summoner_name)
-        self.__initalise_cache(summoner_name)
 
         endpoint = "curr-game-by-summoner"
 
@@ -597,8 +1225,21 @@ class RiotAPI(LeagueDB):
         return result
 
     #%% get_list_of_matches
-    def get_list_of_matches(self, summoner_name: str = None):
-        """Retrieves the last 20 match id's for a given summoner name.
+    def get_list_of_matches(
+        self,
+        summoner_name: str = None,
+        start: int = None,
+        count: int = None,
+        start_time: int = None,
+        end_time: int = None,
+        queue: int = None,
+        match_type: str = None,
+        puuid: str = None,
+    ):
+        """Retrieves a list of match id's for a given summoner name.
+
+        Without any of the optional filters riot returns the last 20 match id's.
+        The match id's are returned newest first.
 
 
         Parameters
@@ -606,6 +1247,26 @@ class RiotAPI(LeagueDB):
         summoner_name : str, optional
             If None is passed the summoner name used will be from the object
             inialisation. The default is None.
+        start : int, optional
+            The index of the first match id to return. The default is None.
+        count : int, optional
+            The number of match id's to return, between 0 and 100. The default
+            is None.
+        start_time : int, optional
+            Only matches played after this epoch timestamp in seconds are
+            returned. The default is None.
+        end_time : int, optional
+            Only matches played before this epoch timestamp in seconds are
+            returned. The default is None.
+        queue : int, optional
+            Only matches for this queue id are returned, for example 420 for
+            ranked solo. The default is None.
+        match_type : str, optional
+            Only matches of this type are returned, for example 'ranked'. The
+            default is None.
+        puuid : str, optional
+            The summoner's puuid, used in place of the summoner name. The
+            default is None.
 
         Returns
         -------
@@ -614,20 +1275,209 @@ class RiotAPI(LeagueDB):
 
         """
 
-        summoner_name = self.__validate_summoner_name(summoner_name)
+        if puuid is None:
+            summoner_name = self.__validate_summoner_name(summoner_name)
+
+        params = {
+            "start": start,
+            "count": count,
+            "startTime": start_time,
+            "endTime": end_time,
+            "queue": queue,
+            "type": match_type,
+        }
+        params = {key: value for key, value in params.items() if value is not None}
 
         endpoint = "match-list"
         result = self.__get_summmoner_data(
-            endpoint, summoner_name, regional_routing=True
+            endpoint, summoner_name, regional_routing=True, params=params, puuid=puuid
         )
 
         # update loldb
         if self.db_savingActive and "status" not in result:
-            account_id = self.get_summoner_account_id(summoner_name)
+            account_id = self.resolve_summoner(summoner_name, puuid=puuid)["accountId"]
             self.update_stored_summoner_match_ids(account_id, result)
 
         return result
 
+    #%% sync_match_history
+    def sync_match_history(
+        self,
+        summoner_name: str = None,
+        since: int = None,
+        queue: int = None,
+        match_type: str = None,
+        puuid: str = None,
+    ):
+        """Retrieves the match id's played since the last sync.
+
+        The match history is paged through in chunks of 100, newest first,
+        stopping at the newest match id of the last sync for the same account
+        and filters, or at the end of the history on the first sync.  Match
+        id's already stored for the account are not returned.  When the db is
+        enabled the time of each sync is stored for the account and filters,
+        and used as the start time of the next sync, so a repeated sync
+        usually needs a single request.
+
+
+        Parameters
+        ----------
+        summoner_name : str, optional
+            If None is passed the summoner name used will be from the object
+            inialisation. The default is None.
+        since : int or datetime, optional
+            Only matches played after this time, as an epoch timestamp in
+            seconds, are retrieved. If None is passed the time of the last sync
+            is used, or the full history on the first sync. The default is None.
+        queue : int, optional
+            Only matches for this queue id are retrieved. The default is None.
+        match_type : str, optional
+            Only matches of this type are retrieved. The default is None.
+        puuid : str, optional
+            The summoner's puuid, used in place of the summoner name. The
+            default is None.
+
+        Returns
+        -------
+        new_matches : list
+            The match id's which were not already stored, newest first.
+
+        Example
+        -------
+            new_matches = lolA.sync_match_history(queue=420)
+            summaries = lolA.get_match_summaries(new_matches)
+
+        """
+
+        if puuid is None:
+            summoner_name = self.__validate_summoner_name(summoner_name)
+
+        account_id = self.resolve_summoner(summoner_name, puuid=puuid)["accountId"]
+
+        page_size: int = 100
+
+        # games in progress during the last sync started before it
+        sync_overlap: int = 60 * 60
+
+        sync_key: str = "{}|{}|{}".format(account_id, queue, match_type)
+        sync_started: int = int(time.time())
+        sync_state = None
+
+        if self.db_savingActive:
+            sync_state = self.get_stored_data("sync_state", "sync_key", sync_key)
+
+        if since is None and sync_state is not None:
+            since = sync_state["details"]["last_sync"] - sync_overlap
+        elif since is not None and not isinstance(since, (int, float)):
+            since = since.timestamp()
+
+        if since is not None:
+            since = int(since)
+
+        # the newest match id of the last sync, paging stops once it is reached
+        latest_match_id = None
+
+        if sync_state is not None:
+            latest_match_id = sync_state["details"]["latest_match_id"]
+
+        newest_match_id = None
+        new_matches: list = []
+        start: int = 0
+
+        while True:
+            page = self.__get_summmoner_data(
+                "match-list",
+                summoner_name,
+                regional_routing=True,
+                params={
+                    key: value
+                    for key, value in {
+                        "start": start,
+                        "count": page_size,
+                        "startTime": since,
+                        "queue": queue,
+                        "type": match_type,
+                    }.items()
+                    if value is not None
+                },
+                puuid=puuid,
+            )
+
+            if start == 0 and len(page) > 0:
+                newest_match_id = page[0]
+
+            reached_synced = False
+
+            for match_id in page:
+                if latest_match_id is not None and self.match_id_sort_key(
+                    match_id
+                ) <= self.match_id_sort_key(latest_match_id):
+                    reached_synced = True
+                    break
+
+                # stored by another sync key, or by get_list_of_matches
+                if self.db_savingActive and self.has_stored_match_id(
+                    account_id, match_id
+                ):
+                    continue
+
+                new_matches.append(match_id)
+
+            if reached_synced or len(page) < page_size:
+                break
+
+            start += page_size
+
+        if self.db_savingActive:
+            self.update_stored_summoner_match_ids(account_id, new_matches)
+
+            if newest_match_id is not None and (
+                latest_match_id is None
+                or self.match_id_sort_key(newest_match_id)
+                > self.match_id_sort_key(latest_match_id)
+            ):
+                latest_match_id = newest_match_id
+
+            self.update_stored_data(
+                "sync_state",
+                "sync_key",
+                sync_key,
+                {"last_sync": sync_started, "latest_match_id": latest_match_id},
+            )
+
+        return new_matches
+
+    #%% __cache_stored_match_data
+    def __cache_stored_match_data(self, table: str, match_id: str, result: dict):
+        """Adds a match summary or timeline read from the db to self.cache.
+
+        The payload is measured by the length of its stored JSON, as walking
+        the nested dictionaries costs more than reading them.
+
+
+        Parameters
+        ----------
+        table : str
+            'match_summary' or 'match_timeline'.
+        match_id : str
+            The match id of the data.
+        result : dict
+            The stored data.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        if self.cache.max_bytes <= 0:
+            return
+
+        payload = self.get_stored_payload(table, "match_id", match_id)
+
+        if payload is not None:
+            self.cache.put((match_id, table, ()), result, size=len(payload))
+
     #%% get_match_summary
     def get_match_summary(self, match_id: str):
         """Retrieves the match summary for a  given match id.
@@ -652,10 +1502,15 @@ class RiotAPI(LeagueDB):
         table: str = "match_summary"
         endpoint: str = "match_summary"
 
+        result = self.cache.get((match_id, table, ()))
+
+        if result is not None:
+            return result
+
         result = self.get_stored_data(table, "match_id", match_id)
 
         if result is None:
-            reponse_result = self.__get_match_id_data(endpoint, match_id)
+            reponse_result, size = self.__get_match_id_data(endpoint, match_id)
             self.__response_checker(reponse_result)
 
             if self.db_savingActive:
@@ -664,6 +1519,10 @@ class RiotAPI(LeagueDB):
             result: dict = {}
             result["details"] = reponse_result
 
+            self.cache.put((match_id, table, ()), result, size=size)
+        else:
+            self.__cache_stored_match_data(table, match_id, result)
+
         return result
 
     #%% get_match_timeline
@@ -690,10 +1549,15 @@ class RiotAPI(LeagueDB):
         table: str = "match_timeline"
         endpoint: str = "match_timeline"
 
+        result = self.cache.get((match_id, table, ()))
+
+        if result is not None:
+            return result
+
         result = self.get_stored_data(table, "match_id", match_id)
 
         if result is None:
-            reponse_result = self.__get_match_id_data(endpoint, match_id)
+            reponse_result, size = self.__get_match_id_data(endpoint, match_id)
             self.__response_checker(reponse_result)
 
             if self.db_savingActive:
@@ -702,8 +1566,194 @@ class RiotAPI(LeagueDB):
             result: dict = {}
             result["details"] = reponse_result
 
+            self.cache.put((match_id, table, ()), result, size=size)
+        else:
+            self.__cache_stored_match_data(table, match_id, result)
+
         return result
 
+    #%% __get_bulk_match_id_data
+    def __get_bulk_match_id_data(
+        self,
+        table: str,
+        match_ids: list,
+        max_workers: int,
+        batch_size: int,
+        errors: dict = None,
+    ):
+        """Retrieves the data for many match ids at once.
+
+        Match ids already stored within the db are read from the db.  The
+        remaining match ids are requested concurrently using a bounded thread
+        pool, and the results are written to the db in batches.
+
+
+        Parameters
+        ----------
+        table : str
+            The table and endpoint key: 'match_summary' or 'match_timeline'.
+        match_ids : list
+            The match ids of the data required.
+        max_workers : int
+            The maximum number of concurrent requests.
+        batch_size : int
+            The number of responses held before they are written to the db.
+        errors : dict, optional
+            If passed, the exception of each match id which fails is added to
+            this dictionary, keyed by match id. The default is None.
+
+        Returns
+        -------
+        results : dict
+            The retrieved data in a dictionary format, keyed by match id.
+
+        """
+
+        results: dict = {}
+        missing_ids: list = []
+
+        for match_id in dict.fromkeys(match_ids):
+            result = self.cache.get((match_id, table, ()))
+
+            if result is None and self.db_savingActive:
+                result = self.get_stored_data(table, "match_id", match_id)
+
+                if result is not None:
+                    self.__cache_stored_match_data(table, match_id, result)
+
+            if result is None:
+                missing_ids.append(match_id)
+            else:
+                results[match_id] = result
+
+        if len(missing_ids) == 0:
+            return results
+
+        pending: dict = {}
+        sizes: dict = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.__get_match_id_data, table, match_id): match_id
+                for match_id in missing_ids
+            }
+
+            for future in as_completed(futures):
+                match_id = futures[future]
+
+                try:
+                    reponse_result, sizes[match_id] = future.result()
+                except Exception as e:
+                    print("{} :: failed :: {}".format(match_id, e))
+
+                    if errors is not None:
+                        errors[match_id] = e
+                    continue
+
+                results[match_id] = {"details": reponse_result}
+                pending[match_id] = reponse_result
+
+                # db writes are kept on this thread and grouped into batches
+                if self.db_savingActive and len(pending) >= batch_size:
+                    self.insert_data_batch(table, "match_id", pending)
+                    pending = {}
+
+        if self.db_savingActive and len(pending) > 0:
+            self.insert_data_batch(table, "match_id", pending)
+
+        # cached once stored, as storing a match invalidates its cached data
+        for match_id, size in sizes.items():
+            self.cache.put((match_id, table, ()), results[match_id], size=size)
+
+        return results
+
+    #%% get_match_summaries
+    def get_match_summaries(
+        self,
+        match_ids: list,
+        max_workers: int = 8,
+        batch_size: int = 50,
+        errors: dict = None,
+    ):
+        """Retrieves the match summaries for a list of match ids.
+
+        The bulk equivalent of self.get_match_summary().  Match ids which are
+        not stored within the db are requested concurrently. Match ids which
+        fail to be retrieved are printed to the console and are not included
+        within the result.
+
+        The requests are sent to self.api_details['regionalRouting'], which can
+        be pointed at a local server for testing.
+
+
+        Parameters
+        ----------
+        match_ids : list
+            The match ids of the data required.
+        max_workers : int, optional
+            The maximum number of concurrent requests. The default is 8.
+        batch_size : int, optional
+            The number of responses held before they are written to the db.
+            The default is 50.
+        errors : dict, optional
+            If passed, the exception of each match id which fails is added to
+            this dictionary, keyed by match id. The default is None.
+
+        Returns
+        -------
+        results : dict
+            The retrieved data in a dictionary format, keyed by match id.
+
+        Example
+        -------
+            summaries = lolA.get_match_summaries(lolA.get_list_of_matches())
+
+        """
+
+        return self.__get_bulk_match_id_data(
+            "match_summary", match_ids, max_workers, batch_size, errors=errors
+        )
+
+    #%% get_match_timelines
+    def get_match_timelines(
+        self,
+        match_ids: list,
+        max_workers: int = 8,
+        batch_size: int = 50,
+        errors: dict = None,
+    ):
+        """Retrieves the match timelines for a list of match ids.
+
+        The bulk equivalent of self.get_match_timeline().  Match ids which are
+        not stored within the db are requested concurrently. Match ids which
+        fail to be retrieved are printed to the console and are not included
+        within the result.
+
+
+        Parameters
+        ----------
+        match_ids : list
+            The match ids of the data required.
+        max_workers : int, optional
+            The maximum number of concurrent requests. The default is 8.
+        batch_size : int, optional
+            The number of responses held before they are written to the db.
+            The default is 50.
+        errors : dict, optional
+            If passed, the exception of each match id which fails is added to
+            this dictionary, keyed by match id. The default is None.
+
+        Returns
+        -------
+        results : dict
+            The retrieved data in a dictionary format, keyed by match id.
+
+        """
+
+        return self.__get_bulk_match_id_data(
+            "match_timeline", match_ids, max_workers, batch_size, errors=errors
+        )
+
     #%% get_champion_mastery_by_summoner
     def get_champion_mastery_by_summoner(self, summoner_name: str = None):
         """Retieves a list champions with the summoners champion mastery.
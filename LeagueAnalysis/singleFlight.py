@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 20:48:06 2026
+
+@author: Chris Bostock
+"""
+
+import threading
+
+#%% _Call
+class _Call:
+    """A call in flight, which the callers for the same key wait on."""
+
+    def __init__(self):
+
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException = None
+        self.callers: int = 1
+
+
+#%% SingleFlight
+class SingleFlight:
+    """Shares a single call between threads requesting the same key at once.
+
+    The first thread to request a key makes the call.  Threads requesting the
+    same key before the call has finished wait for it, and receive the same
+    result or exception, rather than making their own call.  Once the call has
+    finished the key is removed, so later requests make a new call.
+
+
+    Returns
+    -------
+    None.
+
+    Example
+    -------
+        flight = SingleFlight()
+        result, shared = flight.do(("match_timeline", match_id), fetch, match_id)
+
+    """
+
+    #%% __init__
+    def __init__(self):
+
+        self.__lock = threading.Lock()
+
+        # key -> _Call
+        self.__calls: dict = {}
+
+    #%% __len__
+    def __len__(self):
+
+        with self.__lock:
+            return len(self.__calls)
+
+    #%% do
+    def do(self, key, function, *args, **kwargs):
+        """Calls the function, unless a call for the key is already in flight.
+
+
+        Parameters
+        ----------
+        key : hashable
+            The key identifying the call. For example, (endpoint, match_id).
+        function : callable
+            The function to call.
+        *args, **kwargs :
+            Passed to the function.
+
+        Raises
+        ------
+        Exception
+            The exception raised by the function, for every waiting thread.
+
+        Returns
+        -------
+        result :
+            The result of the function.
+        shared : bool
+            True if the result came from another thread's call.
+
+        """
+
+        with self.__lock:
+            call = self.__calls.get(key)
+
+            if call is not None:
+                call.callers += 1
+                leader = False
+            else:
+                call = _Call()
+                self.__calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result, True
+
+        try:
+            call.result = function(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+
+            call.done.set()
+
+        return call.result, call.callers > 1
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+
+    print("")
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:05:12 2026
+
+@author: Chris Bostock
+"""
+
+import os
+import sys
+
+# the package modules are imported from the folder above
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:07:40 2026
+
+@author: Chris Bostock
+"""
+
+import os
+import time
+
+from riotAPI import RiotAPI, RiotAPIError
+from benchmarks.syntheticPayloads import create_matches
+from benchmarks.fakeRiotServer import FakeRiotServer, use_fake_server
+
+#%% create_riot_api
+def create_riot_api(folder: str, url: str):
+
+    riot_api = RiotAPI("test-key", db_name=os.path.join(folder, "loldb"))
+    use_fake_server(riot_api, url)
+
+    return riot_api
+
+
+#%% test_requests_are_sent_concurrently
+def test_requests_are_sent_concurrently(tmp_path):
+
+    matches, _ = create_matches(8, minutes=5, events_per_minute=5)
+    latency = 0.3
+
+    with FakeRiotServer(matches, {}, latency=latency) as server:
+        riot_api = create_riot_api(str(tmp_path), server.url)
+
+        start = time.perf_counter()
+        results = riot_api.get_match_summaries(list(matches), max_workers=8)
+        seconds = time.perf_counter() - start
+
+        riot_api.close()
+
+    assert set(results) == set(matches)
+    assert server.request_count == len(matches)
+
+    # sequential requests would take len(matches) * latency
+    assert seconds < len(matches) * latency / 2
+
+
+#%% test_stored_match_ids_are_not_requested
+def test_stored_match_ids_are_not_requested(tmp_path):
+
+    matches, _ = create_matches(6, minutes=5, events_per_minute=5)
+    match_ids = list(matches)
+    stored_ids = match_ids[:4]
+
+    with FakeRiotServer(matches, {}) as server:
+        riot_api = create_riot_api(str(tmp_path), server.url)
+        riot_api.insert_data_batch(
+            "match_timeline",
+            "match_id",
+            {match_id: matches[match_id][1] for match_id in stored_ids},
+        )
+
+        results = riot_api.get_match_timelines(match_ids, max_workers=4)
+
+        assert server.request_count == len(match_ids) - len(stored_ids)
+
+        # the requested timelines were stored, so a second call sends none
+        riot_api.get_match_timelines(match_ids, max_workers=4)
+        assert server.request_count == len(match_ids) - len(stored_ids)
+
+        riot_api.close()
+
+    assert set(results) == set(match_ids)
+
+    for match_id in match_ids:
+        assert results[match_id]["details"] == matches[match_id][1]
+
+
+#%% test_failed_match_ids_are_collected
+def test_failed_match_ids_are_collected(tmp_path):
+
+    matches, _ = create_matches(3, minutes=5, events_per_minute=5)
+    missing_id = "EUW1_1"
+    errors: dict = {}
+
+    with FakeRiotServer(matches, {}) as server:
+        riot_api = create_riot_api(str(tmp_path), server.url)
+
+        results = riot_api.get_match_summaries(
+            list(matches) + [missing_id], max_workers=4, errors=errors
+        )
+
+        riot_api.close()
+
+    assert set(results) == set(matches)
+    assert list(errors) == [missing_id]
+    assert isinstance(errors[missing_id], RiotAPIError)
+    assert errors[missing_id].status_code == 404
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:08 2026
+
+@author: Chris Bostock
+"""
+
+import os
+
+import pandas as pd
+
+from riotAPI import RiotAPI
+from benchmarks.syntheticPayloads import create_matches
+from benchmarks.fakeRiotServer import FakeRiotServer, use_fake_server
+
+#%% create_cached_riot_api
+def create_cached_riot_api(folder: str, match_ids: list):
+
+    riot_api = RiotAPI("test-key", db_name=os.path.join(folder, "loldb"))
+
+    for match_id in match_ids:
+        riot_api.cache.put((match_id, "champion_timeline", ()), pd.DataFrame())
+
+    return riot_api
+
+
+#%% test_stored_match_data_invalidates_the_cache
+def test_stored_match_data_invalidates_the_cache(tmp_path):
+
+    riot_api = create_cached_riot_api(str(tmp_path), ["EUW1_1", "EUW1_2", "EUW1_3"])
+
+    riot_api.insert_data("match_timeline", "match_id", "EUW1_1", {"value": 1})
+    riot_api.update_stored_data("match_summary", "match_id", "EUW1_2", {"value": 2})
+    riot_api.insert_data("summoner_names", "name", "EUW1_3", {"value": 3})
+
+    assert ("EUW1_1", "champion_timeline", ()) not in riot_api.cache
+    assert ("EUW1_2", "champion_timeline", ()) not in riot_api.cache
+    assert ("EUW1_3", "champion_timeline", ()) in riot_api.cache
+
+    riot_api.insert_data_batch("match_timeline", "match_id", {"EUW1_3": {}})
+    assert len(riot_api.cache) == 0
+
+    riot_api.close()
+
+
+#%% test_dropped_tables_clear_the_cache
+def test_dropped_tables_clear_the_cache(tmp_path):
+
+    riot_api = create_cached_riot_api(str(tmp_path), ["EUW1_1", "EUW1_2"])
+    riot_api.identities.put({"name": "Summoner", "puuid": "puuid-1"})
+
+    riot_api.drop_timeline_table()
+    assert len(riot_api.cache) == 0
+
+    riot_api.drop_summoner_info_table()
+    assert len(riot_api.identities) == 0
+
+    riot_api.close()
+
+
+#%% test_match_payloads_are_cached
+def test_match_payloads_are_cached(tmp_path):
+
+    matches, _ = create_matches(2, minutes=5, events_per_minute=5)
+    fetched_id, stored_id = list(matches)
+
+    with FakeRiotServer(matches, {}) as server:
+        riot_api = RiotAPI("test-key", db_name=os.path.join(str(tmp_path), "loldb"))
+        use_fake_server(riot_api, server.url)
+        riot_api.insert_data(
+            "match_timeline", "match_id", stored_id, matches[stored_id][1]
+        )
+
+        for match_id in (fetched_id, stored_id):
+            riot_api.get_match_timeline(match_id)
+
+        assert server.request_count == 1
+        assert riot_api.cache.stats()["entries"] == 2
+
+        # cached payloads are measured by their json, not by walking them
+        payload = riot_api.get_stored_payload("match_timeline", "match_id", stored_id)
+        assert riot_api.cache.stats()["bytes"] < 3 * len(payload)
+
+        # a cached payload is returned without reading the db
+        lookups = riot_api.metrics.snapshot()["counters"]
+        riot_api.get_match_timeline(stored_id)
+        assert riot_api.metrics.snapshot()["counters"] == lookups
+
+        riot_api.close()
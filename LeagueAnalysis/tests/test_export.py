@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:36:52 2026
+
+@author: Chris Bostock
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from LeagueAnalysis import LeagueAnalysis
+from benchmarks.syntheticPayloads import create_matches
+
+pytest.importorskip("pyarrow")
+
+#%% create_stored_analysis
+def create_stored_analysis(folder: str):
+
+    matches, _ = create_matches(2, minutes=5, events_per_minute=5)
+    match_ids = list(matches)
+
+    # the first match has no champion kills
+    for frame in matches[match_ids[0]][1]["info"]["frames"]:
+        frame["events"] = [
+            event for event in frame["events"] if event["type"] != "CHAMPION_KILL"
+        ]
+
+    lol_analysis = LeagueAnalysis("test-key", db_name=os.path.join(folder, "loldb"))
+
+    for match_id, (summary, timeline) in matches.items():
+        lol_analysis.insert_data("match_summary", "match_id", match_id, summary)
+        lol_analysis.insert_data("match_timeline", "match_id", match_id, timeline)
+
+    return lol_analysis, match_ids
+
+
+#%% test_batches_with_different_events_are_read_as_one_dataset
+@pytest.mark.parametrize("separate_calls", [False, True])
+def test_batches_with_different_events_are_read_as_one_dataset(
+    tmp_path, separate_calls
+):
+
+    lol_analysis, match_ids = create_stored_analysis(str(tmp_path))
+    output_dir = os.path.join(str(tmp_path), "export")
+
+    if separate_calls:
+        lol_analysis.export_match_data(output_dir, match_ids=match_ids[:1])
+        lol_analysis.export_match_data(output_dir, match_ids=match_ids[1:])
+    else:
+        lol_analysis.export_match_data(output_dir, match_ids=match_ids, batch_size=1)
+
+    events = pd.read_parquet(os.path.join(output_dir, "events"))
+    kills = events[events["type"] == "CHAMPION_KILL"]
+
+    assert set(events["match_id"]) == set(match_ids)
+    assert len(kills) > 0
+    assert set(kills["match_id"]) == {match_ids[1]}
+    assert kills["killerId"].notna().all()
+
+    lol_analysis.close()
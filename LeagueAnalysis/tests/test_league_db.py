@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:42:19 2026
+
+@author: Chris Bostock
+"""
+
+import os
+
+import pytest
+
+from db.LeagueDB import LeagueDB
+
+#%% test_tinydb_objects_sharing_files_keep_each_others_writes
+def test_tinydb_objects_sharing_files_keep_each_others_writes(tmp_path):
+
+    db_name = os.path.join(str(tmp_path), "loldb")
+
+    existing_db = LeagueDB(db_name=db_name)
+    existing_db.insert_data("match_summary", "match_id", "EUW1_0", {"value": 0})
+    existing_db.close()
+
+    first_db = LeagueDB(db_name=db_name)
+    second_db = LeagueDB(db_name=db_name)
+
+    # both objects read the table before either writes
+    assert first_db.get_stored_data("match_summary", "match_id", "EUW1_1") is None
+    assert second_db.get_stored_data("match_summary", "match_id", "EUW1_2") is None
+
+    first_db.insert_data("match_summary", "match_id", "EUW1_1", {"value": 1})
+    second_db.insert_data("match_summary", "match_id", "EUW1_2", {"value": 2})
+
+    first_db.close()
+    second_db.close()
+
+    reopened_db = LeagueDB(db_name=db_name)
+
+    assert reopened_db.get_list_of_stored_matches() == ["EUW1_0", "EUW1_1", "EUW1_2"]
+
+    reopened_db.close()
+
+
+#%% test_tinydb_batch_writes_on_exit
+def test_tinydb_batch_writes_on_exit(tmp_path):
+
+    db_name = os.path.join(str(tmp_path), "loldb")
+    league_db = LeagueDB(db_name=db_name)
+
+    with pytest.raises(ValueError):
+        with league_db.batch():
+            league_db.insert_data("match_summary", "match_id", "EUW1_1", {})
+            league_db.update_stored_summoner_match_ids("account", ["EUW1_1"])
+            raise ValueError("failure within the batch")
+
+    # the batch no longer buffers writes
+    league_db.insert_data("match_summary", "match_id", "EUW1_2", {})
+
+    reopened_db = LeagueDB(db_name=db_name)
+
+    assert reopened_db.get_list_of_stored_matches() == ["EUW1_1", "EUW1_2"]
+    assert reopened_db.has_stored_match_id("account", "EUW1_1")
+
+    league_db.close()
+    reopened_db.close()
+
+
+#%% test_sqlite_batch_commits_on_error
+def test_sqlite_batch_commits_on_error(tmp_path):
+
+    db_name = os.path.join(str(tmp_path), "loldb")
+    league_db = LeagueDB(db_name=db_name, storage="sqlite")
+
+    with pytest.raises(ValueError):
+        with league_db.batch():
+            league_db.insert_data("match_summary", "match_id", "EUW1_1", {})
+            league_db.update_stored_summoner_match_ids("account", ["EUW1_1"])
+            raise ValueError("failure within the batch")
+
+    # the in memory indexes agree with the stored data
+    assert league_db.has_stored_match_id("account", "EUW1_1")
+    assert league_db.get_stored_data("match_summary", "match_id", "EUW1_1") is not None
+
+    league_db.close()
+
+    reopened_db = LeagueDB(db_name=db_name, storage="sqlite")
+
+    assert reopened_db.has_stored_match_id("account", "EUW1_1")
+    assert reopened_db.get_list_of_stored_matches() == ["EUW1_1"]
+
+    reopened_db.close()
+
+
+#%% test_migration_copies_the_sync_state
+def test_migration_copies_the_sync_state(tmp_path):
+
+    db_name = os.path.join(str(tmp_path), "loldb")
+    sync_state = {"latest_match_id": "EUW1_5", "last_sync": 1639663000}
+
+    tinydb_db = LeagueDB(db_name=db_name)
+    tinydb_db.update_stored_data("sync_state", "sync_key", "account|420|", sync_state)
+    tinydb_db.close()
+
+    sqlite_db = LeagueDB(db_name=db_name, storage="sqlite")
+
+    assert sqlite_db.migrate_from_tinydb()["sync_state"] == 1
+
+    result = sqlite_db.get_stored_data("sync_state", "sync_key", "account|420|")
+    assert result["details"] == sync_state
+
+    sqlite_db.close()
+
+
+#%% test_inserts_are_not_counted_as_lookups
+def test_inserts_are_not_counted_as_lookups(tmp_path):
+
+    league_db = LeagueDB(db_name=os.path.join(str(tmp_path), "loldb"))
+
+    assert league_db.get_stored_data("match_summary", "match_id", "EUW1_1") is None
+    league_db.insert_data("match_summary", "match_id", "EUW1_1", {})
+    league_db.update_stored_data("match_summary", "match_id", "EUW1_1", {})
+    league_db.insert_data_batch("match_summary", "match_id", {"EUW1_2": {}})
+
+    lookups = {
+        counter["labels"]["result"]: counter["value"]
+        for counter in league_db.metrics.snapshot()["counters"]
+        if counter["name"] == "league_db_lookups_total"
+    }
+
+    assert lookups == {"miss": 1}
+
+    league_db.close()
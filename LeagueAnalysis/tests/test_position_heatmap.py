@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:03:27 2026
+
+@author: Chris Bostock
+"""
+
+import pandas as pd
+import pytest
+
+from positionHeatmap import PositionHeatmap
+
+#%% create_kill_events
+def create_kill_events(team_column: str):
+
+    return pd.DataFrame(
+        {
+            "type": ["CHAMPION_KILL", "CHAMPION_KILL", "WARD_PLACED"],
+            "position_x": [1000.0, 7000.0, 3000.0],
+            "position_y": [1000.0, 7000.0, None],
+            team_column: [100, 200, None],
+        }
+    )
+
+
+#%% test_failed_matches_can_be_added_again
+def test_failed_matches_can_be_added_again():
+
+    heatmap = PositionHeatmap(bins=10, team_id=100, team_column="teamId_killer")
+
+    with pytest.raises(ValueError):
+        heatmap.add_events(create_kill_events("teamId_info"), "EUW1_1")
+
+    assert "EUW1_1" not in heatmap.match_ids
+
+    assert heatmap.add_events(create_kill_events("teamId_killer"), "EUW1_1")
+    assert heatmap.grid.sum() == 1
+
+    # the match is now recorded, so it is not added twice
+    assert not heatmap.add_events(create_kill_events("teamId_killer"), "EUW1_1")
+    assert heatmap.grid.sum() == 1
+
+
+#%% test_smoothed_keeps_the_grid_shape
+@pytest.mark.parametrize("sigma", [0.5, 2, 50])
+def test_smoothed_keeps_the_grid_shape(sigma):
+
+    heatmap = PositionHeatmap(bins=5)
+    heatmap.add_events(create_kill_events("teamId_info"))
+
+    grid = heatmap.smoothed(sigma)
+
+    assert grid.shape == heatmap.grid.shape
+    assert grid.sum() <= heatmap.grid.sum() + 1e-9
+    assert grid.sum() > 0
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 16:02:51 2026
+
+@author: Chris Bostock
+"""
+
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+
+#%% TimelineGroups
+class TimelineGroups(Mapping):
+    """A read only dictionary of the rows of a dataframe grouped on a column.
+
+    Only the row positions of each group are held.  A group's dataframe is
+    created from the source dataframe each time the group is accessed, and is
+    not kept, so the memory used does not grow with the number of groups.
+
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The dataframe to be grouped.
+    parse_on : str
+        The column to group on. For example, 'championName'.
+    add_time : bool, optional
+        If True, a 'time' column in minutes is created from the 'timestamp'
+        column of each group when it is accessed. The default is False.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    #%% __init__
+    def __init__(self, df: pd.DataFrame, parse_on: str, add_time: bool = False):
+
+        self.df: pd.DataFrame = df
+        self.parse_on: str = parse_on
+        self.add_time: bool = add_time
+
+        # group key -> row positions, in the order the keys first appear
+        self.__positions: dict = df.groupby(parse_on, sort=False, dropna=False).indices
+
+    #%% __getitem__
+    def __getitem__(self, key):
+
+        group_df = self.df.take(self.__positions[key]).reset_index(drop=True)
+
+        if self.add_time:
+            group_df["time"] = group_df["timestamp"] / 1_000 / 60
+
+        return group_df
+
+    #%% __iter__
+    def __iter__(self):
+
+        return iter(self.__positions)
+
+    #%% __len__
+    def __len__(self):
+
+        return len(self.__positions)
+
+    #%% __repr__
+    def __repr__(self):
+
+        return "TimelineGroups(parse_on={!r}, keys={!r})".format(
+            self.parse_on, list(self.__positions)
+        )
+
+    #%% positions
+    def positions(self, key):
+        """Returns the row positions of a group within the source dataframe.
+
+
+        Parameters
+        ----------
+        key :
+            The group key. For example, 'Twitch'.
+
+        Returns
+        -------
+        positions : np.ndarray
+            The row positions, which can be passed to df.take() or df.iloc[].
+
+        """
+
+        return self.__positions[key]
+
+    #%% sizes
+    def sizes(self):
+        """Returns the number of rows within each group.
+
+
+        Returns
+        -------
+        sizes : pd.Series
+            The number of rows, indexed by the group key.
+
+        """
+
+        return pd.Series(
+            [len(positions) for positions in self.__positions.values()],
+            index=list(self.__positions),
+            dtype=np.int64,
+        )
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+
+    print("")
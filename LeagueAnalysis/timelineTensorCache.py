@@ -0,0 +1,429 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 15:06:38 2026
+
+@author: Chris Bostock
+"""
+
+import os
+import json
+import warnings
+import numpy as np
+import pandas as pd
+
+# participant frame stats stored by default, nested stats use a '.' seperator
+DEFAULT_STATS: list = [
+    "currentGold",
+    "totalGold",
+    "goldPerSecond",
+    "xp",
+    "level",
+    "minionsKilled",
+    "jungleMinionsKilled",
+    "timeEnemySpentControlled",
+    "position.x",
+    "position.y",
+    "championStats.health",
+    "championStats.healthMax",
+    "damageStats.totalDamageDone",
+    "damageStats.totalDamageDoneToChampions",
+    "damageStats.totalDamageTaken",
+]
+
+PARTICIPANTS: int = 10
+
+#%% TimelineTensorCache
+class TimelineTensorCache:
+    """A dense, memory-mapped cache of the participant frame stats of matches.
+
+    The stats are held as a float32 array shaped (matches, frames, 10
+    participants, stats) within path.dat, which is memory-mapped so the array
+    does not have to be loaded to be used.  Matches shorter than max_frames
+    and missing stats are filled with NaN.  Participant index i is
+    participantId i + 1.
+
+    The side index, path.json, holds the stat names, the match id of each row,
+    and the puuid, champion name and team id of each participant.  New
+    matches are appended to the end of the array.
+
+
+    Parameters
+    ----------
+    path : str
+        The path of the cache without an extension.
+    stats : list, optional
+        The participant frame stats to store, for example 'totalGold' or
+        'championStats.health'. Only used when the cache is created. The default
+        is DEFAULT_STATS.
+    max_frames : int, optional
+        The number of frames stored for each match. Frames are one minute
+        apart, so later frames of longer matches are not stored. Only used
+        when the cache is created. The default is 60.
+
+    Returns
+    -------
+    None.
+
+    Example
+    -------
+        cache = TimelineTensorCache("./db/loldb-frames")
+        cache.populate(lolA)
+        gold_curves = cache.champion_mean("totalGold")
+
+    """
+
+    #%% __init__
+    def __init__(self, path: str, stats: list = None, max_frames: int = 60):
+
+        self.data_path: str = path + ".dat"
+        self.index_path: str = path + ".json"
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as file:
+                self.index: dict = json.load(file)
+        else:
+            self.index: dict = {
+                "stats": list(DEFAULT_STATS if stats is None else stats),
+                "max_frames": max_frames,
+                "match_ids": [],
+                "frame_counts": [],
+                "puuids": [],
+                "champion_names": [],
+                "team_ids": [],
+            }
+
+        self.__match_rows: dict = {
+            match_id: row for row, match_id in enumerate(self.index["match_ids"])
+        }
+        self.__tensor = None
+
+    #%% __len__
+    def __len__(self):
+
+        return len(self.index["match_ids"])
+
+    #%% __contains__
+    def __contains__(self, match_id: str):
+
+        return match_id in self.__match_rows
+
+    #%% stats
+    @property
+    def stats(self):
+        """The stat names, in the order of the last axis of the tensor."""
+
+        return self.index["stats"]
+
+    #%% match_ids
+    @property
+    def match_ids(self):
+        """The match ids, in the order of the first axis of the tensor."""
+
+        return self.index["match_ids"]
+
+    #%% tensor
+    @property
+    def tensor(self):
+        """The read only memory-mapped array shaped (matches, frames, 10, stats)."""
+
+        if self.__tensor is None or self.__tensor.shape[0] != len(self):
+            if len(self) == 0:
+                return np.empty(self.__block_shape(0), dtype=np.float32)
+
+            self.__tensor = np.memmap(
+                self.data_path,
+                dtype=np.float32,
+                mode="r",
+                shape=self.__block_shape(len(self)),
+            )
+
+        return self.__tensor
+
+    #%% champion_names
+    @property
+    def champion_names(self):
+        """The champion name of each participant, shaped (matches, 10)."""
+
+        return np.array(self.index["champion_names"], dtype=object).reshape(
+            len(self), PARTICIPANTS
+        )
+
+    #%% team_ids
+    @property
+    def team_ids(self):
+        """The team id of each participant, shaped (matches, 10)."""
+
+        return np.array(self.index["team_ids"], dtype=np.int32).reshape(
+            len(self), PARTICIPANTS
+        )
+
+    #%% frame_counts
+    @property
+    def frame_counts(self):
+        """The number of stored frames of each match."""
+
+        return np.array(self.index["frame_counts"], dtype=np.int32)
+
+    #%% __block_shape
+    def __block_shape(self, matches: int):
+
+        return (matches, self.index["max_frames"], PARTICIPANTS, len(self.stats))
+
+    #%% __get_stat
+    @staticmethod
+    def __get_stat(participant_frame: dict, stat: str):
+
+        value = participant_frame
+
+        for key in stat.split("."):
+            if not isinstance(value, dict) or key not in value:
+                return np.nan
+            value = value[key]
+
+        return value
+
+    #%% __create_block
+    def __create_block(self, raw_data_tl: dict, raw_data_ms: dict):
+        """Creates the stats array and the side index entries of a match.
+
+
+        Parameters
+        ----------
+        raw_data_tl : dict
+            The match timeline, as returned by get_match_timeline().
+        raw_data_ms : dict
+            The match summary, as returned by get_match_summary().
+
+        Returns
+        -------
+        block : np.ndarray
+            The stats shaped (frames, 10, stats).
+        entries : dict
+            The side index entries of the match.
+
+        """
+
+        frames = raw_data_tl["details"]["info"]["frames"][: self.index["max_frames"]]
+
+        block = np.full(self.__block_shape(1)[1:], np.nan, dtype=np.float32)
+
+        for frame_number, frame in enumerate(frames):
+            for participant_id, participant_frame in frame["participantFrames"].items():
+                block[frame_number, int(participant_id) - 1] = [
+                    self.__get_stat(participant_frame, stat) for stat in self.stats
+                ]
+
+        participants_detailed = {
+            participant["participantId"]: participant
+            for participant in raw_data_ms["details"]["info"]["participants"]
+        }
+        participants = [
+            participants_detailed.get(participant_id, {})
+            for participant_id in range(1, PARTICIPANTS + 1)
+        ]
+
+        entries = {
+            "frame_counts": len(frames),
+            "puuids": [participant.get("puuid") for participant in participants],
+            "champion_names": [
+                participant.get("championName") for participant in participants
+            ],
+            "team_ids": [participant.get("teamId", 0) for participant in participants],
+        }
+
+        return block, entries
+
+    #%% __save_index
+    def __save_index(self):
+
+        with open(self.index_path, "w") as file:
+            json.dump(self.index, file)
+
+    #%% add_matches
+    def add_matches(self, matches: dict):
+        """Appends matches to the cache.
+
+        The stats are appended to the data file before the side index is
+        saved, so an interrupted write does not corrupt the cache.  Matches
+        already within the cache are skipped.  Each match is written as it is
+        read, so the matches can be passed as a generator to avoid holding
+        them all in memory.
+
+
+        Parameters
+        ----------
+        matches : dict or iterable
+            Match id -> (match timeline, match summary), or an iterable of
+            (match id, (match timeline, match summary)) pairs.
+
+        Returns
+        -------
+        added : list
+            The match ids added to the cache.
+
+        """
+
+        added: list = []
+        added_ids: set = set()
+
+        if isinstance(matches, dict):
+            matches = matches.items()
+
+        with open(self.data_path, "ab") as file:
+            # drop any data written after the last saved index
+            file.truncate(
+                len(self) * int(np.prod(self.__block_shape(1))) * np.float32().itemsize
+            )
+
+            for match_id, (raw_data_tl, raw_data_ms) in matches:
+                if match_id in self or match_id in added_ids:
+                    continue
+
+                block, entries = self.__create_block(raw_data_tl, raw_data_ms)
+                file.write(block.tobytes())
+
+                self.index["match_ids"].append(match_id)
+                self.index["frame_counts"].append(entries["frame_counts"])
+                self.index["puuids"] += entries["puuids"]
+                self.index["champion_names"] += entries["champion_names"]
+                self.index["team_ids"] += entries["team_ids"]
+
+                added.append(match_id)
+                added_ids.add(match_id)
+
+        if len(added) > 0:
+            self.__match_rows = {
+                match_id: row for row, match_id in enumerate(self.index["match_ids"])
+            }
+            self.__save_index()
+
+        return added
+
+    #%% populate
+    def populate(self, league_db, match_ids: list = None):
+        """Appends the matches stored within a LeagueDB object to the cache.
+
+        No api calls are made, matches without both a stored timeline and
+        summary are skipped.  The matches are read and written one at a time,
+        and the side index is saved once at the end.
+
+
+        Parameters
+        ----------
+        league_db : LeagueDB
+            The database, for example a LeagueAnalysis object.
+        match_ids : list, optional
+            The match ids to add. If None is passed all stored match timelines
+            are added. The default is None.
+
+        Returns
+        -------
+        added : list
+            The match ids added to the cache.
+
+        """
+
+        if match_ids is None:
+            match_ids = league_db.get_list_of_stored_matches("match_timeline")
+
+        def read_matches():
+            for match_id in match_ids:
+                if match_id in self:
+                    continue
+
+                raw_data_tl = league_db.get_stored_data(
+                    "match_timeline", "match_id", match_id
+                )
+                raw_data_ms = league_db.get_stored_data(
+                    "match_summary", "match_id", match_id
+                )
+
+                if raw_data_tl is not None and raw_data_ms is not None:
+                    yield match_id, (raw_data_tl, raw_data_ms)
+
+        return self.add_matches(read_matches())
+
+    #%% get_stat
+    def get_stat(self, stat: str, match_ids: list = None):
+        """Returns a single stat for all participants.
+
+
+        Parameters
+        ----------
+        stat : str
+            The stat name, for example 'totalGold'.
+        match_ids : list, optional
+            The matches to return. If None is passed all matches are returned.
+            The default is None.
+
+        Returns
+        -------
+        values : np.ndarray
+            The stat shaped (matches, frames, 10).
+
+        """
+
+        values = self.tensor[..., self.stats.index(stat)]
+
+        if match_ids is not None:
+            values = values[[self.__match_rows[match_id] for match_id in match_ids]]
+
+        return values
+
+    #%% champion_mean
+    def champion_mean(self, stat: str, champion_names: list = None):
+        """Returns the mean of a stat for each champion at each frame.
+
+
+        Parameters
+        ----------
+        stat : str
+            The stat name, for example 'totalGold'.
+        champion_names : list, optional
+            The champions to return. If None is passed all champions within
+            the cache are returned. The default is None.
+
+        Returns
+        -------
+        df : pd.DataFrame
+            The mean of the stat, indexed by frame with a column per champion.
+
+        Example
+        -------
+            cache.champion_mean("totalGold", ["Yasuo", "Camille"])
+            Out[12]:
+                      Yasuo  Camille
+                0     500.0    500.0
+                1     500.0    500.0
+                2     744.0    689.5
+                ..      ...      ...
+
+        """
+
+        values = self.get_stat(stat)
+        names = self.champion_names
+
+        if champion_names is None:
+            champion_names = sorted(
+                {name for name in names.ravel().tolist() if name is not None}
+            )
+
+        means: dict = {}
+
+        for champion_name in champion_names:
+            matches, participants = np.nonzero(names == champion_name)
+
+            # frames after the end of every match are all NaN
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                means[champion_name] = np.nanmean(
+                    values[matches, :, participants], axis=0
+                )
+
+        return pd.DataFrame(means, index=pd.RangeIndex(self.index["max_frames"]))
+
+
+#%% if __name__ == "__main__"
+if __name__ == "__main__":
+
+    print("")